@@ -0,0 +1,166 @@
+"""
+Benchmark API response serialization for /samples and /search.
+
+Compares the previous path with the current one. The previous path
+encoded each document with a JSON encoder and json.loads'ed it back, then
+had FastAPI validate the response_model, run jsonable_encoder and
+json.dumps the body. The current path converts BSON values in one pass
+and returns pre-encoded orjson bytes. The summary path adds the
+default list projection, which leaves out the section bodies. All three
+run as FastAPI apps driven in-process over ASGI, with documents shaped
+like stored samples, so no MongoDB or network is involved:
+
+    python benchmarks/api_serialization.py --requests 500
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from synthetic import generate_page, sample_path
+from src.database.mongo_client import list_projection, to_json_native
+from src.scraper.nailib_scraper import NailibScraper
+
+
+class LegacyEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, ObjectId):
+            return str(o)
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def legacy_serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return json.loads(LegacyEncoder().encode(doc))
+
+
+def stored_documents(count: int, paragraphs: int) -> List[Dict[str, Any]]:
+    """Sample documents as get_samples reads them back from MongoDB."""
+    scraper = NailibScraper(parser_backend="lxml")
+    now = datetime.utcnow()
+    docs = []
+    for index in range(count):
+        url = "https://nailib.com" + sample_path(index)
+        doc = scraper.parse_sample(generate_page(index, count, paragraphs=paragraphs), url)
+        doc.update(last_updated=now, last_checked=now, reference=ObjectId())
+        docs.append(doc)
+    return docs
+
+
+def legacy_app(docs: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/samples", response_model=List[Dict[str, Any]])
+    async def get_samples(skip: int = 0, limit: int = 10):
+        return [legacy_serialize(doc) for doc in docs[skip:skip + limit]]
+
+    @app.get("/search")
+    async def search_samples(query: str, skip: int = 0, limit: int = 10):
+        return [legacy_serialize(doc) for doc in docs[skip:skip + limit]]
+
+    return app
+
+
+def current_app(docs: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/samples", response_model=List[Dict[str, Any]])
+    async def get_samples(skip: int = 0, limit: int = 10):
+        return ORJSONResponse([to_json_native(doc) for doc in docs[skip:skip + limit]])
+
+    @app.get("/search")
+    async def search_samples(query: str, skip: int = 0, limit: int = 10):
+        return ORJSONResponse([to_json_native(doc) for doc in docs[skip:skip + limit]])
+
+    return app
+
+
+def summary_app(docs: List[Dict[str, Any]]) -> FastAPI:
+    # MongoDB applies the projection server-side; emulate it up front
+    fields = [field for field in list_projection() if field != '_id']
+    summaries = [{field: doc.get(field) for field in fields} for doc in docs]
+    return current_app(summaries)
+
+
+async def call(app: FastAPI, path: str, query: str) -> bytes:
+    """Send one GET through the ASGI app and return the response body."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [], "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8000)
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, query: str, requests: int) -> Dict[str, Any]:
+    for _ in range(min(20, requests)):
+        await call(app, path, query)
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        body = await call(app, path, query)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "requests_per_sec": round(requests / sum(durations), 1),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+        "response_bytes": len(body)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="requests per route and variant")
+    parser.add_argument("--paragraphs", type=int, default=4, help="paragraphs per section (document size)")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    docs = stored_documents(100, args.paragraphs)
+    apps = {"legacy": legacy_app(docs), "current": current_app(docs), "summary": summary_app(docs)}
+    routes = [("/samples", "limit=10"), ("/samples", "limit=100"), ("/search", "query=model&limit=10")]
+
+    # Full-document paths must produce the same JSON
+    for path, query in routes:
+        legacy, current = (asyncio.run(call(apps[name], path, query)) for name in ("legacy", "current"))
+        assert json.loads(legacy) == json.loads(current), f"{path}?{query} responses differ"
+
+    results = {}
+    for path, query in routes:
+        route = f"{path}?{query}"
+        results[route] = {name: asyncio.run(measure(app, path, query, args.requests)) for name, app in apps.items()}
+        print(route)
+        for name, result in results[route].items():
+            speedup = result["requests_per_sec"] / results[route]["legacy"]["requests_per_sec"]
+            print(f"  {name:<8} {result['requests_per_sec']:>8} req/s  p50 {result['p50_ms']:>7} ms  "
+                  f"{result['response_bytes']:>7} bytes  x{speedup:.1f}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
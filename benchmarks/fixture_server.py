@@ -0,0 +1,135 @@
+"""Local HTTP server serving synthetic sample pages with injectable latency and throttling."""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from synthetic import SAMPLE_PREFIX, generate_page
+
+
+class FixtureServer:
+    def __init__(self, pages: int = 200, paragraphs: int = 4, links: int = 8,
+                 latency: float = 0.0, jitter: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: str = "0", seed: int = 0, port: int = 0):
+        """
+        Serve `pages` synthetic samples under /ia-sample/ib-math-ai-sl/<id>.
+        Each response is delayed by `latency` plus up to `jitter` seconds, and
+        a `throttle_rate` fraction of requests is answered 429 with Retry-After.
+        """
+        self.pages = pages
+        self.paragraphs = paragraphs
+        self.links = links
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.counts: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cache: Dict[int, bytes] = {}
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, index: int) -> str:
+        return f"{self.base_url}{SAMPLE_PREFIX}{index:024x}"
+
+    def _page(self, index: int) -> bytes:
+        with self._lock:
+            body = self._cache.get(index)
+        if body is None:
+            body = generate_page(index, self.pages, self.paragraphs, self.links, self.seed).encode('utf-8')
+            with self._lock:
+                self._cache[index] = body
+        return body
+
+    def _count(self, status: int):
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Dict[str, str] = None):
+                server._count(status)
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with server._lock:
+                    delay = server.latency + server._rng.random() * server.jitter
+                    throttled = server._rng.random() < server.throttle_rate
+                if delay:
+                    time.sleep(delay)
+                if throttled:
+                    self._send(429, b'Too Many Requests', {'Retry-After': server.retry_after})
+                    return
+
+                path = self.path.split('?', 1)[0].split('#', 1)[0]
+                if not path.startswith(SAMPLE_PREFIX):
+                    self._send(404, b'Not Found')
+                    return
+                try:
+                    index = int(path[len(SAMPLE_PREFIX):], 16)
+                except ValueError:
+                    index = -1
+                if not 0 <= index < server.pages:
+                    self._send(404, b'Not Found')
+                    return
+                self._send(200, server._page(index))
+
+        return Handler
+
+    def start(self) -> 'FixtureServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with FixtureServer(pages=args.pages, port=args.port, latency=args.latency,
+                       throttle_rate=args.throttle_rate) as fixture:
+        print(f"Serving {args.pages} synthetic samples, e.g. {fixture.url(0)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,68 @@
+"""
+Compare extraction throughput and peak memory of the parser backends.
+
+Each backend runs in a fresh process so peak RSS is measured independently:
+
+    python benchmarks/parser_backends.py --pages 2000
+    python benchmarks/parser_backends.py --pages 500 page1.html page2.html
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from src.scraper.nailib_scraper import NailibScraper, PARSER_BACKENDS
+
+DEFAULT_CORPUS = [Path(project_root) / "tests" / "fixtures" / "sample_page.html"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_backend(backend: str, pages, results):
+    scraper = NailibScraper(parser_backend=backend)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    for index, html_content in enumerate(pages):
+        scraper.parse_page(html_content, f"https://nailib.com/ia-sample/ib-math-ai-sl/{index:024x}")
+    elapsed = time.perf_counter() - start
+    results[backend] = {
+        "pages_per_sec": len(pages) / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": peak_rss_mb() - baseline
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", type=Path, help="HTML pages to parse (default: test fixture)")
+    parser.add_argument("--pages", type=int, default=1000, help="pages parsed per backend")
+    args = parser.parse_args()
+
+    corpus = [path.read_text(encoding="utf-8") for path in (args.files or DEFAULT_CORPUS)]
+    pages = [corpus[i % len(corpus)] for i in range(args.pages)]
+
+    results = multiprocessing.Manager().dict()
+    for backend in PARSER_BACKENDS:
+        process = multiprocessing.Process(target=run_backend, args=(backend, pages, results))
+        process.start()
+        process.join()
+
+    print(f"{'backend':<8} {'pages/sec':>10} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    for backend in PARSER_BACKENDS:
+        r = results[backend]
+        print(f"{backend:<8} {r['pages_per_sec']:>10.1f} {r['peak_rss_mb']:>12.1f} {r['rss_growth_mb']:>14.1f}")
+    bs4, lxml = results['bs4'], results['lxml']
+    print(f"lxml speedup: {lxml['pages_per_sec'] / bs4['pages_per_sec']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
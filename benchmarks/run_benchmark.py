@@ -0,0 +1,233 @@
+"""
+End-to-end crawler benchmark against a local fixture server.
+
+Serves synthetic sample pages, then runs discovery, per-page scraping
+(fetch, parse, validate), storage and the streaming crawl pipeline. Reports
+pages/sec, p50/p95 per-stage latency and peak RSS, and saves them as JSON
+so runs can be compared across commits:
+
+    python benchmarks/run_benchmark.py --pages 300 --latency 0.01 --throttle-rate 0.05
+    python benchmarks/run_benchmark.py --mongodb-uri mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from fixture_server import FixtureServer
+from src.scraper.async_scraper import AsyncNailibScraper
+from src.scraper.nailib_scraper import NailibScraper
+from src.scraper.pipeline import CrawlPipeline
+from src.scraper.rate_limiter import AdaptiveRateLimiter
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Count and p50/p95/mean latency in milliseconds."""
+    to_ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        "count": len(samples),
+        "p50_ms": to_ms(percentile(samples, 0.50)),
+        "p95_ms": to_ms(percentile(samples, 0.95)),
+        "mean_ms": to_ms(sum(samples) / len(samples)) if samples else None
+    }
+
+
+def timed(func, samples: List[float]):
+    """Wrap `func`, appending each call's duration to `samples`."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class NullWriter:
+    def __init__(self, batch_size: int = 100, flush_interval: float = 1.0):
+        """Writer with the BulkWriteBuffer interface that discards samples, to benchmark without MongoDB."""
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+
+    def add(self, sample: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self._buffer.append(sample)
+        return self.flush() if len(self._buffer) >= self.batch_size else []
+
+    def flush_if_due(self) -> List[Dict[str, Any]]:
+        return self.flush()
+
+    def flush(self) -> List[Dict[str, Any]]:
+        results = [{"url": s["url"], "ok": True, "changed": True, "error": None} for s in self._buffer]
+        self._buffer = []
+        return results
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+def make_writer(args, db_clients: list):
+    if not args.mongodb_uri:
+        return NullWriter(batch_size=args.batch_size)
+    from src.database.mongo_client import MongoDBClient
+    client = MongoDBClient(uri=args.mongodb_uri, db_name=args.db_name, collection_name='samples')
+    client.collection.delete_many({})
+    db_clients.append(client)
+    return client.buffered_writer(batch_size=args.batch_size, flush_interval=1.0)
+
+
+def make_rate_limiter(args) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(rate=args.host_rate, burst=args.host_rate, max_rate=args.host_rate * 4)
+
+
+def run(args) -> Dict[str, Any]:
+    stages: Dict[str, List[float]] = {"fetch": [], "parse": [], "validate": [], "store": []}
+    throughput: Dict[str, float] = {}
+    memory: Dict[str, float] = {"start": peak_rss_mb()}
+    db_clients: list = []
+
+    server = FixtureServer(
+        pages=args.pages, paragraphs=args.paragraphs, links=args.links,
+        latency=args.latency, jitter=args.jitter, throttle_rate=args.throttle_rate, seed=args.seed
+    ).start()
+    scraper_kwargs = {"base_url": server.base_url, "parser_backend": args.parser_backend}
+    try:
+        # Discovery: breadth-first fetch and link extraction
+        scraper = NailibScraper(rate_limiter=make_rate_limiter(args), **scraper_kwargs)
+        scraper._make_request = timed(scraper._make_request, [])
+        start = time.perf_counter()
+        discovered = scraper.discover_samples(server.url(0), max_samples=args.pages)
+        throughput["discover"] = len(discovered) / (time.perf_counter() - start)
+        memory["discover"] = peak_rss_mb()
+
+        # Per-page scraping, timing each stage separately
+        scraper = NailibScraper(rate_limiter=make_rate_limiter(args), **scraper_kwargs)
+        fetch = timed(scraper._make_request, stages["fetch"])
+        parse = timed(scraper.parse_sample, stages["parse"])
+        validate = timed(scraper.validate_sample_data, stages["validate"])
+        samples = []
+        start = time.perf_counter()
+        for url in discovered:
+            html_content = fetch(url)
+            sample = parse(html_content, url) if html_content else None
+            if sample and validate(sample):
+                samples.append(sample)
+        throughput["scrape"] = len(samples) / (time.perf_counter() - start)
+        memory["scrape"] = peak_rss_mb()
+
+        # Storage through the bulk write buffer
+        writer = make_writer(args, db_clients)
+        add = timed(writer.add, stages["store"])
+        start = time.perf_counter()
+        stored = sum(result["ok"] for sample in samples for result in add(sample))
+        stored += sum(result["ok"] for result in timed(writer.flush, stages["store"])())
+        throughput["store"] = stored / (time.perf_counter() - start)
+        memory["store"] = peak_rss_mb()
+
+        # Streaming pipeline: everything at once
+        async def crawl():
+            async with AsyncNailibScraper(
+                concurrency=args.concurrency, rate_limiter=make_rate_limiter(args), **scraper_kwargs
+            ) as async_scraper:
+                pipeline = CrawlPipeline(async_scraper, make_writer(args, db_clients), max_pages=args.pages)
+                return await pipeline.run([server.url(0)])
+
+        start = time.perf_counter()
+        pipeline_stats = asyncio.run(crawl())
+        throughput["pipeline"] = pipeline_stats["stored"] / (time.perf_counter() - start)
+        memory["pipeline"] = peak_rss_mb()
+    finally:
+        server.stop()
+        for client in db_clients:
+            client.close()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "pages_discovered": len(discovered),
+        "pages_per_sec": {stage: round(value, 2) for stage, value in throughput.items()},
+        "latency": {stage: summarize(samples) for stage, samples in stages.items()},
+        "pipeline": pipeline_stats,
+        "peak_rss_mb": {stage: round(value, 1) for stage, value in memory.items()},
+        "server_responses": {str(status): count for status, count in sorted(server.counts.items())}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="synthetic samples served and crawled")
+    parser.add_argument("--paragraphs", type=int, default=4, help="paragraphs per section (page size)")
+    parser.add_argument("--links", type=int, default=8, help="related-sample links per page")
+    parser.add_argument("--latency", type=float, default=0.0, help="server delay per response (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay per response (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--host-rate", type=float, default=500.0, help="initial per-host request rate")
+    parser.add_argument("--concurrency", type=int, default=10, help="pipeline fetch concurrency")
+    parser.add_argument("--batch-size", type=int, default=100, help="samples per bulk write")
+    parser.add_argument("--parser-backend", choices=["bs4", "lxml"], default="lxml")
+    parser.add_argument("--mongodb-uri", help="store into this MongoDB instead of discarding samples")
+    parser.add_argument("--db-name", default="nailib_benchmark", help="database emptied and used for storage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="ERROR", help="crawler log level while benchmarking")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+
+    results = run(args)
+    output = args.output
+    if output is None:
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        output = RESULTS_DIR / f"{stamp}-{results['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    results["config"]["output"] = str(output)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(f"pages/sec: {results['pages_per_sec']}")
+    for stage, summary in results["latency"].items():
+        print(f"{stage:<9} n={summary['count']:<5} p50={summary['p50_ms']} ms p95={summary['p95_ms']} ms")
+    print(f"peak RSS MB: {results['peak_rss_mb']}")
+    print(f"server responses: {results['server_responses']}")
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
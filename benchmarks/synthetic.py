@@ -0,0 +1,87 @@
+"""Synthetic Nailib-style sample pages for benchmarks."""
+import random
+from typing import List
+
+SAMPLE_PREFIX = "/ia-sample/ib-math-ai-sl/"
+
+SECTION_HEADINGS = [
+    "Introduction",
+    "Mathematical Information",
+    "Mathematical Processes",
+    "Interpretation of Findings",
+    "Validity and Limitations",
+    "Academic Honesty"
+]
+
+WORDS = (
+    "model data function regression logistic growth rate sample population estimate "
+    "variable correlation hypothesis distribution parameter derivative integral curve "
+    "error limitation assumption result trend analysis graph table survey measure"
+).split()
+
+
+def sample_id(index: int) -> str:
+    """Deterministic 24-hex-char ObjectId-like id for page `index`."""
+    return f"{index:024x}"
+
+
+def sample_path(index: int) -> str:
+    return f"{SAMPLE_PREFIX}{sample_id(index)}"
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def generate_page(index: int, total_pages: int, paragraphs: int = 4, links: int = 8,
+                  seed: int = 0) -> str:
+    """
+    A sample page shaped like the real site: title, description, stats,
+    date, six sections of `paragraphs` paragraphs each (with checklist
+    items), file downloads, and `links` related-sample links.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    sections = []
+    for heading in SECTION_HEADINGS:
+        body = [f"<p>{_sentence(rng)} {_sentence(rng)}</p>" for _ in range(paragraphs)]
+        body.append(f"<p>• {_sentence(rng, 5)}</p>")
+        body.append(f"<p>- {_sentence(rng, 5)}</p>")
+        sections.append(f"<h2>{heading}</h2>\n" + '\n'.join(body))
+
+    related = [rng.randrange(total_pages) for _ in range(links)]
+    related_links = '\n'.join(
+        f'<a href="{sample_path(target)}">Related sample {target}</a>' for target in related
+    )
+    words = paragraphs * len(SECTION_HEADINGS) * 28
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Synthetic sample {index} | Nailib</title>
+  <script>window.__STATE__ = {{"page": "ia-sample", "id": "{sample_id(index)}"}};</script>
+</head>
+<body>
+  <nav><a href="/">Home</a><a href="/ia-sample">All samples</a></nav>
+  <main>
+    <article>
+      <h1 class="title">Synthetic sample {index}: {_sentence(rng, 6)}</h1>
+      <div class="description">{_sentence(rng, 25)}</div>
+      <div class="article-stats"><span>{words} words</span> <span>{max(1, words // 200)} mins read</span></div>
+      <time datetime="2024-{1 + index % 12:02d}-{1 + index % 28:02d}T10:00:00">date</time>
+      <div class="content">
+{chr(10).join(sections)}
+      </div>
+      <div class="downloads"><a href="/files/sample-{index}.pdf">Download the full IA (PDF)</a></div>
+    </article>
+    <div class="related-samples">
+{related_links}
+    </div>
+  </main>
+</body>
+</html>
+"""
+
+
+def generate_corpus(pages: int, paragraphs: int = 4, links: int = 8, seed: int = 0) -> List[str]:
+    return [generate_page(i, pages, paragraphs, links, seed) for i in range(pages)]
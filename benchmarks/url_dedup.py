@@ -0,0 +1,97 @@
+"""
+Measure the memory each seen-set implementation holds per URL.
+
+Every variant is filled with the same sample URLs (ObjectId-suffixed, as
+on nailib.com, plus a share of other URLs). Memory is traced with
+tracemalloc, so it counts every allocation the set makes, including the
+URL strings a plain set keeps alive:
+
+    python benchmarks/url_dedup.py --urls 200000
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from src.scraper.url_dedup import CompactURLSet, canonicalize_url
+
+PREFIXES = [
+    "https://nailib.com/ia-sample/ib-math-ai-sl/",
+    "https://nailib.com/ia-sample/ib-math-aa-hl/",
+    "https://nailib.com/ee-sample/ib-physics/"
+]
+
+
+def sample_urls(count: int, other_share: float) -> List[str]:
+    """ObjectId-suffixed sample URLs, with every 1/other_share-th one a non-sample URL."""
+    step = round(1 / other_share) if other_share else 0
+    urls = []
+    for index in range(count):
+        if step and index % step == 0:
+            urls.append(f"https://nailib.com/blog/post-{index}?ref=sitemap")
+        else:
+            urls.append(f"{PREFIXES[index % len(PREFIXES)]}{index * 2654435761 % 16 ** 24:024x}")
+    return urls
+
+
+def measure(factory: Callable[[], Any], urls: List[str]) -> Dict[str, float]:
+    """Bytes per URL held after adding every URL, and the time per add."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    seen = factory()
+    for url in urls:
+        seen.add(url)
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert all(url in seen for url in urls[:1000])
+    return {
+        "bytes_per_url": round(held / len(urls), 1),
+        "add_us": round(elapsed / len(urls) * 1e6, 2)
+    }
+
+
+class StringSet(set):
+    """The set of canonical URL strings the seen-set replaced."""
+
+    def add(self, url: str):
+        super().add(canonicalize_url(url))
+
+    def __contains__(self, url: str) -> bool:
+        return super().__contains__(canonicalize_url(url))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=200000, help="URLs added to each set")
+    parser.add_argument("--other-share", type=float, default=0.0,
+                        help="share of URLs without an ObjectId, stored as plain strings")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    urls = sample_urls(args.urls, args.other_share)
+    variants = {
+        "set[str]": StringSet,
+        "CompactURLSet": CompactURLSet
+    }
+    # Strings passed in are allocated before tracing starts, so only what each set keeps is counted
+    results = {name: measure(factory, urls) for name, factory in variants.items()}
+    print(f"{args.urls} URLs, {args.other_share:.0%} without an ObjectId")
+    for name, result in results.items():
+        print(f"  {name:<18} {result['bytes_per_url']:>7} bytes/URL  {result['add_us']:>6} us/add")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
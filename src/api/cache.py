@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from src.monitoring.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = REGISTRY.counter(
+    'api_cache_requests_total', 'Response cache lookups (hit, miss, expired or stale version)', ['result']
+)
+CACHE_EVICTIONS = REGISTRY.counter('api_cache_evictions_total', 'Entries evicted to stay within max_entries')
+CACHE_ENTRIES = REGISTRY.gauge('api_cache_entries', 'Responses held in the cache')
+
+
+def cache_key(path: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Route path plus sorted, non-empty query parameters, so equivalent URLs share an entry."""
+    items = sorted((name, value.strip()) for name, value in params if value.strip())
+    return f"{path}?{urlencode(items)}" if items else path
+
+
+class TTLCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Bounded LRU cache whose entries expire after `ttl` seconds and are
+        tagged with the data version they were built from; a lookup with a
+        newer version misses, which invalidates every entry at once.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            value = None
+            if entry is None:
+                result = 'miss'
+            elif entry[1] != version:
+                result = 'stale'
+            elif entry[0] <= self.clock():
+                result = 'expired'
+            else:
+                result, value = 'hit', entry[2]
+                self._entries.move_to_end(key)
+            if entry is not None and value is None:
+                del self._entries[key]
+            CACHE_ENTRIES.set(len(self._entries))
+        CACHE_REQUESTS.inc(result=result)
+        return value
+
+    def set(self, key: Hashable, value: Any, version: Any):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            CACHE_ENTRIES.set(len(self._entries))
+        if evicted:
+            CACHE_EVICTIONS.inc(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionPoller:
+    def __init__(self, fetch: Callable[[], Awaitable[Any]], interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Remember the data version returned by the coroutine `fetch` for
+        `interval` seconds, so cached responses cost at most one version
+        lookup per interval; requests arriving while it runs share it.
+        Returns None while the version cannot be read, which bypasses caching.
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.clock = clock
+        self._version: Any = None
+        self._checked_at: Optional[float] = None
+        self._pending: Optional[asyncio.Future] = None
+
+    async def current(self) -> Any:
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.interval:
+            return self._version
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._read(now))
+        return await asyncio.shield(self._pending)
+
+    async def _read(self, now: float) -> Any:
+        try:
+            version = await self.fetch()
+        except Exception as e:
+            logger.error(f"Error reading data version: {str(e)}")
+            version = None
+        finally:
+            self._pending = None
+        self._version = version
+        self._checked_at = now
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        return {"version": self._version, "interval": self.interval}
@@ -0,0 +1,42 @@
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict
+
+import orjson
+
+from src.monitoring.metrics import REGISTRY
+
+EXPORT_DOCUMENTS = REGISTRY.counter('api_export_documents_total', 'Documents streamed by /export')
+EXPORT_BYTES = REGISTRY.counter('api_export_bytes_total', 'Bytes streamed by /export, after compression')
+
+# Bytes of NDJSON buffered before a chunk is compressed and sent
+CHUNK_SIZE = 64 * 1024
+
+
+async def ndjson_chunks(docs: AsyncIterable[Dict[str, Any]], gzip: bool = False,
+                        chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Encode documents as NDJSON, one per line, in chunks of about `chunk_size`
+    bytes, optionally as a gzip stream. Only one chunk is held at a time, so
+    memory stays flat however many documents pass through.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    buffer = bytearray()
+
+    def encode(data: bytes, final: bool = False) -> bytes:
+        if compressor:
+            data = compressor.compress(data) + (compressor.flush() if final else b"")
+        EXPORT_BYTES.inc(len(data))
+        return data
+
+    async for doc in docs:
+        buffer += orjson.dumps(doc)
+        buffer += b"\n"
+        EXPORT_DOCUMENTS.inc()
+        if len(buffer) >= chunk_size:
+            chunk = encode(bytes(buffer))
+            buffer.clear()
+            if chunk:
+                yield chunk
+    tail = encode(bytes(buffer), final=True)
+    if tail:
+        yield tail
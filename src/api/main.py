@@ -1,17 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Dict, Any, Optional
+import hmac
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
 
-from src.database.mongo_client import MongoDBClient
+from src.api.cache import TTLCache, VersionPoller, cache_key
+from src.api.export import ndjson_chunks
+from src.database.async_mongo_client import AsyncMongoDBClient
+from src.database.mongo_client import EXPORT_FIELDS, LIST_FIELDS, list_projection
+from src.config import settings
+from src.monitoring.metrics import CONTENT_TYPE, REGISTRY
+from src.monitoring.profiling import PROFILER
 from dotenv import load_dotenv
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
@@ -19,7 +29,21 @@ from fastapi import Request
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Nailib Sample API", description="API for accessing IB Math AI SL samples")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to MongoDB before serving and release the pool on shutdown."""
+    await db_client.connect()
+    yield
+    db_client.close()
+
+# Routes return ORJSONResponse themselves, so documents are encoded once,
+# skipping FastAPI's jsonable_encoder and response_model validation passes
+app = FastAPI(
+    title="Nailib Sample API",
+    description="API for accessing IB Math AI SL samples",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Configure CORS
 app.add_middleware(
@@ -28,15 +52,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Cache"],
 )
 
-# Initialize MongoDB client
-db_client = MongoDBClient(
+# Per-route request metrics, labelled by route template rather than raw path
+REQUESTS = REGISTRY.counter('api_requests_total', 'API requests by route and status', ['method', 'route', 'status'])
+REQUEST_SECONDS = REGISTRY.histogram('api_request_seconds', 'API request latency', ['method', 'route'])
+REQUESTS_IN_FLIGHT = REGISTRY.gauge('api_requests_in_flight', 'API requests being served')
+
+# Opt-in request profiling, armed by PROFILE_MODE at startup or through /admin/profile
+PROFILER.configure(settings.PROFILE_DIR, settings.PROFILE_SAMPLE_INTERVAL)
+if settings.PROFILE_MODE:
+    PROFILER.arm(settings.PROFILE_CALLS, settings.PROFILE_MODE)
+
+# Monitoring routes are never profiled themselves
+UNPROFILED_PREFIXES = ("/admin/", "/metrics", "/static/")
+
+# A profiled request holds the profiler until its response is ready. Both
+# cProfile and the sampler follow the event-loop thread, not the request's
+# task, so the profile also covers whatever else the loop runs meanwhile:
+# it describes the API process under load rather than one handler.
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    """Time each request and count it under its route template."""
+    start = time.perf_counter()
+    status = 500
+    path = request.url.path
+    with REQUESTS_IN_FLIGHT.track_inprogress():
+        try:
+            if PROFILER.armed and not path.startswith(UNPROFILED_PREFIXES):
+                with PROFILER.profile(f"{request.method} {path}"):
+                    response = await call_next(request)
+            else:
+                response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            route = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route)
+            REQUESTS.inc(method=request.method, route=route, status=status)
+
+# Initialize MongoDB client; queries share a pool of MONGO_MAX_POOL_SIZE connections
+db_client = AsyncMongoDBClient(
     uri=os.getenv("MONGODB_URI", "mongodb://localhost:27017"),
     db_name=os.getenv("DB_NAME", "nailib_samples"),
-    collection_name=os.getenv("COLLECTION_NAME", "samples")
+    collection_name=os.getenv("COLLECTION_NAME", "samples"),
+    max_pool_size=settings.MONGO_MAX_POOL_SIZE
 )
 
+# Read routes are cached per URL until the TTL passes or the crawler writes
+# new content, which bumps the data version polled here
+response_cache = TTLCache(settings.API_CACHE_MAX_ENTRIES, settings.API_CACHE_TTL)
+data_version = VersionPoller(db_client.data_version, settings.API_CACHE_VERSION_INTERVAL)
+
+async def cached(request: Request, build: Callable[[], Awaitable[Response]]) -> Response:
+    """Serve a read route from the response cache, building and storing it on a miss."""
+    version = await data_version.current() if settings.API_CACHE_TTL > 0 else None
+    if version is None:
+        return await build()
+    # Host is part of the key: rendered pages embed absolute static URLs
+    key = cache_key(request.url.netloc + request.url.path, request.query_params.multi_items())
+    entry = response_cache.get(key, version)
+    if entry is not None:
+        body, status, media_type, headers = entry
+        return Response(body, status_code=status, media_type=media_type,
+                        headers={**headers, "X-Cache": "HIT"})
+    response = await build()
+    if response.status_code == 200:
+        headers = {name: value for name, value in response.headers.items()
+                   if name not in ("content-length", "content-type")}
+        response_cache.set(key, (response.body, response.status_code, response.media_type, headers), version)
+    response.headers["X-Cache"] = "MISS"
+    return response
+
 # Setup static and template directories
 static_dir = os.path.join(project_root, "static")
 templates_dir = os.path.join(project_root, "templates")
@@ -50,73 +140,187 @@ templates = Jinja2Templates(directory=templates_dir)
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page showing sample statistics and search interface."""
-    try:
-        stats = db_client.get_stats()
+    async def render():
         return templates.TemplateResponse(
             "index.html",
-            {"request": request, "stats": stats}
+            {"request": request, "stats": await db_client.get_stats()}
         )
+
+    try:
+        return await cached(request, render)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/samples", response_model=List[Dict[str, Any]])
+def parse_fields(fields: Optional[str], allowed: tuple = LIST_FIELDS) -> Optional[List[str]]:
+    """Split a comma-separated fields parameter, rejecting fields the endpoint doesn't serve."""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    try:
+        list_projection(selected, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return selected
+
+async def page_response(query: Dict[str, Any], skip: int, limit: int, cursor: Optional[str],
+                        fields: Optional[List[str]]) -> ORJSONResponse:
+    """
+    One page of samples, most recently discovered first. Pages are chained
+    through the opaque X-Next-Cursor header; `skip` is still honoured for
+    older clients but costs O(skip) on the server.
+    """
+    if skip and not cursor:
+        return ORJSONResponse(await db_client.get_samples(query=query, skip=skip, limit=limit, fields=fields))
+    try:
+        samples, next_cursor = await db_client.get_samples_page(query=query, limit=limit, cursor=cursor, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(samples, headers=headers)
+
+@app.get("/samples")
 async def get_samples(
+    request: Request,
     skip: int = 0,
-    limit: int = 10,
-    search: Optional[str] = None
+    limit: int = Query(10, ge=1, le=1000),
+    search: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Get paginated list of samples with optional search."""
+    """Get paginated sample summaries with optional search; `fields` picks other list fields."""
+    selected = parse_fields(fields)
     try:
         query = {}
         if search:
             query = {"$text": {"$search": search}}
             
-        samples = db_client.get_samples(
-            query=query,
-            skip=skip,
-            limit=limit
-        )
-        
-        return samples
+        return await cached(request, lambda: page_response(query, skip, limit, cursor, selected))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/samples/{sample_id}")
 async def get_sample(sample_id: str):
-    """Get a specific sample by ID."""
+    """Get a specific sample by ID, including the full section bodies."""
     try:
-        sample = db_client.get_sample_by_id(sample_id)
-        if not sample:
-            raise HTTPException(status_code=404, detail="Sample not found")
-        return sample
+        sample = await db_client.get_sample_by_id(sample_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not sample:
+        raise HTTPException(status_code=404, detail="Sample not found")
+    return ORJSONResponse(sample)
 
 @app.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get collection statistics."""
+    async def build():
+        return ORJSONResponse(await db_client.get_stats())
+
     try:
-        stats = db_client.get_stats()
-        return stats
+        return await cached(request, build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/search")
 async def search_samples(
+    request: Request,
     query: str,
     skip: int = 0,
-    limit: int = 10
+    limit: int = Query(10, ge=1, le=1000),
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Search samples using text search."""
+    """Search sample summaries using text search; `fields` picks other list fields."""
+    selected = parse_fields(fields)
     try:
         search_query = {
             "$text": {"$search": query}
         }
-        samples = db_client.get_samples(search_query, skip, limit)
-        return samples
+        return await cached(request, lambda: page_response(search_query, skip, limit, cursor, selected))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/export")
+async def export_samples(
+    subject: Optional[str] = None,
+    search: Optional[str] = None,
+    since: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    gzip: bool = False
+):
+    """
+    Stream every matching sample as NDJSON, oldest update first, optionally
+    gzip-compressed. `since` keeps samples updated at or after it, for
+    incremental pulls; `fields` picks fields, including `sections`.
+    """
+    selected = parse_fields(fields, EXPORT_FIELDS)
+    query: Dict[str, Any] = {}
+    if subject:
+        query["subject"] = subject
+    if search:
+        query["$text"] = {"$search": search}
+    if since:
+        # Timestamps are stored as naive UTC
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        query["last_updated"] = {"$gte": since}
+
+    docs = db_client.iter_samples(query, fields=selected, batch_size=settings.EXPORT_BATCH_SIZE)
+    filename = "samples.ndjson.gz" if gzip else "samples.ndjson"
+    return StreamingResponse(
+        ndjson_chunks(docs, gzip=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose API and database metrics in the Prometheus text format."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+def check_admin_token(token: Optional[str]):
+    """Admin routes exist only when PROFILE_ADMIN_TOKEN is set, and require it."""
+    if not settings.PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, settings.PROFILE_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/profile", include_in_schema=False)
+async def profile_status(x_admin_token: Optional[str] = Header(None)):
+    """Show the profiling session and the dumps written by this process."""
+    check_admin_token(x_admin_token)
+    return PROFILER.status()
+
+@app.post("/admin/profile", include_in_schema=False)
+async def start_profile(calls: int = 50, mode: str = "cprofile",
+                        x_admin_token: Optional[str] = Header(None)):
+    """Profile the next `calls` API requests with cProfile or stack sampling."""
+    check_admin_token(x_admin_token)
+    try:
+        PROFILER.arm(calls, mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PROFILER.status()
+
+@app.delete("/admin/profile", include_in_schema=False)
+async def stop_profile(x_admin_token: Optional[str] = Header(None)):
+    """End the profiling session early and dump what was collected."""
+    check_admin_token(x_admin_token)
+    PROFILER.stop()
+    return PROFILER.status()
+
+@app.get("/admin/profile/{name}", include_in_schema=False)
+async def download_profile(name: str, x_admin_token: Optional[str] = Header(None)):
+    """Download a pstats or collapsed-stack dump."""
+    check_admin_token(x_admin_token)
+    path = PROFILER.dump_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -8,14 +8,56 @@ load_dotenv()
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
 DB_NAME = os.getenv('DB_NAME', 'nailib_samples')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME', 'samples')
+DB_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '100'))
+DB_FLUSH_INTERVAL = float(os.getenv('DB_FLUSH_INTERVAL', '5'))
 
 # Scraper settings
 BASE_URL = "https://nailib.com"
 DEFAULT_SAMPLE_URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+SCRAPER_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', '10'))
+SCRAPER_HOST_RATE = float(os.getenv('SCRAPER_HOST_RATE', '2.0'))
+SCRAPER_HOST_BURST = float(os.getenv('SCRAPER_HOST_BURST', '4'))
+SCRAPER_MIN_HOST_RATE = float(os.getenv('SCRAPER_MIN_HOST_RATE', '0.1'))
+SCRAPER_MAX_HOST_RATE = float(os.getenv('SCRAPER_MAX_HOST_RATE', '20'))
+SCRAPER_LATENCY_TARGET = float(os.getenv('SCRAPER_LATENCY_TARGET', '2.0'))
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', '')
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '256'))
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+PARSE_BATCH_SIZE = int(os.getenv('PARSE_BATCH_SIZE', '8'))
+PARSER_BACKEND = os.getenv('PARSER_BACKEND', 'lxml')
+EXTRACTION_PROFILES_PATH = os.getenv('EXTRACTION_PROFILES_PATH') or None
+CAPTURE_PATH = os.getenv('CAPTURE_PATH', '')
+REPLAY_PATH = os.getenv('REPLAY_PATH', '')
+CRAWL_MAX_PAGES = int(os.getenv('CRAWL_MAX_PAGES', '20'))
+CRAWL_QUEUE_SIZE = int(os.getenv('CRAWL_QUEUE_SIZE', '50'))
+SCHEDULE_PATH = os.getenv('SCHEDULE_PATH', 'data/schedule.sqlite3')
+RECRAWL_INITIAL_INTERVAL = float(os.getenv('RECRAWL_INITIAL_INTERVAL', str(6 * 3600)))
+RECRAWL_MIN_INTERVAL = float(os.getenv('RECRAWL_MIN_INTERVAL', '3600'))
+RECRAWL_MAX_INTERVAL = float(os.getenv('RECRAWL_MAX_INTERVAL', str(7 * 86400)))
+CRAWL_MODE = os.getenv('CRAWL_MODE', 'local')
+WORK_QUEUE_LEASE_SECONDS = float(os.getenv('WORK_QUEUE_LEASE_SECONDS', '60'))
+FRONTIER_PATH = os.getenv('FRONTIER_PATH', 'data/frontier.sqlite3')
+FRONTIER_MAX_ATTEMPTS = int(os.getenv('FRONTIER_MAX_ATTEMPTS', '3'))
+FRONTIER_CHECKPOINT_INTERVAL = float(os.getenv('FRONTIER_CHECKPOINT_INTERVAL', '5'))
+ROUND_MIN_DELAY = float(os.getenv('ROUND_MIN_DELAY', '5'))
+ROUND_MAX_DELAY = float(os.getenv('ROUND_MAX_DELAY', '300'))
+
+# Monitoring settings
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+PROFILE_MODE = os.getenv('PROFILE_MODE', '')
+PROFILE_CALLS = int(os.getenv('PROFILE_CALLS', '50'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'data/profiles')
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+PROFILE_ADMIN_TOKEN = os.getenv('PROFILE_ADMIN_TOKEN', '')
 
 # API settings
 API_HOST = "0.0.0.0"
 API_PORT = 8000
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '100'))
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '500'))
+API_CACHE_TTL = float(os.getenv('API_CACHE_TTL', '30'))
+API_CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', '1024'))
+API_CACHE_VERSION_INTERVAL = float(os.getenv('API_CACHE_VERSION_INTERVAL', '1'))
 
 # Logging settings
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
\ No newline at end of file
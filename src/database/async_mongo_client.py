@@ -0,0 +1,184 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+from bson import ObjectId
+from bson.errors import InvalidId
+import logging
+from typing import Dict, Any, AsyncIterator, Optional, List, Iterable, Tuple
+from datetime import datetime
+
+from .mongo_client import (
+    EXPORT_FIELDS, EXPORT_SORT, INDEXES, PAGE_SORT, STATS_COLLECTION, VERSIONS_COLLECTION,
+    list_projection, page_filters, split_page, stats_changed, stats_document, stats_pipeline, to_json_native,
+    version_bump
+)
+from ..monitoring.profiling import timed
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongoDBClient:
+    def __init__(self, uri: str, db_name: str, collection_name: str, max_pool_size: int = 100):
+        """
+        Read-side counterpart of MongoDBClient on Motor, for the API. Queries
+        await a pooled connection instead of blocking the event loop, so up to
+        `max_pool_size` of them run concurrently. The client connects lazily;
+        call connect() at startup to fail fast and ensure indexes.
+        """
+        self.client = AsyncIOMotorClient(uri, serverSelectionTimeoutMS=5000, maxPoolSize=max_pool_size)
+        self.db = self.client[db_name]
+        self.collection_name = collection_name
+        self.collection = self.db[collection_name]
+        self._stats_refresh: Optional[asyncio.Future] = None
+
+    async def connect(self):
+        """Check the connection and ensure the indexes list and search queries rely on."""
+        try:
+            await self.client.admin.command('ping')
+            logger.info(f"Successfully connected to MongoDB database: {self.db.name}")
+        except PyMongoError as e:
+            logger.error(f"Could not connect to MongoDB server: {str(e)}")
+            raise
+        for keys, options in INDEXES:
+            try:
+                await self.collection.create_index(keys, **options)
+            except PyMongoError as e:
+                logger.error(f"Error creating indexes: {str(e)}")
+
+    @timed
+    async def get_samples(self, query: Dict = None, limit: int = 100, skip: int = 0,
+                          fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Retrieve `fields` of samples (SUMMARY_FIELDS by default) in PAGE_SORT order with skip/limit."""
+        projection = list_projection(fields)
+        try:
+            cursor = self.collection.find(query or {}, projection).sort(PAGE_SORT).skip(skip).limit(limit)
+            return [to_json_native(sample) async for sample in cursor]
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return []
+
+    @timed
+    async def get_samples_page(self, query: Dict = None, limit: int = 100, cursor: Optional[str] = None,
+                               fields: Optional[Iterable[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of samples after `cursor`, as MongoDBClient.get_samples_page.
+        Raises ValueError for a malformed cursor.
+        """
+        projection = list_projection(fields)
+        limit = max(1, limit)
+        filters = page_filters(query, cursor)
+        try:
+            # The sort key is always fetched to build the next cursor
+            docs = await (
+                self.collection.find(filters, dict(projection, _id=1))
+                .sort(PAGE_SORT)
+                .limit(limit + 1)
+                .to_list(length=limit + 1)
+            )
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return [], None
+
+        page, next_cursor = split_page(docs, limit, projection)
+        return [to_json_native(doc) for doc in page], next_cursor
+
+    async def iter_samples(self, query: Dict = None, fields: Optional[Iterable[str]] = None,
+                           batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every matching sample in EXPORT_SORT order from a server-side
+        cursor, fetching `batch_size` documents per round trip. Yields whole
+        documents unless `fields` (from EXPORT_FIELDS) are given.
+        """
+        projection = list_projection(fields, EXPORT_FIELDS) if fields else None
+        cursor = self.collection.find(query or {}, projection).sort(EXPORT_SORT).batch_size(batch_size)
+        sent = 0
+        try:
+            async for doc in cursor:
+                yield to_json_native(doc)
+                sent += 1
+        except PyMongoError as e:
+            # Headers are already sent, so the client only sees a truncated stream
+            logger.error(f"MongoDB export error after {sent} documents: {str(e)}")
+            raise
+        finally:
+            await cursor.close()
+
+    async def get_sample_by_id(self, sample_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a full sample by its ObjectId string; None if malformed or not found."""
+        try:
+            object_id = ObjectId(sample_id)
+        except (InvalidId, TypeError):
+            return None
+        try:
+            doc = await self.collection.find_one({"_id": object_id})
+            return to_json_native(doc) if doc else None
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return None
+
+    async def get_sample_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a full sample by URL; None if not found."""
+        try:
+            doc = await self.collection.find_one({"url": url}, {'_id': 0})
+            return to_json_native(doc) if doc else None
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return None
+
+    @timed
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics the crawler precomputes. Before the first crawl
+        round they are computed here; concurrent requests share that one
+        aggregation instead of each running it.
+        """
+        try:
+            stats = await self.db[STATS_COLLECTION].find_one({"_id": self.collection_name}, {"_id": 0})
+        except PyMongoError as e:
+            logger.error(f"Error getting stats: {str(e)}")
+            return {}
+        if stats is not None:
+            return to_json_native(stats)
+        if self._stats_refresh is None:
+            self._stats_refresh = asyncio.ensure_future(self.refresh_stats())
+            self._stats_refresh.add_done_callback(self._refresh_done)
+        return await asyncio.shield(self._stats_refresh)
+
+    def _refresh_done(self, future: asyncio.Future):
+        self._stats_refresh = None
+
+    async def refresh_stats(self) -> Dict[str, Any]:
+        """Recompute the statistics document and store it, as MongoDBClient.refresh_stats."""
+        try:
+            now = datetime.utcnow()
+            facets = await self.collection.aggregate(stats_pipeline(now)).next()
+            stats = stats_document(facets, now)
+            previous = await self.db[STATS_COLLECTION].find_one_and_replace(
+                {"_id": self.collection_name}, stats, upsert=True
+            )
+            if stats_changed(previous, stats):
+                # Cached API responses embed these figures; drop them with the new ones
+                await self._bump_version()
+            return to_json_native({name: value for name, value in stats.items() if name != "_id"})
+        except PyMongoError as e:
+            logger.error(f"Error refreshing stats: {str(e)}")
+            return {}
+
+    async def _bump_version(self):
+        """Advance the collection's data version, as MongoDBClient._bump_version."""
+        try:
+            await self.db[VERSIONS_COLLECTION].update_one(
+                {"_id": self.collection_name}, version_bump(datetime.utcnow()), upsert=True
+            )
+        except PyMongoError as e:
+            logger.error(f"Error bumping data version: {str(e)}")
+
+    async def data_version(self) -> int:
+        """Counter bumped whenever sample content changes; 0 before the first write."""
+        doc = await self.db[VERSIONS_COLLECTION].find_one({"_id": self.collection_name}, {"version": 1})
+        return doc["version"] if doc else 0
+
+    def close(self):
+        """Close the connection pool."""
+        self.client.close()
+        logger.info("MongoDB connection closed")
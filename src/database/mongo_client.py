@@ -1,21 +1,207 @@
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError, ConnectionFailure, ServerSelectionTimeoutError
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError, ConnectionFailure, ServerSelectionTimeoutError
 from bson import ObjectId
-import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from bson.errors import InvalidId
+import base64
+import binascii
 import json
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from datetime import datetime, timedelta
+
+from ..monitoring.metrics import REGISTRY
+from ..monitoring.profiling import timed
 
 logger = logging.getLogger(__name__)
 
-class MongoJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder for MongoDB objects."""
-    def default(self, o):
-        if isinstance(o, ObjectId):
-            return str(o)
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return super().default(o)
+# Fields list endpoints may return; full section bodies come only from the detail endpoint
+LIST_FIELDS = (
+    '_id', 'url', 'title', 'subject', 'description', 'word_count', 'read_time',
+    'file_links', 'publication_date', 'last_updated', 'last_checked', 'content_hash'
+)
+
+# Fields /export may return; it streams whole documents unless fields are chosen
+EXPORT_FIELDS = LIST_FIELDS + ('sections',)
+
+# Default list projection: what a result card needs
+SUMMARY_FIELDS = (
+    '_id', 'url', 'title', 'subject', 'description', 'word_count', 'read_time',
+    'publication_date', 'last_updated'
+)
+
+# Keyset pagination order: most recently discovered first. _id is assigned
+# once when a sample is first stored, so updates never move a sample between
+# pages; last_updated is rewritten on every content change and can't be used.
+PAGE_SORT = [('_id', DESCENDING)]
+
+# Export order: oldest update first, so the last line of a pull is the next `since`
+EXPORT_SORT = [('last_updated', ASCENDING), ('_id', ASCENDING)]
+
+# Indexes every client ensures: text search, the update order /export reads
+# (backwards) and filters by `since`, and the url that upserts and
+# fingerprint lookups match on. Paging uses the built-in _id index.
+INDEXES = [
+    ([("title", "text"), ("description", "text"), ("sections.introduction.content", "text")], {}),
+    ([('last_updated', DESCENDING), ('_id', DESCENDING)], {}),
+    ([("url", ASCENDING)], {"unique": True})
+]
+
+# Collection holding one change counter per samples collection, bumped by writes
+VERSIONS_COLLECTION = 'collection_versions'
+
+# Collection holding one precomputed statistics document per samples collection
+STATS_COLLECTION = 'collection_stats'
+
+# Lower bounds of the word count histogram buckets; the last bucket is open-ended
+WORD_COUNT_BUCKETS = (0, 1000, 2000, 3000, 4000, 5000)
+
+# Stats that move every crawl round; left to the API cache TTL rather than invalidating it
+STATS_VOLATILE_FIELDS = ('freshness', 'computed_at')
+
+# Crawl freshness windows: samples last checked within each age
+FRESHNESS_WINDOWS = {'checked_24h': timedelta(days=1), 'checked_7d': timedelta(days=7),
+                     'checked_30d': timedelta(days=30)}
+
+DB_WRITE_SECONDS = REGISTRY.histogram('db_bulk_write_seconds', 'Duration of one bulk upsert round trip')
+DB_WRITE_DOCUMENTS = REGISTRY.counter(
+    'db_write_documents_total', 'Sample documents submitted for writing, by outcome', ['result']
+)
+
+def to_json_native(value: Any) -> Any:
+    """Convert a BSON value to JSON-native types in one pass (ObjectId and datetime become strings)."""
+    cls = type(value)
+    if cls is str or cls is int or cls is float or cls is bool or value is None:
+        return value
+    if cls is dict:
+        return {key: to_json_native(item) for key, item in value.items()}
+    if cls is list:
+        return [to_json_native(item) for item in value]
+    if cls is ObjectId:
+        return str(value)
+    if cls is datetime:
+        return value.isoformat()
+    # Subclasses (e.g. SON documents) take the slower isinstance route
+    if isinstance(value, dict):
+        return {str(key): to_json_native(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_native(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def stats_pipeline(now: datetime) -> List[Dict[str, Any]]:
+    """One aggregation pass computing every statistic get_stats serves."""
+    freshness = {
+        name: {"$sum": {"$cond": [{"$gte": ["$last_checked", now - window]}, 1, 0]}}
+        for name, window in FRESHNESS_WINDOWS.items()
+    }
+    return [{"$facet": {
+        "totals": [{"$group": {
+            "_id": None,
+            "total_samples": {"$sum": 1},
+            "avg_word_count": {"$avg": "$word_count"},
+            "latest_update": {"$max": "$last_updated"},
+            "latest_check": {"$max": "$last_checked"},
+            "oldest_check": {"$min": "$last_checked"},
+            **freshness
+        }}],
+        "subjects": [
+            {"$group": {"_id": "$subject", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}}
+        ],
+        "word_counts": [{"$bucket": {
+            "groupBy": "$word_count",
+            "boundaries": list(WORD_COUNT_BUCKETS) + [float('inf')],
+            "default": "unknown",
+            "output": {"count": {"$sum": 1}}
+        }}]
+    }}]
+
+def stats_document(facets: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Shape the stats_pipeline result into the stored statistics document."""
+    totals = facets["totals"][0] if facets["totals"] else {}
+    labels = {
+        low: f"{low}-{high - 1}" for low, high in zip(WORD_COUNT_BUCKETS, WORD_COUNT_BUCKETS[1:])
+    }
+    labels[WORD_COUNT_BUCKETS[-1]] = f"{WORD_COUNT_BUCKETS[-1]}+"
+    word_counts = {label: 0 for label in list(labels.values()) + ["unknown"]}
+    for bucket in facets["word_counts"]:
+        word_counts[labels.get(bucket["_id"], "unknown")] = bucket["count"]
+    avg_word_count = totals.get("avg_word_count")
+    return {
+        "total_samples": totals.get("total_samples", 0),
+        "subjects": [row["_id"] for row in facets["subjects"] if row["_id"]],
+        "subject_counts": [{"subject": row["_id"], "count": row["count"]} for row in facets["subjects"]],
+        "avg_word_count": round(avg_word_count) if avg_word_count is not None else None,
+        "word_count_buckets": word_counts,
+        "latest_update": totals.get("latest_update"),
+        "freshness": {
+            "latest_check": totals.get("latest_check"),
+            "oldest_check": totals.get("oldest_check"),
+            **{name: totals.get(name, 0) for name in FRESHNESS_WINDOWS}
+        },
+        "computed_at": now
+    }
+
+def stats_changed(previous: Optional[Dict[str, Any]], stats: Dict[str, Any]) -> bool:
+    """Whether a refreshed statistics document differs in the figures API responses embed."""
+    return previous is None or any(
+        previous.get(name) != value for name, value in stats.items() if name not in STATS_VOLATILE_FIELDS
+    )
+
+def version_bump(now: datetime) -> Dict[str, Any]:
+    """Update advancing a collection's data version, so API readers drop cached results."""
+    return {"$inc": {"version": 1}, "$set": {"updated_at": now}}
+
+def list_projection(fields: Optional[Iterable[str]] = None,
+                    allowed: Tuple[str, ...] = LIST_FIELDS) -> Dict[str, int]:
+    """MongoDB projection for list queries; raises ValueError for fields outside `allowed`."""
+    fields = list(dict.fromkeys(fields or SUMMARY_FIELDS))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    projection = {field: 1 for field in fields}
+    if '_id' not in projection:
+        projection['_id'] = 0
+    return projection
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque token for the page after `doc`, holding its sort key (_id)."""
+    raw = json.dumps([str(doc['_id'])], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+def page_filters(query: Optional[Dict[str, Any]], cursor: Optional[str]) -> Dict[str, Any]:
+    """Combine a list query with the filter selecting the documents after `cursor`."""
+    filters = dict(query or {})
+    if cursor:
+        after = decode_cursor(cursor)
+        filters = {'$and': [filters, after]} if '_id' in filters else {**filters, **after}
+    return filters
+
+def split_page(docs: List[Dict[str, Any]], limit: int,
+               projection: Dict[str, int]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim limit + 1 fetched documents to one page of the projected fields,
+    plus the cursor of the next page (None on the last page).
+    """
+    returned = {field for field, included in projection.items() if included}
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    page = [{key: value for key, value in doc.items() if key in returned} for doc in docs[:limit]]
+    return page, next_cursor
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Filter selecting the documents after a cursor in PAGE_SORT order; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        object_id, = json.loads(raw)
+        if not isinstance(object_id, str):
+            raise TypeError(object_id)
+        object_id = ObjectId(object_id)
+    except (binascii.Error, ValueError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+    return {'_id': {'$lt': object_id}}
 
 class MongoDBClient:
     def __init__(self, uri: str, db_name: str, collection_name: str):
@@ -44,22 +230,20 @@ class MongoDBClient:
 
     def ensure_indexes(self):
         """Ensure required indexes exist."""
-        try:
-            # Create text index for search
-            self.db[self.collection_name].create_index([
-                ("title", "text"),
-                ("description", "text"),
-                ("sections.introduction.content", "text")
-            ])
-            logger.info("Ensured text search indexes exist")
-        except PyMongoError as e:
-            logger.error(f"Error creating indexes: {str(e)}")
+        collection = self.db[self.collection_name]
+        for keys, options in INDEXES:
+            try:
+                collection.create_index(keys, **options)
+            except PyMongoError as e:
+                logger.error(f"Error creating indexes: {str(e)}")
+        logger.info("Ensured search, export and url indexes exist")
 
+    @timed
     def _serialize_doc(self, doc: Dict[str, Any]) -> Dict[str, Any]:
         """Serialize MongoDB document to JSON-compatible format."""
         if doc is None:
             return None
-        return json.loads(MongoJSONEncoder().encode(doc))
+        return to_json_native(doc)
 
     def _validate_sample(self, sample_data: Dict[str, Any]) -> bool:
         """Validate sample data against expected schema."""
@@ -75,50 +259,180 @@ class MongoDBClient:
         Upsert a sample document into MongoDB.
         Uses URL as the unique identifier.
         """
-        try:
+        return self.bulk_upsert_samples([sample_data])[0]["ok"]
+
+    def _stored_hashes(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """Content fingerprints currently stored for the given URLs."""
+        cursor = self.db[self.collection_name].find(
+            {"url": {"$in": urls}}, {"_id": 0, "url": 1, "content_hash": 1}
+        )
+        return {doc["url"]: doc.get("content_hash") for doc in cursor}
+
+    def _upsert_operation(self, sample_data: Dict[str, Any], stored_hash: Optional[str],
+                          now: datetime) -> tuple:
+        """
+        Build the write for a sample and whether its content changed.
+        Unchanged content only touches last_checked, leaving the document,
+        its text index entries and last_updated alone.
+        """
+        query = {"url": sample_data["url"]}
+        content_hash = sample_data.get("content_hash")
+        if content_hash and content_hash == stored_hash:
+            return UpdateOne(query, {"$set": {"last_checked": now}}), False
+
+        sample_data["last_updated"] = now
+        sample_data["last_checked"] = now
+        return UpdateOne(query, {"$set": sample_data}, upsert=True), True
+
+    def bulk_upsert_samples(self, samples: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Upsert many samples with one unordered bulk_write.
+        Returns one result per input sample: {"url", "ok", "changed", "error"}.
+        """
+        results = []
+        valid = []
+        for sample_data in samples:
+            result = {"url": sample_data.get("url"), "ok": False, "changed": False, "error": None}
+            results.append(result)
             if not self._validate_sample(sample_data):
-                return False
+                result["error"] = "invalid sample"
+                continue
+            valid.append((sample_data, result))
 
-            collection = self.db[self.collection_name]
-            
-            # Create query for upsert (using URL as unique identifier)
-            query = {"url": sample_data["url"]}
-            
-            # Add metadata
-            sample_data["last_updated"] = datetime.utcnow()
-            
-            # Perform upsert
-            result = collection.update_one(
-                query,
-                {"$set": sample_data},
-                upsert=True
+        if not valid:
+            return self._count_results(results)
+
+        try:
+            stored_hashes = self._stored_hashes([sample_data["url"] for sample_data, _ in valid])
+        except PyMongoError as e:
+            logger.error(f"MongoDB fingerprint lookup error: {str(e)}")
+            stored_hashes = {}
+
+        now = datetime.utcnow()
+        operations = []
+        for sample_data, result in valid:
+            operation, changed = self._upsert_operation(
+                sample_data, stored_hashes.get(sample_data["url"]), now
             )
-            
+            operations.append(operation)
+            result["ok"] = True
+            result["changed"] = changed
+
+        try:
+            with DB_WRITE_SECONDS.time():
+                bulk_result = self.db[self.collection_name].bulk_write(operations, ordered=False)
             logger.info(
-                f"Upserted document: matched={result.matched_count}, "
-                f"modified={result.modified_count}, "
-                f"upserted_id={result.upserted_id}"
+                f"Bulk upserted {len(operations)} documents: matched={bulk_result.matched_count}, "
+                f"modified={bulk_result.modified_count}, upserted={bulk_result.upserted_count}"
+            )
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed = valid[error["index"]][1]
+                failed["ok"] = False
+                failed["error"] = error.get("errmsg")
+            logger.error(f"MongoDB bulk upsert had {len(e.details.get('writeErrors', []))} failures")
+        except PyMongoError as e:
+            for _, result in valid:
+                result["ok"] = False
+                result["error"] = str(e)
+            logger.error(f"MongoDB bulk upsert error: {str(e)}")
+
+        if any(result["ok"] and result["changed"] for result in results):
+            self._bump_version()
+        return self._count_results(results)
+
+    def _bump_version(self):
+        """Advance the collection's data version so readers drop cached results."""
+        try:
+            self.db[VERSIONS_COLLECTION].update_one(
+                {"_id": self.collection_name}, version_bump(datetime.utcnow()), upsert=True
             )
-            return True
-            
         except PyMongoError as e:
-            logger.error(f"MongoDB upsert error: {str(e)}")
-            return False
+            logger.error(f"Error bumping data version: {str(e)}")
 
-    def get_samples(self, query: Dict = None, limit: int = 100, skip: int = 0) -> List[Dict[str, Any]]:
+    def data_version(self) -> int:
+        """Counter bumped whenever sample content changes; 0 before the first write."""
+        doc = self.db[VERSIONS_COLLECTION].find_one({"_id": self.collection_name}, {"version": 1})
+        return doc["version"] if doc else 0
+
+    def _count_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Count per-document write outcomes in the metrics registry."""
+        for result in results:
+            if not result["ok"]:
+                outcome = "invalid" if result["error"] == "invalid sample" else "failed"
+            else:
+                outcome = "changed" if result["changed"] else "unchanged"
+            DB_WRITE_DOCUMENTS.inc(result=outcome)
+        return results
+
+    def buffered_writer(self, batch_size: int = 100, flush_interval: float = 5.0) -> "BulkWriteBuffer":
+        """Return a write buffer flushing bulk upserts by size or age."""
+        return BulkWriteBuffer(self, batch_size=batch_size, flush_interval=flush_interval)
+
+    @timed
+    def get_samples(self, query: Dict = None, limit: int = 100, skip: int = 0,
+                    fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         Retrieve samples from MongoDB with pagination.
-        Returns list of samples.
+        Returns only `fields` of each sample (SUMMARY_FIELDS by default),
+        so list queries never transfer the section bodies. Results come in
+        PAGE_SORT order; prefer get_samples_page for paging deep.
         """
+        projection = list_projection(fields)
         try:
             collection = self.db[self.collection_name]
-            cursor = collection.find(query or {}, {'_id': 0}).skip(skip).limit(limit)
+            cursor = collection.find(query or {}, projection).sort(PAGE_SORT).skip(skip).limit(limit)
             samples = list(cursor)
             return [self._serialize_doc(sample) for sample in samples]
         except PyMongoError as e:
             logger.error(f"MongoDB query error: {str(e)}")
             return []
 
+    @timed
+    def get_samples_page(self, query: Dict = None, limit: int = 100, cursor: Optional[str] = None,
+                         fields: Optional[Iterable[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of samples in PAGE_SORT order, starting after `cursor`.
+        Each page seeks through the _id index, so deep pages cost the same
+        as the first. Updates don't move samples between pages; samples first
+        stored after paging began sort before the first page and are skipped.
+        Returns the samples and the cursor of the next page, or None on the
+        last page. Raises ValueError for a malformed cursor.
+        """
+        projection = list_projection(fields)
+        limit = max(1, limit)
+        filters = page_filters(query, cursor)
+        try:
+            collection = self.db[self.collection_name]
+            # The sort key is always fetched to build the next cursor
+            docs = list(
+                collection.find(filters, dict(projection, _id=1))
+                .sort(PAGE_SORT)
+                .limit(limit + 1)
+            )
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return [], None
+
+        page, next_cursor = split_page(docs, limit, projection)
+        return [self._serialize_doc(doc) for doc in page], next_cursor
+
+    def get_sample_by_id(self, sample_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a full sample document by its ObjectId string.
+        Returns None if the id is malformed or not found.
+        """
+        try:
+            object_id = ObjectId(sample_id)
+        except (InvalidId, TypeError):
+            return None
+        try:
+            collection = self.db[self.collection_name]
+            return self._serialize_doc(collection.find_one({"_id": object_id}))
+        except PyMongoError as e:
+            logger.error(f"MongoDB query error: {str(e)}")
+            return None
+
     def get_sample_by_url(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a specific sample by URL.
@@ -132,21 +446,35 @@ class MongoDBClient:
             logger.error(f"MongoDB query error: {str(e)}")
             return None
 
+    @timed
+    def refresh_stats(self) -> Dict[str, Any]:
+        """Recompute the statistics document in one aggregation pass and store it."""
+        try:
+            now = datetime.utcnow()
+            facets = next(self.db[self.collection_name].aggregate(stats_pipeline(now)))
+            stats = stats_document(facets, now)
+            previous = self.db[STATS_COLLECTION].find_one_and_replace(
+                {"_id": self.collection_name}, stats, upsert=True
+            )
+            if stats_changed(previous, stats):
+                # Cached API responses embed these figures; drop them with the new ones
+                self._bump_version()
+            return self._serialize_doc({name: value for name, value in stats.items() if name != "_id"})
+        except PyMongoError as e:
+            logger.error(f"Error refreshing stats: {str(e)}")
+            return {}
+
+    @timed
     def get_stats(self) -> Dict[str, Any]:
-        """Get statistics about the samples collection."""
+        """Get the precomputed collection statistics, computing them on first use."""
         try:
-            collection = self.db[self.collection_name]
-            stats = {
-                "total_samples": collection.count_documents({}),
-                "subjects": collection.distinct("subject"),
-                "latest_update": collection.find_one(
-                    sort=[("last_updated", -1)]
-                )["last_updated"].isoformat() if collection.find_one() else None
-            }
-            return stats
+            stats = self.db[STATS_COLLECTION].find_one({"_id": self.collection_name}, {"_id": 0})
         except PyMongoError as e:
             logger.error(f"Error getting stats: {str(e)}")
             return {}
+        if stats is None:
+            return self.refresh_stats()
+        return self._serialize_doc(stats)
 
     def get_samples_by_subject(self, subject: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get samples for a specific subject."""
@@ -164,4 +492,57 @@ class MongoDBClient:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
\ No newline at end of file
+        self.close()
+
+class BulkWriteBuffer:
+    def __init__(self, client: MongoDBClient, batch_size: int = 100, flush_interval: float = 5.0):
+        """Collect samples and write them with bulk_upsert_samples in batches."""
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, sample_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Buffer a sample, returning per-document results if this triggered a flush."""
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(sample_data)
+            full = len(self._buffer) >= self.batch_size
+        if full or self._is_due():
+            return self.flush()
+        return []
+
+    def _is_due(self) -> bool:
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+
+    def flush_if_due(self) -> List[Dict[str, Any]]:
+        """Flush when the oldest buffered sample has waited flush_interval seconds."""
+        return self.flush() if self._is_due() else []
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Write everything buffered and return per-document results."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._oldest = None
+        if not batch:
+            return []
+        try:
+            return self.client.bulk_upsert_samples(batch)
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} buffered samples: {str(e)}")
+            return [
+                {"url": sample.get("url"), "ok": False, "changed": False, "error": str(e)}
+                for sample in batch
+            ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
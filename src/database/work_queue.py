@@ -0,0 +1,229 @@
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+import logging
+import os
+import socket
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def default_worker_id() -> str:
+    """Identify a worker by host and process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class MongoWorkQueue:
+    def __init__(self, db: Database, worker_id: Optional[str] = None, lease_seconds: float = 60,
+                 max_attempts: int = 3, requeue_after: float = 3600,
+                 collection_name: str = 'crawl_queue', workers_collection_name: str = 'crawl_workers'):
+        """
+        Crawl frontier shared by several workers through a MongoDB collection.
+        Workers claim URLs with an atomic find_one_and_update that sets a lease;
+        a heartbeat thread keeps leases alive, and leases that expire (a worker
+        died) are claimed again by anyone. Finished URLs are only requeued once
+        they are older than `requeue_after` seconds, so workers with their own
+        revisit schedules don't refetch a page another worker just crawled.
+        Implements the CrawlFrontier interface used by CrawlPipeline.
+        """
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.requeue_after = requeue_after
+        self.queue = db[collection_name]
+        self.workers = db[workers_collection_name]
+        self.processed = 0
+        self.failed = 0
+        self._started_at = datetime.utcnow()
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self.ensure_indexes()
+
+    def ensure_indexes(self):
+        """Ensure the indexes used for claiming and lease renewal exist."""
+        try:
+            self.queue.create_index([
+                ("state", ASCENDING), ("priority", ASCENDING),
+                ("depth", ASCENDING), ("enqueued_at", ASCENDING)
+            ])
+            self.queue.create_index([("lease_owner", ASCENDING), ("state", ASCENDING)])
+        except PyMongoError as e:
+            logger.error(f"Error creating work queue indexes: {str(e)}")
+
+    def push(self, urls: Iterable[str], depth: int = 0, requeue: bool = False,
+             priority: int = 0) -> List[str]:
+        """Queue unseen URLs; with `requeue`, finished URLs past requeue_after are queued again."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+        now = datetime.utcnow()
+        added = []
+        try:
+            if requeue:
+                stale = [doc["_id"] for doc in self.queue.find({
+                    "_id": {"$in": urls},
+                    "state": {"$in": [DONE, FAILED]},
+                    "updated_at": {"$lt": now - timedelta(seconds=self.requeue_after)}
+                }, {"_id": 1})]
+                if stale:
+                    self.queue.update_many(
+                        {"_id": {"$in": stale}, "state": {"$in": [DONE, FAILED]}},
+                        {"$set": {"state": QUEUED, "priority": priority, "depth": depth,
+                                  "attempts": 0, "enqueued_at": now, "updated_at": now}}
+                    )
+                    added.extend(stale)
+
+            result = self.queue.bulk_write([
+                UpdateOne(
+                    {"_id": url},
+                    {"$setOnInsert": {"state": QUEUED, "priority": priority, "depth": depth,
+                                      "attempts": 0, "enqueued_at": now, "updated_at": now}},
+                    upsert=True
+                )
+                for url in urls
+            ], ordered=False)
+            added.extend(urls[index] for index in result.upserted_ids)
+        except PyMongoError as e:
+            logger.error(f"Error queueing URLs: {str(e)}")
+        return added
+
+    def claim(self, limit: int = 1) -> List[Tuple[str, int]]:
+        """Lease up to `limit` queued or expired URLs to this worker."""
+        claimed = []
+        try:
+            while len(claimed) < limit:
+                now = datetime.utcnow()
+                doc = self.queue.find_one_and_update(
+                    {"$or": [
+                        {"state": QUEUED},
+                        {"state": IN_FLIGHT, "lease_expires": {"$lt": now},
+                         "attempts": {"$lt": self.max_attempts}}
+                    ]},
+                    {"$set": {"state": IN_FLIGHT, "lease_owner": self.worker_id,
+                              "lease_expires": now + timedelta(seconds=self.lease_seconds),
+                              "updated_at": now},
+                     "$inc": {"attempts": 1}},
+                    sort=[("priority", ASCENDING), ("depth", ASCENDING), ("enqueued_at", ASCENDING)],
+                    projection={"_id": 1, "depth": 1},
+                    return_document=ReturnDocument.AFTER
+                )
+                if doc is None:
+                    break
+                claimed.append((doc["_id"], doc.get("depth", 0)))
+        except PyMongoError as e:
+            logger.error(f"Error claiming URLs: {str(e)}")
+        return claimed
+
+    def mark_done(self, url: str):
+        """Finish a URL this worker still leases; a lost lease leaves it to the new owner."""
+        try:
+            result = self.queue.update_one(
+                {"_id": url, "lease_owner": self.worker_id},
+                {"$set": {"state": DONE, "updated_at": datetime.utcnow()},
+                 "$unset": {"lease_owner": "", "lease_expires": "", "last_error": ""}}
+            )
+            if result.matched_count == 0:
+                logger.warning(f"Lease on {url} was lost before it finished; not counting it")
+                return
+            self.processed += 1
+        except PyMongoError as e:
+            logger.error(f"Error completing {url}: {str(e)}")
+
+    def mark_failed(self, url: str, error: Optional[str] = None):
+        """Release a failed URL for another attempt, or fail it after max_attempts."""
+        try:
+            doc = self.queue.find_one({"_id": url, "lease_owner": self.worker_id}, {"attempts": 1})
+            state = QUEUED if doc and doc.get("attempts", 0) < self.max_attempts else FAILED
+            result = self.queue.update_one(
+                {"_id": url, "lease_owner": self.worker_id},
+                {"$set": {"state": state, "last_error": error, "updated_at": datetime.utcnow()},
+                 "$unset": {"lease_owner": "", "lease_expires": ""}}
+            ) if doc else None
+            if result is None or result.matched_count == 0:
+                logger.warning(f"Lease on {url} was lost before it failed; not counting it")
+                return
+            self.failed += 1
+        except PyMongoError as e:
+            logger.error(f"Error failing {url}: {str(e)}")
+
+    def reclaim_expired(self) -> int:
+        """Fail expired leases that ran out of attempts; the rest are claimable again."""
+        try:
+            result = self.queue.update_many(
+                {"state": IN_FLIGHT, "lease_expires": {"$lt": datetime.utcnow()},
+                 "attempts": {"$gte": self.max_attempts}},
+                {"$set": {"state": FAILED, "last_error": "lease expired"},
+                 "$unset": {"lease_owner": "", "lease_expires": ""}}
+            )
+            return result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Error reclaiming expired leases: {str(e)}")
+            return 0
+
+    def heartbeat(self):
+        """Extend this worker's leases and publish its throughput."""
+        now = datetime.utcnow()
+        try:
+            self.queue.update_many(
+                {"lease_owner": self.worker_id, "state": IN_FLIGHT},
+                {"$set": {"lease_expires": now + timedelta(seconds=self.lease_seconds)}}
+            )
+            uptime = max((now - self._started_at).total_seconds(), 1.0)
+            self.workers.update_one(
+                {"_id": self.worker_id},
+                {"$set": {"last_heartbeat": now, "started_at": self._started_at,
+                          "processed": self.processed, "failed": self.failed,
+                          "pages_per_minute": self.processed * 60 / uptime}},
+                upsert=True
+            )
+        except PyMongoError as e:
+            logger.error(f"Work queue heartbeat error: {str(e)}")
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            self.heartbeat()
+            self.reclaim_expired()
+
+    def start_heartbeat(self):
+        """Renew leases in a background thread every third of the lease time."""
+        if self._heartbeat_thread is None:
+            self.heartbeat()
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+            self._heartbeat_thread.start()
+
+    def checkpoint(self):
+        """Queue state is written through; just publish a heartbeat."""
+        self.heartbeat()
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        try:
+            for row in self.queue.aggregate([{"$group": {"_id": "$state", "count": {"$sum": 1}}}]):
+                counts[row["_id"]] = row["count"]
+        except PyMongoError as e:
+            logger.error(f"Error getting work queue stats: {str(e)}")
+        return counts
+
+    def worker_stats(self) -> List[Dict[str, Any]]:
+        """Throughput reported by every worker's last heartbeat."""
+        try:
+            return list(self.workers.find({}, sort=[("_id", ASCENDING)]))
+        except PyMongoError as e:
+            logger.error(f"Error getting worker stats: {str(e)}")
+            return []
+
+    def close(self):
+        """Stop the heartbeat thread after a final heartbeat."""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+        self.heartbeat()
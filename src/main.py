@@ -1,8 +1,28 @@
-from scraper.nailib_scraper import NailibScraper
-from database.mongo_client import MongoDBClient
+import asyncio
 import time
 import logging
 import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from src.scraper.archive import PageArchive, PageArchiveWriter
+from src.scraper.async_scraper import AsyncNailibScraper
+from src.scraper.frontier import CrawlFrontier
+from src.scraper.http_cache import ResponseCache
+from src.scraper.parse_pool import ParsePool
+from src.scraper.pipeline import CrawlPipeline
+from src.scraper.scheduler import RecrawlScheduler
+from src.scraper.rate_limiter import AdaptiveRateLimiter
+from src.database.mongo_client import MongoDBClient
+from src.database.work_queue import MongoWorkQueue
+from src.monitoring.metrics import start_http_exporter
+from src.monitoring.profiling import PROFILER
+from src.config import settings
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,76 +43,209 @@ SEED_URLS = [
     "https://nailib.com/ia-sample/ib-math-ai-sl/64b79eeb579bc83f7df3dd6b"
 ]
 
-def discover_and_scrape():
+async def crawl(scraper: AsyncNailibScraper, db_client: MongoDBClient, seed_urls: List[str],
+                frontier=None, schedule: Optional[RecrawlScheduler] = None,
+                max_pages: int = settings.CRAWL_MAX_PAGES) -> Dict[str, int]:
+    """Stream the seed samples and newly discovered links through fetch, parse and storage."""
+    writer = db_client.buffered_writer(
+        batch_size=settings.DB_BATCH_SIZE,
+        flush_interval=settings.DB_FLUSH_INTERVAL
+    )
+    pipeline = CrawlPipeline(
+        scraper,
+        writer,
+        max_pages=max_pages,
+        queue_size=settings.CRAWL_QUEUE_SIZE,
+        schedule=schedule,
+        frontier=frontier
+    )
+    try:
+        return await pipeline.run(seed_urls)
+    finally:
+        writer.flush()
+        await scraper.close()
+
+def discover_and_scrape(schedule: RecrawlScheduler, frontier,
+                        parse_pool: Optional[ParsePool] = None):
     """Discover similar samples and scrape their content."""
+    cache = None
+    capture = None
     try:
         # Initialize scraper and database client
-        scraper = NailibScraper()
+        if settings.HTTP_CACHE_PATH:
+            cache = ResponseCache(
+                settings.HTTP_CACHE_PATH,
+                max_bytes=settings.HTTP_CACHE_MAX_MB * 1024 * 1024
+            )
+        if settings.CAPTURE_PATH:
+            capture = PageArchiveWriter(settings.CAPTURE_PATH)
+        scraper = AsyncNailibScraper(
+            cache=cache,
+            capture=capture,
+            parse_pool=parse_pool,
+            parser_backend=settings.PARSER_BACKEND,
+            profiles_path=settings.EXTRACTION_PROFILES_PATH,
+            concurrency=settings.SCRAPER_CONCURRENCY,
+            rate_limiter=AdaptiveRateLimiter(
+                rate=settings.SCRAPER_HOST_RATE,
+                burst=settings.SCRAPER_HOST_BURST,
+                min_rate=settings.SCRAPER_MIN_HOST_RATE,
+                max_rate=settings.SCRAPER_MAX_HOST_RATE,
+                latency_target=settings.SCRAPER_LATENCY_TARGET
+            )
+        )
         db_client = MongoDBClient(
             uri=os.getenv('MONGODB_URI'),
-            db_name=os.getenv('DB_NAME', 'nailib_samples')
+            db_name=os.getenv('DB_NAME', 'nailib_samples'),
+            collection_name=os.getenv('COLLECTION_NAME', 'samples')
         )
         
-        collection_name = os.getenv('COLLECTION_NAME', 'samples')
-        successful_scrapes = 0
-        all_urls = set()
-        
-        # Discover samples from each seed URL
-        for seed_url in SEED_URLS:
-            logger.info(f"Discovering samples from seed URL: {seed_url}")
-            discovered_urls = scraper.discover_samples(seed_url, max_samples=5)
-            all_urls.update(discovered_urls)
-        
-        logger.info(f"Discovered {len(all_urls)} unique sample URLs")
-        
-        # Process each discovered URL
-        for url in all_urls:
-            try:
-                # Scrape the sample
-                logger.info(f"Scraping sample from: {url}")
-                sample_data = scraper.scrape_sample(url)
-                
-                if sample_data and scraper.validate_sample_data(sample_data):
-                    # Store in MongoDB
-                    success = db_client.upsert_sample(collection_name, sample_data)
-                    
-                    if success:
-                        successful_scrapes += 1
-                        logger.info(f"Successfully stored sample data from {url}")
-                    else:
-                        logger.error(f"Failed to store sample data from {url}")
-                else:
-                    logger.error(f"Invalid or missing sample data from {url}")
-                
-                # Add a small delay between URLs
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"Error processing URL {url}: {str(e)}")
-                continue
+        # Fetch, parse and store each page once as it streams through
+        round_stats = asyncio.run(crawl(
+            scraper, db_client, schedule.due(limit=settings.CRAWL_MAX_PAGES),
+            frontier=frontier, schedule=schedule
+        ))
         
-        # Log final statistics
-        stats = db_client.get_stats(collection_name)
-        logger.info(f"Scraping round completed. Successfully processed {successful_scrapes}/{len(all_urls)} samples")
+        # Recompute the collection statistics the API serves, once per round
+        stats = db_client.refresh_stats()
+        logger.info(
+            f"Scraping round completed. Successfully processed "
+            f"{round_stats['stored']}/{round_stats['fetched']} samples"
+        )
+        logger.info(
+            f"Content changes: {round_stats['changed']} changed, "
+            f"{round_stats['unchanged']} unchanged"
+        )
+        logger.info(f"Round stats: {round_stats}")
+        logger.info(f"Recrawl schedule: {schedule.stats()}")
+        logger.info(f"Frontier: {frontier.stats()}")
         logger.info(f"Collection stats: {stats}")
+        logger.info(f"Rate control: {scraper.rate_limiter.metrics()}")
+        if cache:
+            logger.info(f"HTTP cache: {cache.stats()}")
             
     except Exception as e:
         logger.error(f"Error in discover_and_scrape: {str(e)}")
     finally:
         if 'db_client' in locals():
             db_client.close()
+        if cache:
+            cache.close()
+        if capture:
+            capture.close()
+
+def replay_archive(path: str, parse_pool: Optional[ParsePool] = None):
+    """Re-extract and store every page of a capture archive, without network access."""
+    db_client = None
+    try:
+        archive = PageArchive(path)
+        scraper = AsyncNailibScraper(
+            replay=archive,
+            parse_pool=parse_pool,
+            parser_backend=settings.PARSER_BACKEND,
+            profiles_path=settings.EXTRACTION_PROFILES_PATH,
+            concurrency=settings.SCRAPER_CONCURRENCY
+        )
+        db_client = MongoDBClient(
+            uri=os.getenv('MONGODB_URI'),
+            db_name=os.getenv('DB_NAME', 'nailib_samples'),
+            collection_name=os.getenv('COLLECTION_NAME', 'samples')
+        )
+        
+        start = time.monotonic()
+        replay_stats = asyncio.run(crawl(scraper, db_client, archive.urls(), max_pages=len(archive)))
+        elapsed = time.monotonic() - start
+        logger.info(
+            f"Replayed {replay_stats['parsed']} pages from {path} in {elapsed:.1f}s "
+            f"({replay_stats['parsed'] / max(elapsed, 1e-9):.1f} pages/sec)"
+        )
+        logger.info(f"Replay stats: {replay_stats}")
+        logger.info(f"Collection stats: {db_client.refresh_stats()}")
+        
+    except Exception as e:
+        logger.error(f"Error replaying archive {path}: {str(e)}")
+    finally:
+        if db_client:
+            db_client.close()
 
 def main():
     """Main function to run the scraper continuously."""
     logger.info("Starting Nailib Sample Scraper")
     
+    # Optional Prometheus-style endpoint for crawler metrics
+    if settings.METRICS_PORT:
+        start_http_exporter(settings.METRICS_PORT)
+    
+    # Opt-in profiling of the next PROFILE_CALLS parsed pages, per process
+    PROFILER.configure(settings.PROFILE_DIR, settings.PROFILE_SAMPLE_INTERVAL)
+    if settings.PROFILE_MODE:
+        PROFILER.arm(settings.PROFILE_CALLS, settings.PROFILE_MODE)
+    
+    # Parse workers are reused across rounds
+    parse_pool = ParsePool(
+        workers=settings.PARSE_WORKERS,
+        batch_size=settings.PARSE_BATCH_SIZE,
+        scraper_kwargs={
+            "parser_backend": settings.PARSER_BACKEND,
+            "profiles_path": settings.EXTRACTION_PROFILES_PATH
+        }
+    )
+    
+    # Replay mode re-extracts an archived corpus once instead of crawling
+    if settings.REPLAY_PATH:
+        replay_archive(settings.REPLAY_PATH, parse_pool)
+        parse_pool.close()
+        PROFILER.stop()
+        return
+    
+    # Revisit schedule persists across rounds and restarts
+    schedule = RecrawlScheduler(
+        settings.SCHEDULE_PATH,
+        initial_interval=settings.RECRAWL_INITIAL_INTERVAL,
+        min_interval=settings.RECRAWL_MIN_INTERVAL,
+        max_interval=settings.RECRAWL_MAX_INTERVAL
+    )
+    schedule.add(SEED_URLS)
+    
+    queue_client = None
+    if settings.CRAWL_MODE == 'distributed':
+        # Shared MongoDB work queue so several workers split the crawl
+        queue_client = MongoDBClient(
+            uri=os.getenv('MONGODB_URI'),
+            db_name=os.getenv('DB_NAME', 'nailib_samples'),
+            collection_name=os.getenv('COLLECTION_NAME', 'samples')
+        )
+        frontier = MongoWorkQueue(
+            queue_client.db,
+            lease_seconds=settings.WORK_QUEUE_LEASE_SECONDS,
+            max_attempts=settings.FRONTIER_MAX_ATTEMPTS,
+            requeue_after=settings.RECRAWL_MIN_INTERVAL
+        )
+        frontier.start_heartbeat()
+        logger.info(f"Running as distributed worker {frontier.worker_id}")
+    else:
+        # Durable frontier so an interrupted crawl resumes where it stopped
+        frontier = CrawlFrontier(
+            settings.FRONTIER_PATH,
+            max_attempts=settings.FRONTIER_MAX_ATTEMPTS,
+            checkpoint_interval=settings.FRONTIER_CHECKPOINT_INTERVAL
+        )
+    
     while True:
         try:
-            # Run discovery and scraping task
-            discover_and_scrape()
+            # Run discovery and scraping for due URLs and leftover frontier work
+            if schedule.due(limit=1) or frontier.stats()["queued"]:
+                discover_and_scrape(schedule, frontier, parse_pool)
+                if queue_client:
+                    for worker in frontier.worker_stats():
+                        logger.info(
+                            f"Worker {worker['_id']}: processed={worker.get('processed')} "
+                            f"pages/min={worker.get('pages_per_minute', 0):.1f}"
+                        )
             
-            # Small delay between rounds
-            time.sleep(5)  # 5 second delay between rounds
+            # Sleep until the next URL is due, within the round delay bounds
+            wait = schedule.seconds_until_due()
+            time.sleep(min(max(wait or 0, settings.ROUND_MIN_DELAY), settings.ROUND_MAX_DELAY))
             
         except KeyboardInterrupt:
             logger.info("Scraper stopped by user")
@@ -101,6 +254,13 @@ def main():
             logger.error(f"Error in main loop: {str(e)}")
             # Brief delay before retrying on error
             time.sleep(1)
+    
+    parse_pool.close()
+    schedule.close()
+    frontier.close()
+    PROFILER.stop()
+    if queue_client:
+        queue_client.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1 @@
+# Initialize monitoring package
\ No newline at end of file
@@ -0,0 +1,281 @@
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Profilers a session can use: deterministic cProfile or low-overhead stack sampling
+PROFILE_MODES = ('cprofile', 'sampling')
+
+# Upper bound on calls profiled per session, so a typo cannot leave profiling on
+MAX_PROFILE_CALLS = 10000
+
+FUNCTION_SECONDS = REGISTRY.histogram('function_seconds', 'Duration of @timed functions', ['function'])
+
+
+def timed(func: Callable) -> Callable:
+    """Always-on decorator observing each call's duration in function_seconds."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                FUNCTION_SECONDS.observe(time.perf_counter() - start, function=name)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            FUNCTION_SECONDS.observe(time.perf_counter() - start, function=name)
+    return wrapper
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.005):
+        """
+        Sample the stacks of registered threads every `interval` seconds from
+        a daemon thread. Counts are kept per collapsed stack (root first,
+        frames joined by ';'), the input format of flame graph tools.
+        """
+        self.interval = interval
+        self.stacks: StackCounter = StackCounter()
+        self.samples = 0
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def watch(self, thread_id: int):
+        with self._lock:
+            self._threads[thread_id] = self._threads.get(thread_id, 0) + 1
+
+    def unwatch(self, thread_id: int):
+        with self._lock:
+            remaining = self._threads.get(thread_id, 0) - 1
+            if remaining > 0:
+                self._threads[thread_id] = remaining
+            else:
+                self._threads.pop(thread_id, None)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                watched = list(self._threads)
+            if not watched:
+                continue
+            frames = sys._current_frames()
+            for thread_id in watched:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[';'.join(reversed(stack))] += 1
+                    self.samples += 1
+
+    def dump(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CallProfiler:
+    def __init__(self, output_dir: str = 'data/profiles', sample_interval: float = 0.005):
+        """
+        Profile the next N hooked calls, then dump the aggregate and switch
+        off. Unarmed, `profile()` costs one attribute check. Only one call is
+        profiled at a time; calls overlapping it run unprofiled, so the hook
+        is safe to leave in production code paths.
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.reset()
+
+    def reset(self):
+        """Drop any session without dumping it, e.g. state inherited by a forked worker."""
+        self.mode: Optional[str] = None
+        self.remaining = 0
+        self.profiled: StackCounter = StackCounter()
+        self.dumps: List[str] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def configure(self, output_dir: Optional[str] = None, sample_interval: Optional[float] = None):
+        if output_dir:
+            self.output_dir = output_dir
+        if sample_interval:
+            self.sample_interval = sample_interval
+
+    def config(self) -> Dict[str, Any]:
+        """Settings and armed session, for re-creating this profiler in a worker process."""
+        with self._lock:
+            return {"output_dir": self.output_dir, "sample_interval": self.sample_interval,
+                    "mode": self.mode, "calls": self.remaining}
+
+    def apply(self, config: Dict[str, Any]):
+        """Start from a clean state with the settings and session of config()."""
+        self.reset()
+        self.configure(config["output_dir"], config["sample_interval"])
+        if config["calls"]:
+            self.arm(config["calls"], config["mode"])
+
+    @property
+    def armed(self) -> bool:
+        return self.remaining > 0
+
+    def arm(self, calls: int, mode: str = 'cprofile'):
+        """Profile the next `calls` hooked calls, replacing any running session."""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if not 0 < calls <= MAX_PROFILE_CALLS:
+            raise ValueError(f"calls must be between 1 and {MAX_PROFILE_CALLS}")
+        with self._lock:
+            self._finish()
+            self.mode = mode
+            self.remaining = calls
+            self.profiled = StackCounter()
+            self._started = time.time()
+            if mode == 'cprofile':
+                self._profile = cProfile.Profile()
+            else:
+                self._sampler = StackSampler(self.sample_interval).start()
+        logger.info(f"Profiling the next {calls} calls with {mode}")
+
+    def _claim(self) -> bool:
+        """Take one call slot and the profiler, or report that this call runs unprofiled."""
+        if not self._active.acquire(blocking=False):
+            return False
+        with self._lock:
+            if self.remaining <= 0:
+                self._active.release()
+                return False
+            self.remaining -= 1
+            return True
+
+    @contextmanager
+    def profile(self, label: str):
+        """Run the block under the armed profiler, if a call slot is left."""
+        if self.remaining <= 0 or not self._claim():
+            yield
+            return
+
+        profile, sampler = self._profile, self._sampler
+        thread_id = threading.get_ident()
+        try:
+            if profile:
+                profile.enable()
+            else:
+                sampler.watch(thread_id)
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            else:
+                sampler.unwatch(thread_id)
+            with self._lock:
+                self.profiled[label] += 1
+                if self.remaining <= 0:
+                    self._finish()
+            self._active.release()
+
+    def _finish(self) -> Optional[str]:
+        """Dump and reset the current session; callers hold self._lock."""
+        if self._profile is None and self._sampler is None:
+            return None
+        if not self.profiled:
+            if self._sampler is not None:
+                self._sampler.stop()
+            self._profile = None
+            self._sampler = None
+            self.remaining = 0
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        base = os.path.join(self.output_dir, f"{self.mode}-{stamp}-{os.getpid()}-{len(self.dumps) + 1}")
+        try:
+            if self._profile is not None:
+                path = base + '.pstats'
+                self._profile.dump_stats(path)
+            else:
+                self._sampler.stop()
+                path = base + '.collapsed'
+                self._sampler.dump(path)
+            self.dumps.append(path)
+            logger.info(f"Wrote {self.mode} profile of {sum(self.profiled.values())} calls to {path}")
+            return path
+        except OSError as e:
+            logger.error(f"Error writing profile: {str(e)}")
+            return None
+        finally:
+            self._profile = None
+            self._sampler = None
+            self.remaining = 0
+
+    def stop(self) -> Optional[str]:
+        """End the session early, dumping what was collected."""
+        with self._lock:
+            self.remaining = 0
+            if self._active.locked():
+                # The call being profiled dumps the session when it exits
+                return None
+            return self._finish()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "armed": self.remaining > 0,
+                "mode": self.mode,
+                "remaining": self.remaining,
+                "profiled": dict(self.profiled),
+                "started": datetime.utcfromtimestamp(self._started).isoformat() if self._started else None,
+                "dumps": [os.path.basename(path) for path in self.dumps]
+            }
+
+    def dump_path(self, name: str) -> Optional[str]:
+        """Full path of a dump written by this process, looked up by file name."""
+        if not re.fullmatch(r'[\w.-]+', name):
+            return None
+        for path in self.dumps:
+            if os.path.basename(path) == name and os.path.exists(path):
+                return path
+        return None
+
+
+# Process-wide profiler; hooks in the scraper and API share it
+PROFILER = CallProfiler()
@@ -0,0 +1,140 @@
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .url_dedup import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept with each captured page
+CAPTURED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+ARCHIVE_SUFFIXES = ('.jsonl.gz', '.jsonl')
+
+
+class PageArchiveWriter:
+    def __init__(self, path: str, compresslevel: int = 6):
+        """
+        Append fetched pages to a gzip-compressed JSON Lines archive.
+        `path` is either an archive file or a directory, in which case each
+        writer creates its own timestamped file inside it. Every record holds
+        the URL, status, a few response headers, the capture time and the body.
+        """
+        if os.path.isdir(path) or path.endswith(os.sep):
+            os.makedirs(path, exist_ok=True)
+            stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+            path = os.path.join(path, f"pages-{stamp}-{os.getpid()}.jsonl.gz")
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'ab', compresslevel=compresslevel)
+
+    def write(self, url: str, body: str, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        """Record one fetched page."""
+        headers = headers or {}
+        record = {
+            "url": url,
+            "status": status,
+            "headers": {name: headers[name] for name in CAPTURED_HEADERS if headers.get(name)},
+            "fetched_at": time.time(),
+            "body": body
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line.encode('utf-8'))
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def archive_files(path: str) -> List[Path]:
+    """Archive files at `path`: the file itself, or a directory's archives in name order."""
+    root = Path(path)
+    if root.is_dir():
+        return sorted(p for p in root.iterdir() if p.name.endswith(ARCHIVE_SUFFIXES))
+    return [root]
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream archive records in capture order, stopping at a truncated tail."""
+    for file_path in archive_files(path):
+        opener = gzip.open if file_path.name.endswith('.gz') else open
+        try:
+            with opener(file_path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (EOFError, OSError, zlib.error, json.JSONDecodeError) as e:
+            # An interrupted capture leaves a partial last record or gzip member
+            logger.warning(f"Stopped reading truncated archive {file_path}: {str(e)}")
+
+
+class PageArchive:
+    def __init__(self, path: str):
+        """
+        Read-only page store built from capture archives (a file or a directory).
+        The latest capture of each canonical URL wins. Pages are indexed in
+        memory on first lookup; use `iter_pages` to stream a large corpus.
+        """
+        self.path = path
+        self._pages: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _index(self) -> Dict[str, str]:
+        with self._lock:
+            if self._pages is None:
+                pages = {}
+                for record in iter_records(self.path):
+                    if 200 <= record.get("status", 200) < 300:
+                        pages[canonicalize_url(record["url"])] = record["body"]
+                self._pages = pages
+                logger.info(f"Loaded {len(pages)} pages from archive {self.path}")
+        return self._pages
+
+    def get(self, url: str) -> Optional[str]:
+        """Archived body for a URL, or None when it was never captured."""
+        body = self._index().get(canonicalize_url(url))
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self._index()
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def urls(self) -> List[str]:
+        return list(self._index())
+
+    def iter_pages(self) -> Iterator[Tuple[str, str]]:
+        """Stream (url, body) for every successful capture without indexing."""
+        for record in iter_records(self.path):
+            if 200 <= record.get("status", 200) < 300:
+                yield record["url"], record["body"]
+
+    def stats(self) -> Dict[str, int]:
+        return {"pages": len(self), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Iterable
+
+import aiohttp
+
+from ..monitoring.profiling import PROFILER, timed
+from .archive import PageArchive, PageArchiveWriter
+from .http_cache import ResponseCache
+from .nailib_scraper import (
+    FETCH_BYTES, FETCH_CACHE, FETCH_IN_FLIGHT, FETCH_RESPONSES, FETCH_SECONDS, NailibScraper
+)
+from .parse_pool import ParsePool
+from .rate_limiter import HostRateLimiter, THROTTLE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetcher:
+    def __init__(self, headers: Dict[str, str], rate_limiter: HostRateLimiter,
+                 concurrency: int = 10, timeout: float = 10, max_retries: int = 3,
+                 cache: Optional[ResponseCache] = None,
+                 capture: Optional[PageArchiveWriter] = None,
+                 replay: Optional[PageArchive] = None):
+        """
+        Initialize a pooled aiohttp fetcher with a global concurrency limit.
+        With `replay`, pages come from the archive with no network or rate
+        limiting; with `capture`, fetched pages are recorded to an archive.
+        """
+        self.headers = headers
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.capture = capture
+        self.replay = replay
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=self.timeout
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _get(self, session: aiohttp.ClientSession, url: str,
+                   headers: Optional[Dict[str, str]]):
+        """Send one GET, returning the response with its raw and decoded body."""
+        with FETCH_IN_FLIGHT.track_inprogress():
+            async with session.get(url, headers=headers) as response:
+                raw = await response.read()
+                return response, raw, await response.text()
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """Fetch one URL, returning the body or None on error."""
+        if self.replay:
+            html_content = self.replay.get(url)
+            if html_content is None:
+                logger.info(f"URL not in replay archive: {url}")
+            return html_content
+        
+        session = await self._get_session()
+        cached = self.cache.lookup(url) if self.cache else None
+        headers = cached.validators() if cached else None
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async(url)
+            async with self._semaphore:
+                start = time.monotonic()
+                try:
+                    response, raw, body = await self._get(session, url, headers)
+                    elapsed = time.monotonic() - start
+                    FETCH_SECONDS.observe(elapsed)
+                    FETCH_RESPONSES.inc(status=response.status)
+                    FETCH_BYTES.inc(len(raw))
+                    self.rate_limiter.record_response(
+                        url, response.status, elapsed,
+                        response.headers.get('Retry-After')
+                    )
+                    if response.status in THROTTLE_STATUSES and attempt < self.max_retries:
+                        logger.warning(f"Throttled with {response.status} on {url}, retrying")
+                        continue
+                    if response.status == 304 and cached:
+                        FETCH_CACHE.inc(result='hit')
+                        self.cache.record_hit(url)
+                        if self.capture:
+                            self.capture.write(url, cached.body, 200, response.headers)
+                        return cached.body
+                    response.raise_for_status()
+                    if self.capture:
+                        self.capture.write(url, body, response.status, response.headers)
+                    if self.cache:
+                        FETCH_CACHE.inc(result='miss')
+                        self.cache.store(
+                            url, body,
+                            response.headers.get('ETag'), response.headers.get('Last-Modified')
+                        )
+                    return body
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if not isinstance(e, aiohttp.ClientResponseError):
+                        FETCH_RESPONSES.inc(status='error')
+                        self.rate_limiter.record_response(url, None, time.monotonic() - start)
+                    logger.error(f"Error fetching {url}: {str(e)}")
+                    return None
+        return None
+
+    async def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetch URLs concurrently, returning a mapping of URL to body."""
+        urls = list(dict.fromkeys(urls))
+        bodies = await asyncio.gather(*(self.fetch(url) for url in urls))
+        return dict(zip(urls, bodies))
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class AsyncNailibScraper(NailibScraper):
+    def __init__(self, concurrency: int = 10, parse_pool: Optional[ParsePool] = None, **kwargs):
+        """Initialize a scraper that fetches pages concurrently."""
+        super().__init__(**kwargs)
+        self.parse_pool = parse_pool
+        self.fetcher = AsyncFetcher(
+            self.headers, self.rate_limiter,
+            concurrency=concurrency, max_retries=self.max_retries, cache=self.cache,
+            capture=self.capture, replay=self.replay
+        )
+
+    async def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetch URLs not processed yet, skipping already visited ones."""
+        pending = []
+        for url in urls:
+            if url in self.visited_urls:
+                logger.info(f"URL already processed: {url}")
+            else:
+                pending.append(url)
+
+        results = await self.fetcher.fetch_many(pending)
+        for url, html_content in results.items():
+            if html_content:
+                self.visited_urls.add(url)
+        return results
+
+    @timed
+    async def discover_samples(self, start_url: str, max_samples: int = 10) -> List[str]:
+        """
+        Discover sample URLs breadth-first, fetching each level concurrently.
+        Discovered pages are not marked visited, so scrape_samples can fetch them.
+        """
+        discovered_urls = set()
+        to_visit = [start_url]
+
+        try:
+            while to_visit and len(discovered_urls) < max_samples:
+                batch = [url for url in dict.fromkeys(to_visit) if url not in discovered_urls]
+                batch = batch[:max_samples - len(discovered_urls)]
+                to_visit = []
+
+                results = await self.fetcher.fetch_many(batch)
+                for url in batch:
+                    html_content = results.get(url)
+                    if not html_content:
+                        continue
+
+                    discovered_urls.add(url)
+                    to_visit.extend(
+                        link for link in self.parse_links(html_content, url)
+                        if link not in discovered_urls
+                    )
+
+                logger.info(f"Discovered {len(discovered_urls)}/{max_samples} samples")
+
+            return list(discovered_urls)
+
+        except Exception as e:
+            logger.error(f"Error discovering samples: {str(e)}")
+            return list(discovered_urls)
+
+    async def scrape_sample(self, url: str) -> Optional[Dict[str, Any]]:
+        """Scrape a single sample."""
+        with PROFILER.profile("scrape_sample"):
+            results = await self.scrape_samples([url])
+        return results[0]
+
+    @timed
+    async def scrape_samples(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Scrape several samples concurrently, preserving input order."""
+        results = await self.fetch_many(urls)
+        pages = [(url, results[url]) for url in urls if results.get(url)]
+        if self.parse_pool:
+            parsed = await self.parse_pool.parse_many_async(pages)
+        else:
+            parsed = [self.parse_sample(html_content, url) for url, html_content in pages]
+        by_url = {url: sample for (url, _), sample in zip(pages, parsed)}
+        return [by_url.get(url) for url in urls]
+
+    async def close(self):
+        """Close the fetcher's connection pool."""
+        await self.fetcher.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,190 @@
+import heapq
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class MemoryFrontier:
+    def __init__(self, max_attempts: int = 1):
+        """In-process frontier handing out URLs breadth-first (lowest depth first)."""
+        self.max_attempts = max_attempts
+        self._heap: List[Tuple[int, int, str]] = []
+        self._state: Dict[str, str] = {}
+        self._depth: Dict[str, int] = {}
+        self._attempts: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def push(self, urls: Iterable[str], depth: int = 0, requeue: bool = False) -> List[str]:
+        """Queue unseen URLs; with `requeue`, finished URLs are queued again."""
+        added = []
+        for url in urls:
+            state = self._state.get(url)
+            if state in (QUEUED, IN_FLIGHT) or (state is not None and not requeue):
+                continue
+            self._state[url] = QUEUED
+            self._depth[url] = depth
+            self._attempts[url] = 0
+            heapq.heappush(self._heap, (depth, next(self._seq), url))
+            added.append(url)
+        return added
+
+    def claim(self, limit: int = 1) -> List[Tuple[str, int]]:
+        """Take up to `limit` queued URLs, marking them in flight."""
+        claimed = []
+        while self._heap and len(claimed) < limit:
+            depth, _, url = heapq.heappop(self._heap)
+            if self._state.get(url) != QUEUED:
+                continue
+            self._state[url] = IN_FLIGHT
+            self._attempts[url] += 1
+            claimed.append((url, depth))
+        return claimed
+
+    def mark_done(self, url: str):
+        self._state[url] = DONE
+
+    def mark_failed(self, url: str, error: Optional[str] = None):
+        """Requeue a failed URL until it runs out of attempts."""
+        if self._attempts.get(url, 0) < self.max_attempts:
+            self._state[url] = QUEUED
+            heapq.heappush(self._heap, (self._depth.get(url, 0), next(self._seq), url))
+        else:
+            self._state[url] = FAILED
+
+    def checkpoint(self):
+        """Nothing to persist for an in-memory frontier."""
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        for state in self._state.values():
+            counts[state] += 1
+        return counts
+
+
+class CrawlFrontier:
+    def __init__(self, path: str, max_attempts: int = 3, checkpoint_interval: float = 5.0):
+        """
+        Durable frontier stored in SQLite with per-URL state and attempt count.
+        URLs are handed out by priority, then depth (breadth-first), then
+        insertion order. State changes are committed at most every
+        `checkpoint_interval` seconds; in-flight URLs from a crashed run are
+        requeued on open, so a restart resumes without refetching done pages.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS frontier ('
+            ' seq INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL UNIQUE,'
+            ' state TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 0,'
+            ' depth INTEGER NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0,'
+            ' last_error TEXT, updated_at REAL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS frontier_order ON frontier (state, priority, depth, seq)'
+        )
+        recovered = self._conn.execute(
+            'UPDATE frontier SET state = ? WHERE state = ?', (QUEUED, IN_FLIGHT)
+        ).rowcount
+        self._conn.commit()
+        if recovered:
+            logger.info(f"Requeued {recovered} in-flight URLs from previous run")
+
+    def _maybe_checkpoint(self):
+        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self._conn.commit()
+            self._last_checkpoint = time.monotonic()
+
+    def push(self, urls: Iterable[str], depth: int = 0, requeue: bool = False,
+             priority: int = 0) -> List[str]:
+        """Queue unseen URLs; with `requeue`, done or failed URLs are queued again."""
+        added = []
+        now = time.time()
+        with self._lock:
+            for url in urls:
+                inserted = self._conn.execute(
+                    'INSERT OR IGNORE INTO frontier (url, state, priority, depth, updated_at)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (url, QUEUED, priority, depth, now)
+                ).rowcount
+                if not inserted and requeue:
+                    inserted = self._conn.execute(
+                        'UPDATE frontier SET state = ?, priority = ?, depth = ?, attempts = 0,'
+                        ' updated_at = ? WHERE url = ? AND state IN (?, ?)',
+                        (QUEUED, priority, depth, now, url, DONE, FAILED)
+                    ).rowcount
+                if inserted:
+                    added.append(url)
+            self._maybe_checkpoint()
+        return added
+
+    def claim(self, limit: int = 1) -> List[Tuple[str, int]]:
+        """Take up to `limit` queued URLs in crawl order, marking them in flight."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, depth FROM frontier WHERE state = ?'
+                ' ORDER BY priority, depth, seq LIMIT ?',
+                (QUEUED, limit)
+            ).fetchall()
+            self._conn.executemany(
+                'UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?',
+                [(IN_FLIGHT, time.time(), url) for url, _ in rows]
+            )
+            self._maybe_checkpoint()
+        return [(url, depth) for url, depth in rows]
+
+    def mark_done(self, url: str):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE frontier SET state = ?, last_error = NULL, updated_at = ? WHERE url = ?',
+                (DONE, time.time(), url)
+            )
+            self._maybe_checkpoint()
+
+    def mark_failed(self, url: str, error: Optional[str] = None):
+        """Requeue a failed URL until it runs out of attempts."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE frontier SET state = CASE WHEN attempts < ? THEN ? ELSE ? END,'
+                ' last_error = ?, updated_at = ? WHERE url = ?',
+                (self.max_attempts, QUEUED, FAILED, error, time.time(), url)
+            )
+            self._maybe_checkpoint()
+
+    def checkpoint(self):
+        """Commit all state changes made since the last checkpoint."""
+        with self._lock:
+            self._conn.commit()
+            self._last_checkpoint = time.monotonic()
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            for state, count in self._conn.execute(
+                'SELECT state, COUNT(*) FROM frontier GROUP BY state'
+            ):
+                counts[state] = count
+        return counts
+
+    def close(self):
+        """Checkpoint and close the underlying database."""
+        self.checkpoint()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,119 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """Open a size-bounded LRU cache of response bodies stored in SQLite."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' url TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT,'
+            ' size INTEGER NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for `url` if one is stored."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def record_hit(self, url: str):
+        """Mark a cached response as revalidated and recently used."""
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url)
+            )
+            self._conn.commit()
+
+    def store(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        """Record a full download, caching it when the origin sent validators."""
+        with self._lock:
+            self.misses += 1
+            if not (etag or last_modified):
+                return
+            size = len(body.encode('utf-8'))
+            if size > self.max_bytes:
+                return
+            previous = self._conn.execute(
+                'SELECT size FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (url, body, etag, last_modified, size, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (url, body, etag, last_modified, size, time.time())
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT url, size FROM responses ORDER BY last_access LIMIT 64'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for url, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._total_bytes -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self._total_bytes
+            }
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,168 @@
+import logging
+import re
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+from ..monitoring.profiling import timed
+from .section_extractor import HEADING_TAGS
+
+logger = logging.getLogger(__name__)
+
+# Strings BeautifulSoup's get_text() leaves out when called on an enclosing tag
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+_CSS_STEP = re.compile(r'^(?P<tag>[a-z0-9]+|\*)?(?P<classes>(?:\.[\w-]+)*)(?P<attr>\[[\w-]+\])?$')
+
+
+def css_to_xpath(selector: str) -> str:
+    """Translate the simple `tag.class[attr] descendant` selectors used by the scraper to XPath."""
+    steps = []
+    for part in selector.split():
+        match = _CSS_STEP.match(part)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector}")
+        step = match.group('tag') or '*'
+        for class_name in filter(None, match.group('classes').split('.')):
+            step += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        if match.group('attr'):
+            step += f"[@{match.group('attr')[1:-1]}]"
+        steps.append(step)
+    return '//' + '//'.join(steps)
+
+
+def compile_selector(selector: str) -> etree.XPath:
+    return etree.XPath(css_to_xpath(selector))
+
+
+def parse_html(html_content: str) -> lxml.html.HtmlElement:
+    """Parse a page into an lxml document, tolerating empty pages and encoding declarations."""
+    if not html_content or not html_content.strip():
+        return lxml.html.document_fromstring('<html></html>')
+    try:
+        return lxml.html.document_fromstring(html_content)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration must be parsed as bytes
+        return lxml.html.document_fromstring(html_content.encode('utf-8'))
+
+
+def get_text(element: lxml.html.HtmlElement) -> str:
+    """Concatenated text of an element, matching BeautifulSoup's Tag.get_text()."""
+    parts = []
+
+    def walk(node):
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    return ''.join(parts)
+
+
+def element_siblings(element: lxml.html.HtmlElement) -> Iterator[lxml.html.HtmlElement]:
+    """Yield following sibling elements, skipping comments and processing instructions."""
+    current = element.getnext()
+    while current is not None:
+        if isinstance(current.tag, str):
+            yield current
+        current = current.getnext()
+
+
+class LxmlExtractor:
+    def __init__(self, scraper):
+        """
+        Extraction backend working on lxml.html trees with the precompiled
+        XPath of each extraction plan. Produces the same sample documents as
+        the BeautifulSoup path without building a BeautifulSoup tree; text
+        normalization, stats parsing and document assembly are shared with
+        `scraper` (a NailibScraper), whose profiles route URLs to plans.
+        """
+        self.scraper = scraper
+        self._headings = etree.XPath('//*[' + ' or '.join(f'self::{tag}' for tag in HEADING_TAGS) + ']')
+
+    @staticmethod
+    def _first(selectors: List[etree.XPath], tree) -> Optional[lxml.html.HtmlElement]:
+        for selector in selectors:
+            found = selector(tree)
+            if found:
+                return found[0]
+        return None
+
+    @timed
+    def _sections(self, tree, plan) -> Dict[str, Dict[str, Any]]:
+        headings = ((heading, get_text(heading)) for heading in self._headings(tree))
+        return self.scraper._build_sections(
+            plan,
+            plan.section_extractor.best_headings(headings),
+            lambda heading: map(get_text, self._section_siblings(heading))
+        )
+
+    @staticmethod
+    def _section_siblings(heading) -> Iterator[lxml.html.HtmlElement]:
+        for sibling in element_siblings(heading):
+            if sibling.tag in HEADING_TAGS:
+                return
+            yield sibling
+
+    def find_links(self, tree, plan) -> List[str]:
+        """Related sample URLs, as NailibScraper._find_similar_samples."""
+        return self.scraper._filter_sample_links(
+            link.get('href', '') for selector in plan.xpaths['links'] for link in selector(tree)
+        )
+
+    def parse_links(self, html_content: str, url: str) -> List[str]:
+        return self.find_links(parse_html(html_content), self.scraper.profiles.plan_for(url))
+
+    def parse_sample(self, html_content: str, url: str) -> Optional[Dict[str, Any]]:
+        return self._parse_tree(parse_html(html_content), url)
+
+    def parse_page(self, html_content: str, url: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        tree = parse_html(html_content)
+        return self._parse_tree(tree, url), self.find_links(tree, self.scraper.profiles.plan_for(url))
+
+    @timed
+    def _parse_tree(self, tree, url: str) -> Optional[Dict[str, Any]]:
+        scraper = self.scraper
+        try:
+            plan = scraper.profiles.plan_for(url)
+            xpaths = plan.xpaths
+
+            title_elem = self._first(xpaths['title'], tree)
+            title = scraper._clean_text(get_text(title_elem)) if title_elem is not None else None
+
+            desc_elem = self._first(xpaths['description'], tree)
+            description = scraper._clean_text(get_text(desc_elem)) if desc_elem is not None else ""
+
+            word_count, read_time = None, None
+            for selector in xpaths['stats']:
+                found = selector(tree)
+                if found:
+                    word_count, read_time = scraper._parse_stats_text(get_text(found[0]), plan)
+                    if word_count or read_time:
+                        break
+
+            publication_date = None
+            for selector in xpaths['date']:
+                found = selector(tree)
+                if found:
+                    publication_date = scraper._parse_date(found[0].get('datetime') or get_text(found[0]))
+                    if publication_date:
+                        break
+
+            file_links = scraper._filter_file_links(
+                (link.get('href', ''), get_text(link))
+                for selector in xpaths['file_links'] for link in selector(tree)
+            )
+
+            return scraper._build_sample(
+                plan, url, title, description, self._sections(tree, plan),
+                word_count, read_time, file_links, publication_date
+            )
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            return None
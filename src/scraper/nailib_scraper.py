@@ -1,38 +1,112 @@
 import requests
 from bs4 import BeautifulSoup
+import hashlib
+import json
 import logging
 from datetime import datetime
-import re
-from typing import Dict, Any, List, Optional, Set
 import time
-import random
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
+from ..monitoring.metrics import REGISTRY
+from ..monitoring.profiling import PROFILER, timed
+from .archive import PageArchive, PageArchiveWriter
+from .frontier import MemoryFrontier
+from .http_cache import ResponseCache
+from .lxml_backend import LxmlExtractor
+from .profiles import ExtractionPlan, load_profiles
+from .url_dedup import CompactURLSet
+from .rate_limiter import AdaptiveRateLimiter, HostRateLimiter, THROTTLE_STATUSES
 
 logger = logging.getLogger(__name__)
 
+# Extensions treated as downloadable sample resources
+FILE_EXTENSIONS = ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.csv', '.ppt', '.pptx', '.zip')
+
+# Sections of the default extraction profile, keyed by output field
+SECTION_TITLES = load_profiles().default.sections
+
+# Extraction backends selectable with the parser_backend option
+PARSER_BACKENDS = ('bs4', 'lxml')
+
+# Bookkeeping fields left out of the content fingerprint
+FINGERPRINT_EXCLUDED_FIELDS = {'url', 'last_updated', 'last_checked', 'content_hash'}
+
+# Per-stage crawler metrics, shared with the async fetcher
+FETCH_RESPONSES = REGISTRY.counter(
+    'scraper_fetch_responses_total', 'HTTP responses by status code ("error" for connection failures)', ['status']
+)
+FETCH_BYTES = REGISTRY.counter('scraper_fetch_bytes_total', 'Response body bytes received')
+FETCH_CACHE = REGISTRY.counter(
+    'scraper_fetch_cache_total', 'Pages served from the response cache (hit) or downloaded (miss)', ['result']
+)
+FETCH_SECONDS = REGISTRY.histogram('scraper_fetch_seconds', 'Latency of one HTTP request')
+FETCH_IN_FLIGHT = REGISTRY.gauge('scraper_fetch_in_flight', 'HTTP requests awaiting a response')
+PARSE_SECONDS = REGISTRY.histogram('scraper_parse_seconds', 'Time to extract one page', ['backend'])
+VALIDATE_SECONDS = REGISTRY.histogram('scraper_validate_seconds', 'Time to validate one sample document')
+VALIDATE_RESULTS = REGISTRY.counter('scraper_validate_total', 'Validated sample documents', ['result'])
+
+
+def content_fingerprint(sample_data: Dict[str, Any]) -> str:
+    """Stable SHA-256 of the extracted content, ignoring bookkeeping fields."""
+    content = {
+        key: value for key, value in sample_data.items()
+        if key not in FINGERPRINT_EXCLUDED_FIELDS
+    }
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
 class NailibScraper:
-    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.3):
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.3,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 base_url: str = "https://nailib.com",
+                 visited_ttl: Optional[float] = None,
+                 parser_backend: str = "bs4",
+                 profiles_path: Optional[str] = None,
+                 capture: Optional[PageArchiveWriter] = None,
+                 replay: Optional[PageArchive] = None):
         """Initialize the scraper with robust retry mechanism."""
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser_backend}")
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        self.base_url = "https://nailib.com"
+        self.base_url = base_url
         self.session = requests.Session()
         
-        # Configure retry strategy
+        # Configure retry strategy for connection errors; throttling statuses
+        # are retried in _make_request so the rate limiter can see them
+        self.max_retries = max_retries
         retry_strategy = Retry(
             total=max_retries,
             backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504]
+            status_forcelist=[]
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Cache for visited URLs
-        self.visited_urls: Set[str] = set()
+        # Per-host AIMD rate control replacing a fixed delay between requests
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        
+        # Optional persistent response cache revalidated with ETag/Last-Modified
+        self.cache = cache
+        
+        # Extraction profiles compiled once and routed by URL
+        self.profiles = load_profiles(profiles_path)
+        
+        # Optional lxml-native extraction that skips the BeautifulSoup tree
+        self.parser_backend = parser_backend
+        self.lxml_extractor = LxmlExtractor(self) if parser_backend == "lxml" else None
+        
+        # Record fetched pages to an archive, or serve pages from one instead of the network
+        self.capture = capture
+        self.replay = replay
+        
+        # Compact seen-set of visited URLs, forgotten after visited_ttl seconds
+        self.visited_urls = CompactURLSet(ttl=visited_ttl)
 
     def _make_request(self, url: str) -> Optional[str]:
         """Make HTTP request with error handling and caching."""
@@ -40,20 +114,71 @@ class NailibScraper:
             if url in self.visited_urls:
                 logger.info(f"URL already processed: {url}")
                 return None
-                
-            # Random delay between requests (1-3 seconds)
-            time.sleep(random.uniform(1, 3))
             
-            response = self.session.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            if self.replay:
+                return self._replay_request(url)
+                
+            cached = self.cache.lookup(url) if self.cache else None
+            headers = dict(self.headers, **cached.validators()) if cached else self.headers
             
-            self.visited_urls.add(url)
-            return response.text
+            for attempt in range(self.max_retries + 1):
+                # Wait for the host's rate limit
+                self.rate_limiter.acquire(url)
+                
+                start = time.monotonic()
+                try:
+                    with FETCH_IN_FLIGHT.track_inprogress():
+                        response = self.session.get(url, headers=headers, timeout=10)
+                except requests.exceptions.RequestException:
+                    FETCH_RESPONSES.inc(status='error')
+                    self.rate_limiter.record_response(url, None, time.monotonic() - start)
+                    raise
+                elapsed = time.monotonic() - start
+                FETCH_SECONDS.observe(elapsed)
+                FETCH_RESPONSES.inc(status=response.status_code)
+                FETCH_BYTES.inc(len(response.content))
+                self.rate_limiter.record_response(
+                    url, response.status_code, elapsed,
+                    response.headers.get('Retry-After')
+                )
+                
+                if response.status_code in THROTTLE_STATUSES and attempt < self.max_retries:
+                    logger.warning(f"Throttled with {response.status_code} on {url}, retrying")
+                    continue
+                
+                if response.status_code == 304 and cached:
+                    FETCH_CACHE.inc(result='hit')
+                    self.cache.record_hit(url)
+                    self.visited_urls.add(url)
+                    if self.capture:
+                        self.capture.write(url, cached.body, 200, response.headers)
+                    return cached.body
+                
+                response.raise_for_status()
+                if self.capture:
+                    self.capture.write(url, response.text, response.status_code, response.headers)
+                if self.cache:
+                    FETCH_CACHE.inc(result='miss')
+                    self.cache.store(
+                        url, response.text,
+                        response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    )
+                self.visited_urls.add(url)
+                return response.text
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return None
 
+    def _replay_request(self, url: str) -> Optional[str]:
+        """Serve a page from the replay archive without touching the network."""
+        html_content = self.replay.get(url)
+        if html_content is None:
+            logger.info(f"URL not in replay archive: {url}")
+            return None
+        self.visited_urls.add(url)
+        return html_content
+
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
         if not text:
@@ -72,46 +197,15 @@ class NailibScraper:
                     items.append(cleaned_item)
         return items
 
-    def _extract_word_count_and_time(self, soup: BeautifulSoup) -> tuple:
+    def _extract_word_count_and_time(self, soup: BeautifulSoup,
+                                     plan: Optional[ExtractionPlan] = None) -> tuple:
         """Extract word count and read time using multiple strategies."""
-        stats_selectors = [
-            'div.article-stats', 'div.sample-stats', 'div.meta-info',
-            'div.stats', 'div.metrics'
-        ]
-        
-        for selector in stats_selectors:
+        plan = plan or self.profiles.default
+        for selector in plan.selectors['stats']:
             try:
                 stats_div = soup.select_one(selector)
                 if stats_div:
-                    text = stats_div.get_text()
-                    
-                    word_count = None
-                    read_time = None
-                    
-                    # Try different word count patterns
-                    word_patterns = [
-                        r'(\d+)\s*words?',
-                        r'words?:\s*(\d+)',
-                        r'length:\s*(\d+)'
-                    ]
-                    for pattern in word_patterns:
-                        match = re.search(pattern, text, re.I)
-                        if match:
-                            word_count = int(match.group(1))
-                            break
-                    
-                    # Try different read time patterns
-                    time_patterns = [
-                        r'(\d+\s*mins?\s*read)',
-                        r'read\s*time:\s*(\d+\s*mins?)',
-                        r'reading\s*time:\s*(\d+\s*mins?)'
-                    ]
-                    for pattern in time_patterns:
-                        match = re.search(pattern, text, re.I)
-                        if match:
-                            read_time = match.group(1)
-                            break
-                    
+                    word_count, read_time = self._parse_stats_text(stats_div.get_text(), plan)
                     if word_count or read_time:
                         return (word_count, read_time)
                         
@@ -121,186 +215,275 @@ class NailibScraper:
         
         return (None, None)
 
-    def _extract_section_content(self, soup: BeautifulSoup, section_title: str) -> Dict[str, Any]:
-        """Extract section content with advanced heading detection."""
-        title_variations = [
-            section_title,
-            section_title.lower(),
-            section_title.replace(' ', '-').lower(),
-            section_title.replace(' ', '_').lower()
-        ]
+    def _parse_stats_text(self, text: str, plan: ExtractionPlan) -> tuple:
+        """Find word count and read time in a stats block's text."""
+        word_count = None
+        read_time = None
         
-        for title in title_variations:
-            try:
-                # Try different heading patterns
-                heading = soup.find(lambda tag: (
-                    tag.name in ['h1', 'h2', 'h3', 'h4'] and
-                    re.search(title, tag.get_text(), re.I)
-                ))
-                
-                if heading:
+        for pattern in plan.word_count_patterns:
+            match = pattern.search(text)
+            if match:
+                word_count = int(match.group(1))
+                break
+        
+        for pattern in plan.read_time_patterns:
+            match = pattern.search(text)
+            if match:
+                read_time = match.group(1)
+                break
+        
+        return (word_count, read_time)
+
+    @timed
+    def _extract_sections(self, soup: BeautifulSoup,
+                          plan: Optional[ExtractionPlan] = None) -> Dict[str, Dict[str, Any]]:
+        """Extract all sections with a single pass over the page headings."""
+        plan = plan or self.profiles.default
+        return self._build_sections(
+            plan,
+            plan.section_extractor.match_headings(soup),
+            lambda heading: (tag.get_text() for tag in plan.section_extractor.section_siblings(heading))
+        )
+
+    def _build_sections(self, plan: ExtractionPlan, headings: Dict[str, Any],
+                        section_texts) -> Dict[str, Dict[str, Any]]:
+        """Build section content from matched headings and a callable yielding each heading's sibling texts."""
+        sections = {key: {"content": "", "checklist_items": []} for key in plan.sections}
+        try:
+            collected = {}
+            for key, heading in headings.items():
+                # Several sections can share one heading; collect its content once
+                if id(heading) not in collected:
                     content = []
                     checklist_items = []
-                    current = heading.find_next_sibling()
-                    
-                    while current and current.name not in ['h1', 'h2', 'h3', 'h4']:
-                        text = self._clean_text(current.get_text())
+                    for raw_text in section_texts(heading):
+                        text = self._clean_text(raw_text)
                         if text:
                             content.append(text)
                             if '•' in text or text.strip().startswith('-'):
                                 checklist_items.extend(self._extract_checklist_items(text))
-                        current = current.find_next_sibling()
-                    
-                    return {
+                    collected[id(heading)] = {
                         "content": ' '.join(content),
                         "checklist_items": checklist_items
                     }
-                    
-            except Exception as e:
-                logger.debug(f"Error extracting section {title}: {str(e)}")
-                continue
-        
-        return {"content": "", "checklist_items": []}
+                sections[key] = {
+                    "content": collected[id(heading)]["content"],
+                    "checklist_items": list(collected[id(heading)]["checklist_items"])
+                }
+        except Exception as e:
+            logger.debug(f"Error extracting sections: {str(e)}")
+        return sections
 
-    def _find_similar_samples(self, soup: BeautifulSoup) -> List[str]:
+    @timed
+    def _find_similar_samples(self, soup: BeautifulSoup,
+                              plan: Optional[ExtractionPlan] = None) -> List[str]:
         """Find similar sample URLs using multiple strategies."""
-        similar_urls = set()
-        
+        plan = plan or self.profiles.default
+        hrefs = []
         # Link selectors in order of relevance
-        selectors = [
-            'div.related-samples a',
-            'div.similar-content a',
-            'div.recommendations a',
-            'aside a',
-            'nav a',
-            'main a'
-        ]
-        
-        for selector in selectors:
+        for selector in plan.selectors['links']:
             try:
-                for link in soup.select(selector):
-                    href = link.get('href', '')
-                    if href and '/ia-sample/ib-math-ai-sl/' in href:
-                        full_url = urljoin(self.base_url, href)
-                        if not full_url.endswith('#'):
-                            similar_urls.add(full_url)
+                hrefs.extend(link.get('href', '') for link in soup.select(selector))
             except Exception as e:
                 logger.debug(f"Error with selector {selector}: {str(e)}")
                 continue
         
+        return self._filter_sample_links(hrefs)
+
+    def _filter_sample_links(self, hrefs: Iterable[str]) -> List[str]:
+        """Resolve hrefs pointing at samples of any configured subject."""
+        similar_urls = set()
+        for href in hrefs:
+            if href and self.profiles.is_sample_link(href):
+                full_url = urljoin(self.base_url, href)
+                if not full_url.endswith('#'):
+                    similar_urls.add(full_url)
         return list(similar_urls)
 
-    def discover_samples(self, start_url: str, max_samples: int = 10) -> List[str]:
-        """Discover sample URLs using depth-first search."""
-        discovered_urls = set()
-        to_visit = {start_url}
+    def _extract_file_links(self, soup: BeautifulSoup,
+                            plan: Optional[ExtractionPlan] = None) -> List[Dict[str, str]]:
+        """Extract links to downloadable resources attached to the sample."""
+        plan = plan or self.profiles.default
+        return self._filter_file_links(
+            (link.get('href', ''), link.get_text())
+            for selector in plan.selectors['file_links'] for link in soup.select(selector)
+        )
+
+    def _filter_file_links(self, links: Iterable[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """Keep (href, text) links to downloadable files, resolved and deduplicated."""
+        file_links = []
+        seen = set()
+        for href, text in links:
+            path = urlparse(href).path.lower()
+            if not (path.endswith(FILE_EXTENSIONS) or '/download' in path):
+                continue
+            full_url = urljoin(self.base_url, href)
+            if full_url in seen:
+                continue
+            seen.add(full_url)
+            file_links.append({
+                "url": full_url,
+                "title": self._clean_text(text) or path.rsplit('/', 1)[-1]
+            })
+        return file_links
+
+    @timed
+    def discover_samples(self, start_url: str, max_samples: int = 10,
+                         frontier=None) -> List[str]:
+        """
+        Discover sample URLs breadth-first.
+        Pass a CrawlFrontier to make discovery durable and resumable; pages
+        it already marked done are not fetched again.
+        """
+        discovered_urls = []
+        frontier = frontier or MemoryFrontier()
+        frontier.push([start_url], depth=0)
         
         try:
-            while to_visit and len(discovered_urls) < max_samples:
-                current_url = to_visit.pop()
-                if current_url in discovered_urls:
-                    continue
+            while len(discovered_urls) < max_samples:
+                claimed = frontier.claim(1)
+                if not claimed:
+                    break
+                current_url, depth = claimed[0]
                 
                 html_content = self._make_request(current_url)
                 if not html_content:
+                    frontier.mark_failed(current_url, "fetch failed")
                     continue
                 
-                soup = BeautifulSoup(html_content, 'lxml')
-                similar_urls = self._find_similar_samples(soup)
+                similar_urls = self.parse_links(html_content, current_url)
                 
-                discovered_urls.add(current_url)
+                discovered_urls.append(current_url)
+                frontier.mark_done(current_url)
                 
                 # Add new URLs to visit
-                for url in similar_urls:
-                    if url not in discovered_urls and len(discovered_urls) < max_samples:
-                        to_visit.add(url)
+                frontier.push(similar_urls, depth=depth + 1)
                 
                 # Log progress
                 logger.info(f"Discovered {len(discovered_urls)}/{max_samples} samples")
                 
-            return list(discovered_urls)
+            return discovered_urls
             
         except Exception as e:
             logger.error(f"Error discovering samples: {str(e)}")
-            return list(discovered_urls)
+            return discovered_urls
+        finally:
+            frontier.checkpoint()
 
+    @timed
     def scrape_sample(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrape sample data with comprehensive extraction."""
-        try:
+        with PROFILER.profile("scrape_sample"):
             html_content = self._make_request(url)
             if not html_content:
                 return None
+            return self.parse_sample(html_content, url)
 
+    def parse_sample(self, html_content: str, url: str) -> Optional[Dict[str, Any]]:
+        """Extract sample data from an already fetched page."""
+        with PARSE_SECONDS.time(backend=self.parser_backend):
+            if self.lxml_extractor:
+                return self.lxml_extractor.parse_sample(html_content, url)
+            return self._parse_soup(BeautifulSoup(html_content, 'lxml'), url)
+
+    def parse_page(self, html_content: str, url: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """Extract both the sample data and related sample links from one parse."""
+        with PROFILER.profile("parse_page"), PARSE_SECONDS.time(backend=self.parser_backend):
+            if self.lxml_extractor:
+                return self.lxml_extractor.parse_page(html_content, url)
             soup = BeautifulSoup(html_content, 'lxml')
+            return self._parse_soup(soup, url), self._find_similar_samples(soup, self.profiles.plan_for(url))
+
+    def parse_links(self, html_content: str, url: str) -> List[str]:
+        """Extract related sample links from an already fetched page."""
+        if self.lxml_extractor:
+            return self.lxml_extractor.parse_links(html_content, url)
+        return self._find_similar_samples(BeautifulSoup(html_content, 'lxml'), self.profiles.plan_for(url))
+
+    def _select_first(self, soup: BeautifulSoup, selectors: List[str]):
+        """First element matched by the earliest selector that matches anything."""
+        for selector in selectors:
+            element = soup.select_one(selector)
+            if element:
+                return element
+        return None
+
+    @timed
+    def _parse_soup(self, soup: BeautifulSoup, url: str) -> Optional[Dict[str, Any]]:
+        """Extract sample data from a parsed page."""
+        try:
+            plan = self.profiles.plan_for(url)
             
             # Extract title with fallbacks
-            title = None
-            title_selectors = ['h1.title', 'h1.sample-title', 'h1']
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = self._clean_text(title_elem.get_text())
-                    break
+            title_elem = self._select_first(soup, plan.selectors['title'])
+            title = self._clean_text(title_elem.get_text()) if title_elem else None
             
             # Extract description
-            description = ""
-            desc_selectors = ['div.description', 'div.summary', 'div.overview']
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = self._clean_text(desc_elem.get_text())
-                    break
+            desc_elem = self._select_first(soup, plan.selectors['description'])
+            description = self._clean_text(desc_elem.get_text()) if desc_elem else ""
             
             # Extract core data
-            word_count, read_time = self._extract_word_count_and_time(soup)
+            word_count, read_time = self._extract_word_count_and_time(soup, plan)
             
             # Extract sections
-            sections = {
-                "introduction": self._extract_section_content(soup, "Introduction"),
-                "mathematical_information": self._extract_section_content(soup, "Mathematical Information"),
-                "mathematical_processes": self._extract_section_content(soup, "Mathematical Processes"),
-                "interpretation": self._extract_section_content(soup, "Interpretation of Findings"),
-                "validity_limitations": self._extract_section_content(soup, "Validity and Limitations"),
-                "academic_honesty": self._extract_section_content(soup, "Academic Honesty")
-            }
+            sections = self._extract_sections(soup, plan)
             
             # Extract file links
-            file_links = self._extract_file_links(soup)
+            file_links = self._extract_file_links(soup, plan)
             
             # Extract publication date
             publication_date = None
-            date_selectors = ['time', 'span.date', 'div.meta-date']
-            for selector in date_selectors:
+            for selector in plan.selectors['date']:
                 date_elem = soup.select_one(selector)
                 if date_elem:
-                    date_str = date_elem.get('datetime') or date_elem.get_text()
-                    try:
-                        publication_date = datetime.fromisoformat(date_str).isoformat()
+                    publication_date = self._parse_date(date_elem.get('datetime') or date_elem.get_text())
+                    if publication_date:
                         break
-                    except (ValueError, TypeError):
-                        continue
             
-            # Construct sample data
-            sample_data = {
-                "url": url,
-                "title": title,
-                "subject": "Math AI SL",
-                "description": description,
-                "sections": sections,
-                "word_count": word_count,
-                "read_time": read_time,
-                "file_links": file_links,
-                "publication_date": publication_date,
-                "last_updated": datetime.utcnow().isoformat()
-            }
-            
-            return sample_data
+            return self._build_sample(
+                plan, url, title, description, sections,
+                word_count, read_time, file_links, publication_date
+            )
             
         except Exception as e:
             logger.error(f"Error scraping {url}: {str(e)}")
             return None
 
+    def _parse_date(self, date_str: str) -> Optional[str]:
+        """Normalize an ISO date string, or None when it doesn't parse."""
+        try:
+            return datetime.fromisoformat(date_str).isoformat()
+        except (ValueError, TypeError):
+            return None
+
+    def _build_sample(self, plan: ExtractionPlan, url: str, title: Optional[str], description: str,
+                      sections: Dict[str, Dict[str, Any]], word_count: Optional[int],
+                      read_time: Optional[str], file_links: List[Dict[str, str]],
+                      publication_date: Optional[str]) -> Dict[str, Any]:
+        """Assemble and fingerprint a sample document from extracted fields."""
+        sample_data = {
+            "url": url,
+            "title": title,
+            "subject": plan.subject,
+            "description": description,
+            "sections": sections,
+            "word_count": word_count,
+            "read_time": read_time,
+            "file_links": file_links,
+            "publication_date": publication_date,
+            "last_updated": datetime.utcnow().isoformat()
+        }
+        sample_data["content_hash"] = content_fingerprint(sample_data)
+        return sample_data
+
     def validate_sample_data(self, sample_data: Dict[str, Any]) -> bool:
+        """Validate sample data, recording the outcome and duration."""
+        with VALIDATE_SECONDS.time():
+            valid = self._check_sample_data(sample_data)
+        VALIDATE_RESULTS.inc(result='valid' if valid else 'invalid')
+        return valid
+
+    def _check_sample_data(self, sample_data: Dict[str, Any]) -> bool:
         """Validate sample data with comprehensive checks."""
         try:
             # Required fields
@@ -312,14 +495,7 @@ class NailibScraper:
             
             # Section validation
             sections = sample_data.get('sections', {})
-            required_sections = [
-                'introduction',
-                'mathematical_information',
-                'mathematical_processes',
-                'interpretation',
-                'validity_limitations',
-                'academic_honesty'
-            ]
+            required_sections = list(self.profiles.plan_for(sample_data['url']).sections)
             
             for section in required_sections:
                 if section not in sections:
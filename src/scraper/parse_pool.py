@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Type
+
+from ..monitoring.profiling import PROFILER
+from .nailib_scraper import NailibScraper
+
+logger = logging.getLogger(__name__)
+
+# Parser instance owned by each worker process
+_worker_scraper: Optional[NailibScraper] = None
+
+
+def _init_worker(scraper_cls: Type[NailibScraper], scraper_kwargs: Dict[str, Any],
+                 profiler_config: Dict[str, Any]):
+    """Build the worker's parser once instead of per page."""
+    global _worker_scraper
+    # Each worker profiles its own share of an armed session and dumps it separately,
+    # at the latest when the pool shuts down
+    PROFILER.apply(profiler_config)
+    Finalize(PROFILER, PROFILER.stop, exitpriority=10)
+    _worker_scraper = scraper_cls(**scraper_kwargs)
+
+
+def _parse_batch(pages: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """Parse a batch of (url, html) pages inside a worker process."""
+    return [_worker_scraper.parse_sample(html_content, url) for url, html_content in pages]
+
+
+def _parse_page_batch(pages: List[Tuple[str, str]]) -> List[Tuple[Optional[Dict[str, Any]], List[str]]]:
+    """Parse a batch of pages into (sample, related links) pairs."""
+    return [_worker_scraper.parse_page(html_content, url) for url, html_content in pages]
+
+
+class ParsePool:
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 8,
+                 scraper_cls: Type[NailibScraper] = NailibScraper,
+                 scraper_kwargs: Optional[Dict[str, Any]] = None):
+        """Initialize a process pool that turns raw HTML into sample documents."""
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(scraper_cls, scraper_kwargs or {}, PROFILER.config())
+        )
+
+    def _batches(self, pages: Iterable[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Group pages so each task amortizes pickling over several documents."""
+        pages = list(pages)
+        return [pages[i:i + self.batch_size] for i in range(0, len(pages), self.batch_size)]
+
+    def parse_many(self, pages: Iterable[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Parse (url, html) pages across worker processes, preserving order."""
+        futures = [self._executor.submit(_parse_batch, batch) for batch in self._batches(pages)]
+        return [sample for future in futures for sample in future.result()]
+
+    async def parse_many_async(self, pages: Iterable[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Parse pages in worker processes without blocking the event loop."""
+        futures = [
+            asyncio.wrap_future(self._executor.submit(_parse_batch, batch))
+            for batch in self._batches(pages)
+        ]
+        results = await asyncio.gather(*futures)
+        return [sample for batch in results for sample in batch]
+
+    async def parse_pages_async(self, pages: List[Tuple[str, str]]) -> List[Tuple[Optional[Dict[str, Any]], List[str]]]:
+        """Parse one batch of pages into (sample, related links) pairs in a worker."""
+        return await asyncio.wrap_future(self._executor.submit(_parse_page_batch, list(pages)))
+
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
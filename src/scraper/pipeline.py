@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from ..monitoring.metrics import REGISTRY
+from .async_scraper import AsyncNailibScraper
+from .frontier import MemoryFrontier
+from .nailib_scraper import PARSE_SECONDS
+from .scheduler import RecrawlScheduler
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DEPTH = REGISTRY.gauge('pipeline_queue_depth', 'Items waiting in front of each pipeline stage', ['stage'])
+PAGES_IN_FLIGHT = REGISTRY.gauge('pipeline_pages_in_flight', 'Claimed pages not yet stored or failed')
+
+
+class CrawlPipeline:
+    def __init__(self, scraper: AsyncNailibScraper, writer,
+                 max_pages: int = 20, queue_size: int = 50, report_interval: float = 10.0,
+                 metrics_interval: float = 1.0, schedule: Optional[RecrawlScheduler] = None, frontier=None):
+        """
+        Streaming crawl: frontier -> fetch -> parse -> validate -> store.
+        Stages are connected by bounded queues so a slow stage applies
+        backpressure upstream. Each page is fetched once; its links and sample
+        document come from the same parse, and the record is handed to the
+        writer as soon as it is ready. `writer` is a BulkWriteBuffer (or any
+        object with the same add/flush_if_due/flush/len interface); its
+        blocking calls run off the event loop. With a `schedule`, discovered
+        links that are not yet due are skipped and every outcome feeds back
+        into the URL's revisit interval. `frontier` is a CrawlFrontier (or
+        anything with its push/claim/mark_done/mark_failed interface); by
+        default an in-memory breadth-first frontier is used for the round.
+        Queue depths are published as gauges every `metrics_interval` seconds.
+        """
+        self.scraper = scraper
+        self.writer = writer
+        self.max_pages = max_pages
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.metrics_interval = metrics_interval
+        self.schedule = schedule
+        self.frontier = frontier or MemoryFrontier()
+        self.stats = {"fetched": 0, "fetch_failed": 0, "parsed": 0, "parse_failed": 0,
+                      "invalid": 0, "stored": 0, "store_failed": 0, "changed": 0, "unchanged": 0}
+        self._queues: Dict[str, asyncio.Queue] = {}
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Items waiting in front of each stage."""
+        return {name: queue.qsize() for name, queue in self._queues.items()}
+
+    def _update_gauges(self):
+        """Publish queue depths and in-flight pages to the metrics registry."""
+        for stage, depth in self.queue_depths().items():
+            QUEUE_DEPTH.set(depth, stage=stage)
+        PAGES_IN_FLIGHT.set(self._pending)
+
+    def _enqueue(self, urls: Iterable[str], depth: int):
+        """Push discovered links into the frontier, skipping ones not due yet."""
+        if self.schedule:
+            urls = [url for url in urls if self.schedule.is_due(url)]
+        if self.frontier.push(urls, depth=depth):
+            self._wake.set()
+
+    def _complete(self, url: str, ok: bool, changed: bool = False, error: Optional[str] = None,
+                  stored: bool = True):
+        """
+        Record a page's final outcome in the frontier and schedule. Only stored
+        pages say whether the content changed; one finished without a write is
+        retried like a failure, leaving its revisit interval alone.
+        """
+        if ok:
+            self.frontier.mark_done(url)
+            if self.schedule:
+                if stored:
+                    self.schedule.record(url, changed)
+                else:
+                    self.schedule.record_failure(url)
+        else:
+            self.frontier.mark_failed(url, error)
+            if self.schedule:
+                self.schedule.record_failure(url)
+        self._pending -= 1
+        self._wake.set()
+
+    async def _feed(self):
+        """Claim URLs from the frontier into the bounded fetch queue until the crawl drains."""
+        while True:
+            budget = self.max_pages - self._claimed
+            claimed = self.frontier.claim(min(budget, self.queue_size)) if budget > 0 else []
+            if not claimed:
+                if self._pending == 0:
+                    self._done.set()
+                    return
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            self._claimed += len(claimed)
+            self._pending += len(claimed)
+            for url, depth in claimed:
+                await self._queues["fetch"].put((url, depth))
+
+    async def _fetch(self):
+        while True:
+            url, depth = await self._queues["fetch"].get()
+            try:
+                # The frontier decides what gets crawled, so a URL it hands out again
+                # after a failure is fetched again rather than skipped as visited
+                results = await self.scraper.fetcher.fetch_many([url])
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {str(e)}")
+                results = {}
+            html_content = results.get(url)
+            if html_content:
+                self.stats["fetched"] += 1
+                await self._queues["parse"].put((url, depth, html_content))
+            else:
+                self.stats["fetch_failed"] += 1
+                self._complete(url, ok=False, error="fetch failed")
+
+    async def _parse(self):
+        parse_pool = self.scraper.parse_pool
+        batch_size = parse_pool.batch_size if parse_pool else 1
+        while True:
+            items = [await self._queues["parse"].get()]
+            while len(items) < batch_size and not self._queues["parse"].empty():
+                items.append(self._queues["parse"].get_nowait())
+            pages = [(url, html_content) for url, _, html_content in items]
+
+            try:
+                if parse_pool:
+                    # Worker processes keep their own metrics, so observe the amortized batch time here
+                    start = time.perf_counter()
+                    parsed = await parse_pool.parse_pages_async(pages)
+                    elapsed = (time.perf_counter() - start) / len(pages)
+                    for _ in pages:
+                        PARSE_SECONDS.observe(elapsed, backend=self.scraper.parser_backend)
+                else:
+                    parsed = [self.scraper.parse_page(html_content, url) for url, html_content in pages]
+            except Exception as e:
+                logger.error(f"Error parsing {len(pages)} pages: {str(e)}")
+                self.stats["parse_failed"] += len(pages)
+                for url, _ in pages:
+                    self._complete(url, ok=False, error=str(e))
+                continue
+
+            for (url, depth, _), (sample_data, links) in zip(items, parsed):
+                self.stats["parsed"] += 1
+                self._enqueue(links, depth + 1)
+                await self._queues["store"].put((url, sample_data))
+
+    def _record_writes(self, results: List[Dict[str, Any]]):
+        """Count per-document write results and retire their pages."""
+        for result in results:
+            if result["ok"]:
+                changed = result.get("changed", True)
+                self.stats["stored"] += 1
+                self.stats["changed" if changed else "unchanged"] += 1
+                self._complete(result["url"], ok=True, changed=changed)
+            else:
+                self.stats["store_failed"] += 1
+                logger.error(f"Failed to store sample data from {result['url']}: {result['error']}")
+                self._complete(result["url"], ok=False, error=result["error"])
+
+    async def _store(self):
+        flush_interval = getattr(self.writer, "flush_interval", 1.0)
+        while True:
+            try:
+                url, sample_data = await asyncio.wait_for(
+                    self._queues["store"].get(), timeout=flush_interval
+                )
+            except asyncio.TimeoutError:
+                self._record_writes(await asyncio.to_thread(self.writer.flush_if_due))
+                continue
+
+            if not sample_data or not self.scraper.validate_sample_data(sample_data):
+                self.stats["invalid"] += 1
+                logger.error(f"Invalid or missing sample data from {url}")
+                self._complete(url, ok=True, stored=False)
+            else:
+                self._record_writes(await asyncio.to_thread(self.writer.add, sample_data))
+
+            # Nothing else is in flight, so don't wait for the batch to fill
+            if len(self.writer) and self._pending == len(self.writer):
+                self._record_writes(await asyncio.to_thread(self.writer.flush))
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.frontier.checkpoint()
+            logger.info(f"Pipeline queues: {self.queue_depths()} stats: {self.stats}")
+
+    async def _sample_gauges(self):
+        while True:
+            self._update_gauges()
+            await asyncio.sleep(self.metrics_interval)
+
+    async def run(self, seed_urls: Iterable[str]) -> Dict[str, int]:
+        """
+        Crawl from the seed URLs plus anything left queued until the frontier
+        drains. An unexpected error in a stage stops the crawl and is re-raised.
+        """
+        self._queues = {
+            "fetch": asyncio.Queue(maxsize=self.queue_size),
+            "parse": asyncio.Queue(maxsize=self.queue_size),
+            "store": asyncio.Queue(maxsize=self.queue_size)
+        }
+        self._pending = 0
+        self._claimed = 0
+        self._wake = asyncio.Event()
+        self._done = asyncio.Event()
+
+        # Seeds are due by definition, so finished ones are queued again
+        self.frontier.push(seed_urls, depth=0, requeue=True)
+
+        parse_workers = self.scraper.parse_pool.workers if self.scraper.parse_pool else 1
+        tasks: List[asyncio.Task] = [
+            asyncio.create_task(self._feed()),
+            asyncio.create_task(self._report()),
+            asyncio.create_task(self._sample_gauges())
+        ]
+        tasks += [asyncio.create_task(self._fetch()) for _ in range(self.scraper.fetcher.concurrency)]
+        tasks += [asyncio.create_task(self._parse()) for _ in range(parse_workers)]
+        tasks.append(asyncio.create_task(self._store()))
+
+        done = asyncio.create_task(self._done.wait())
+        try:
+            # Stage tasks only return by failing, or the feeder once the crawl drained;
+            # a failed stage would leave pages pending forever, so it ends the run
+            finished, _ = await asyncio.wait(tasks + [done], return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task is not done and task.exception():
+                    logger.error(f"Pipeline stage failed: {task.exception()!r}")
+                    raise task.exception()
+        finally:
+            done.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.frontier.checkpoint()
+            self._update_gauges()
+
+        return dict(self.stats)
@@ -0,0 +1,114 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Pattern
+from urllib.parse import urlsplit
+
+from .lxml_backend import compile_selector
+from .section_extractor import SectionExtractor
+
+# Profiles bundled with the project
+DEFAULT_PROFILES_PATH = Path(__file__).parent.parent / "config" / "profiles.json"
+
+# Selector groups every profile must define
+SELECTOR_GROUPS = ('title', 'description', 'stats', 'date', 'links', 'file_links')
+
+# Directories remembered by the router before its lookup cache is reset
+ROUTE_CACHE_SIZE = 4096
+
+
+class ExtractionPlan:
+    def __init__(self, name: str, subject: str, url_prefixes: List[str],
+                 sections: Dict[str, str], selectors: Dict[str, List[str]],
+                 patterns: Dict[str, List[str]]):
+        """
+        One subject's extraction profile compiled once for reuse on every page:
+        the section heading matcher, CSS selectors for the BeautifulSoup
+        backend, their XPath equivalents for the lxml backend, and the stats
+        regexes.
+        """
+        missing = [group for group in SELECTOR_GROUPS if group not in selectors]
+        if missing:
+            raise ValueError(f"Profile {name} has no selectors for: {', '.join(missing)}")
+        self.name = name
+        self.subject = subject
+        self.url_prefixes = list(url_prefixes)
+        self.sections = dict(sections)
+        self.section_extractor = SectionExtractor(self.sections)
+        self.selectors = {group: list(selectors[group]) for group in SELECTOR_GROUPS}
+        self.xpaths = {
+            group: [compile_selector(selector) for selector in group_selectors]
+            for group, group_selectors in self.selectors.items()
+        }
+        self.word_count_patterns: List[Pattern] = [re.compile(p, re.I) for p in patterns.get('word_count', [])]
+        self.read_time_patterns: List[Pattern] = [re.compile(p, re.I) for p in patterns.get('read_time', [])]
+
+    def __repr__(self) -> str:
+        return f"ExtractionPlan({self.name!r}, subject={self.subject!r})"
+
+
+class ProfileRouter:
+    def __init__(self, plans: List[ExtractionPlan], default: Optional[str] = None):
+        """
+        Map URLs to extraction plans by path prefix.
+        Lookups are cached per URL directory, so routing a page is usually a
+        single dict hit; URLs matching no prefix use the default plan.
+        """
+        if not plans:
+            raise ValueError("At least one extraction profile is required")
+        self.plans = list(plans)
+        by_name = {plan.name: plan for plan in self.plans}
+        self.default = by_name[default] if default else self.plans[0]
+        self._by_prefix = {prefix: plan for plan in self.plans for prefix in plan.url_prefixes}
+        # Longest prefix wins when profiles overlap
+        self._prefixes = sorted(self._by_prefix, key=len, reverse=True)
+        self._link_pattern = re.compile('|'.join(re.escape(prefix) for prefix in self._prefixes))
+        self._routes: Dict[str, ExtractionPlan] = {}
+
+    def plan_for(self, url: str) -> ExtractionPlan:
+        """Extraction plan for a page URL."""
+        path = urlsplit(url).path
+        directory = path[:path.rfind('/') + 1]
+        plan = self._routes.get(directory)
+        if plan is None:
+            plan = next(
+                (self._by_prefix[prefix] for prefix in self._prefixes if directory.startswith(prefix)),
+                self.default
+            )
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                self._routes.clear()
+            self._routes[directory] = plan
+        return plan
+
+    def is_sample_link(self, href: str) -> bool:
+        """Whether a link points at a page covered by any profile."""
+        return bool(self._link_pattern.search(href))
+
+
+def _merge(defaults: Dict[str, Any], profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay a profile on the defaults, merging the selector and pattern groups."""
+    merged = dict(defaults, **profile)
+    for key in ('selectors', 'patterns'):
+        merged[key] = dict(defaults.get(key, {}), **profile.get(key, {}))
+    return merged
+
+
+@lru_cache(maxsize=None)
+def load_profiles(path: Optional[str] = None) -> ProfileRouter:
+    """Load and compile extraction profiles from JSON, once per path and process."""
+    with open(path or DEFAULT_PROFILES_PATH, encoding='utf-8') as f:
+        config = json.load(f)
+    defaults = config.get('defaults', {})
+    plans = []
+    for profile in config['profiles']:
+        merged = _merge(defaults, profile)
+        plans.append(ExtractionPlan(
+            name=merged['name'],
+            subject=merged['subject'],
+            url_prefixes=merged['url_prefixes'],
+            sections=merged['sections'],
+            selectors=merged['selectors'],
+            patterns=merged['patterns']
+        ))
+    return ProfileRouter(plans, default=config.get('default'))
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+# Status codes signalling that the origin wants us to slow down
+THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """Initialize a token bucket refilling at `rate` tokens per second."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            pause = max(0.0, self._paused_until - now)
+            if self._tokens >= 0:
+                return pause
+            return max(pause, -self._tokens / self.rate)
+
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping tokens accrued at the old rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def pause(self, seconds: float):
+        """Hold back every request for at least `seconds`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left before the bucket hands out tokens again."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def acquire(self):
+        """Block until a token is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a token is available."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = 2.0, burst: float = 4.0):
+        """Keep one token bucket per host so each origin is rate limited independently."""
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the bucket for the host of `url`, creating it on first use."""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def record_response(self, url: str, status: Optional[int], latency: float,
+                        retry_after: Optional[str] = None):
+        """Observe a response, honoring Retry-After on throttled ones."""
+        if status is None or status in THROTTLE_STATUSES:
+            delay = parse_retry_after(retry_after)
+            if delay:
+                self.bucket_for(url).pause(delay)
+
+    def acquire(self, url: str):
+        """Block until a request to the host of `url` is allowed."""
+        self.bucket_for(url).acquire()
+
+    async def acquire_async(self, url: str):
+        """Wait until a request to the host of `url` is allowed."""
+        await self.bucket_for(url).acquire_async()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    def __init__(self, rate: float = 2.0, burst: float = 4.0, min_rate: float = 0.1,
+                 max_rate: float = 20.0, increase: float = 0.25, decrease_factor: float = 0.5,
+                 latency_target: float = 2.0, decrease_cooldown: float = 1.0):
+        """
+        AIMD rate control per host.
+        The rate grows by `increase` req/s after each fast 2xx response and is
+        multiplied by `decrease_factor` on throttling statuses, errors or when
+        smoothed latency exceeds `latency_target` seconds.
+        """
+        super().__init__(rate=rate, burst=burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.decrease_cooldown = decrease_cooldown
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    def _host_state(self, host: str) -> Dict[str, Any]:
+        state = self._state.get(host)
+        if state is None:
+            state = {"latency": None, "last_decrease": 0.0, "increases": 0, "decreases": 0}
+            self._state[host] = state
+        return state
+
+    def record_response(self, url: str, status: Optional[int], latency: float,
+                        retry_after: Optional[str] = None):
+        """Adjust the host's rate from the outcome and latency of a request."""
+        host = urlparse(url).netloc
+        bucket = self.bucket_for(url)
+        with self._lock:
+            state = self._host_state(host)
+            if state["latency"] is None:
+                state["latency"] = latency
+            else:
+                state["latency"] = 0.8 * state["latency"] + 0.2 * latency
+
+            throttled = status is None or status in THROTTLE_STATUSES
+            slow = state["latency"] > self.latency_target
+
+            if throttled or slow:
+                delay = parse_retry_after(retry_after) if throttled else None
+                if delay:
+                    bucket.pause(delay)
+                now = time.monotonic()
+                if now - state["last_decrease"] < self.decrease_cooldown:
+                    return
+                state["last_decrease"] = now
+                state["decreases"] += 1
+                bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor))
+            elif 200 <= status < 300:
+                state["increases"] += 1
+                bucket.set_rate(min(self.max_rate, bucket.rate + self.increase))
+
+    def current_rate(self, url: str) -> float:
+        """Current allowed requests per second for the host of `url`."""
+        return self.bucket_for(url).rate
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host rate, smoothed latency and adjustment counters."""
+        with self._lock:
+            return {
+                host: {
+                    "rate": bucket.rate,
+                    "latency": self._state.get(host, {}).get("latency"),
+                    "increases": self._state.get(host, {}).get("increases", 0),
+                    "decreases": self._state.get(host, {}).get("decreases", 0),
+                    "paused_for": bucket.paused_for
+                }
+                for host, bucket in self._buckets.items()
+            }
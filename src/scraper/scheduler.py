@@ -0,0 +1,122 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RecrawlScheduler:
+    def __init__(self, path: str, initial_interval: float = 6 * 3600,
+                 min_interval: float = 3600, max_interval: float = 7 * 86400,
+                 backoff: float = 2.0):
+        """
+        Persistent per-URL revisit schedule stored in SQLite.
+        A URL whose content changed is revisited `backoff` times sooner next
+        time; an unchanged one `backoff` times later, within the min/max bounds.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS schedule ('
+            ' url TEXT PRIMARY KEY, next_due REAL NOT NULL, interval REAL NOT NULL,'
+            ' checks INTEGER NOT NULL DEFAULT 0, changes INTEGER NOT NULL DEFAULT 0,'
+            ' last_checked REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS schedule_due ON schedule (next_due)')
+        self._conn.commit()
+
+    def add(self, urls: Iterable[str], now: Optional[float] = None):
+        """Track new URLs, due immediately; known URLs keep their schedule."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO schedule (url, next_due, interval) VALUES (?, ?, ?)',
+                [(url, now, self.initial_interval) for url in urls]
+            )
+            self._conn.commit()
+
+    def due(self, limit: int = 100, now: Optional[float] = None) -> List[str]:
+        """URLs whose revisit time has passed, most overdue first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url FROM schedule WHERE next_due <= ? ORDER BY next_due LIMIT ?',
+                (now, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def is_due(self, url: str, now: Optional[float] = None) -> bool:
+        """Whether `url` is unknown or due for a revisit."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT next_due FROM schedule WHERE url = ?', (url,)
+            ).fetchone()
+        return row is None or row[0] <= now
+
+    def record(self, url: str, changed: bool, now: Optional[float] = None):
+        """Adapt the URL's revisit interval to whether its content changed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT interval FROM schedule WHERE url = ?', (url,)
+            ).fetchone()
+            interval = row[0] if row else self.initial_interval
+            if changed:
+                interval = max(self.min_interval, interval / self.backoff)
+            else:
+                interval = min(self.max_interval, interval * self.backoff)
+            self._conn.execute(
+                'INSERT INTO schedule (url, next_due, interval, checks, changes, last_checked)'
+                ' VALUES (?, ?, ?, 1, ?, ?)'
+                ' ON CONFLICT(url) DO UPDATE SET next_due = excluded.next_due,'
+                ' interval = excluded.interval, checks = checks + 1,'
+                ' changes = changes + excluded.changes, last_checked = excluded.last_checked',
+                (url, now + interval, interval, int(changed), now)
+            )
+            self._conn.commit()
+
+    def record_failure(self, url: str, now: Optional[float] = None):
+        """Retry a failed URL after the minimum interval without changing its cadence."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO schedule (url, next_due, interval) VALUES (?, ?, ?)'
+                ' ON CONFLICT(url) DO UPDATE SET next_due = excluded.next_due',
+                (url, now + self.min_interval, self.initial_interval)
+            )
+            self._conn.commit()
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest revisit, or None when nothing is scheduled."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute('SELECT MIN(next_due) FROM schedule').fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - now)
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Tracked and due URL counts."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tracked, due = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(next_due <= ?), 0) FROM schedule', (now,)
+            ).fetchone()
+        return {"tracked": tracked, "due": due}
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,74 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4']
+
+
+def title_variations(title: str) -> List[str]:
+    """Spellings a section heading may use, in order of preference."""
+    variations = [
+        title,
+        title.lower(),
+        title.replace(' ', '-').lower(),
+        title.replace(' ', '_').lower()
+    ]
+    # Matching is case-insensitive, so drop variations that only differ in case
+    unique = []
+    seen = set()
+    for variation in variations:
+        if variation.lower() not in seen:
+            seen.add(variation.lower())
+            unique.append(variation)
+    return unique
+
+
+class SectionExtractor:
+    def __init__(self, sections: Dict[str, str]):
+        """
+        Compile every section title into one case-insensitive pattern that
+        rejects headings matching no title in a single scan, plus one pattern
+        per title variation. A regex alternation matches one title per
+        position, so a title that is a prefix of another ("Introduction" in
+        "Introduction and Aim") is only found by the per-variation patterns.
+        """
+        self.sections = dict(sections)
+        self.variations: Dict[str, List[re.Pattern]] = {
+            key: [re.compile(re.escape(variation), re.I) for variation in title_variations(title)]
+            for key, title in self.sections.items()
+        }
+        alternatives = [pattern.pattern for patterns in self.variations.values() for pattern in patterns]
+        self.pattern = re.compile('|'.join(alternatives), re.I)
+
+    def match_headings(self, soup: BeautifulSoup) -> Dict[str, Tag]:
+        """
+        Walk the h1-h4 headings once and pick the heading for every section.
+        A section takes the first heading matching its most preferred title
+        variation, mirroring a per-variation search over the whole document.
+        """
+        return self.best_headings((heading, heading.get_text()) for heading in soup.find_all(HEADING_TAGS))
+
+    def best_headings(self, headings: Iterable[Tuple[Any, str]]) -> Dict[str, Any]:
+        """Pick the heading for every section from (heading, text) pairs in document order."""
+        best: Dict[str, tuple] = {}
+        for heading, text in headings:
+            if not self.pattern.search(text):
+                continue
+            for key, patterns in self.variations.items():
+                current = best.get(key)
+                # Only a more preferred variation can displace an earlier heading
+                limit = len(patterns) if current is None else current[0]
+                for priority, pattern in enumerate(patterns[:limit]):
+                    if pattern.search(text):
+                        best[key] = (priority, heading)
+                        break
+        return {key: heading for key, (_, heading) in best.items()}
+
+    @staticmethod
+    def section_siblings(heading: Tag) -> Iterator[Tag]:
+        """Yield the tags following a heading up to the next heading."""
+        current = heading.find_next_sibling()
+        while current and current.name not in HEADING_TAGS:
+            yield current
+            current = current.find_next_sibling()
@@ -0,0 +1,177 @@
+import re
+import sys
+import time
+from typing import Callable, Dict, Optional, Set
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Nailib sample ids are 24-hex-char MongoDB ObjectIds
+OBJECT_ID_RE = re.compile(r'^[0-9a-f]{24}$')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize scheme/host case, default ports, fragments, query order and trailing slashes."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class _IdTable:
+    """Open-addressing hash set of fixed-size binary keys packed in one bytearray."""
+    KEY_SIZE = 12
+    EMPTY = bytes(KEY_SIZE)
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._data = bytearray(capacity * self.KEY_SIZE)
+        self._count = 0
+        # The all-zero key marks empty slots, so it is tracked separately
+        self._has_empty_key = False
+
+    def __len__(self) -> int:
+        return self._count + self._has_empty_key
+
+    def _find(self, key: bytes) -> int:
+        """Index of the slot holding `key`, or of the empty slot where it belongs."""
+        mask = self._capacity - 1
+        index = hash(key) & mask
+        size = self.KEY_SIZE
+        while True:
+            offset = index * size
+            slot = self._data[offset:offset + size]
+            if slot == key or slot == self.EMPTY:
+                return index
+            index = (index + 1) & mask
+
+    def __contains__(self, key: bytes) -> bool:
+        if key == self.EMPTY:
+            return self._has_empty_key
+        offset = self._find(key) * self.KEY_SIZE
+        return self._data[offset:offset + self.KEY_SIZE] == key
+
+    def add(self, key: bytes):
+        if key == self.EMPTY:
+            self._has_empty_key = True
+            return
+        offset = self._find(key) * self.KEY_SIZE
+        if self._data[offset:offset + self.KEY_SIZE] == key:
+            return
+        self._data[offset:offset + self.KEY_SIZE] = key
+        self._count += 1
+        if self._count * 4 > self._capacity * 3:
+            self._grow()
+
+    def _grow(self):
+        old = self._data
+        size = self.KEY_SIZE
+        self._capacity *= 2
+        self._data = bytearray(self._capacity * size)
+        for offset in range(0, len(old), size):
+            key = bytes(old[offset:offset + size])
+            if key != self.EMPTY:
+                new_offset = self._find(key) * size
+                self._data[new_offset:new_offset + size] = key
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._data)
+
+
+class _Generation:
+    """One generation of seen URLs: interned prefixes with binary ids, plus a string fallback."""
+
+    def __init__(self):
+        self.tables: Dict[str, _IdTable] = {}
+        self.other: Set[str] = set()
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.tables.values()) + len(self.other)
+
+    @staticmethod
+    def split(url: str):
+        """Split a canonical URL into (prefix, 12-byte id), or (None, url) if it has no ObjectId."""
+        prefix, _, tail = url.rpartition('/')
+        if OBJECT_ID_RE.match(tail):
+            return prefix, bytes.fromhex(tail)
+        return None, url
+
+    def __contains__(self, url: str) -> bool:
+        prefix, key = self.split(url)
+        if prefix is None:
+            return key in self.other
+        table = self.tables.get(prefix)
+        return table is not None and key in table
+
+    def add(self, url: str):
+        prefix, key = self.split(url)
+        if prefix is None:
+            self.other.add(key)
+            return
+        table = self.tables.get(prefix)
+        if table is None:
+            table = self.tables[sys.intern(prefix)] = _IdTable()
+        table.add(key)
+
+    def nbytes(self) -> int:
+        total = sys.getsizeof(self.tables) + sys.getsizeof(self.other)
+        total += sum(table.nbytes() + sys.getsizeof(prefix) for prefix, table in self.tables.items())
+        total += sum(sys.getsizeof(url) for url in self.other)
+        return total
+
+
+class CompactURLSet:
+    def __init__(self, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Memory-compact set of canonicalized URLs.
+        URLs ending in an ObjectId are stored as 12-byte keys in a packed hash
+        table per interned prefix (about 16-32 bytes per URL); other URLs fall
+        back to a set of strings. With a `ttl`, entries are kept in two
+        generations rotated every `ttl` seconds, so a URL is forgotten between
+        ttl and 2*ttl seconds after it was added and can be revisited.
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._current = _Generation()
+        self._previous = _Generation()
+        self._rotated_at = clock()
+
+    def _maybe_rotate(self):
+        if self.ttl is not None and self._clock() - self._rotated_at >= self.ttl:
+            self._previous = self._current
+            self._current = _Generation()
+            self._rotated_at = self._clock()
+
+    def __contains__(self, url: str) -> bool:
+        self._maybe_rotate()
+        url = canonicalize_url(url)
+        return url in self._current or url in self._previous
+
+    def add(self, url: str):
+        self._maybe_rotate()
+        url = canonicalize_url(url)
+        if url not in self._previous:
+            self._current.add(url)
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+    def clear(self):
+        """Forget every URL."""
+        self._current = _Generation()
+        self._previous = _Generation()
+        self._rotated_at = self._clock()
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the stored URLs."""
+        return self._current.nbytes() + self._previous.nbytes()
+
+    def bytes_per_url(self) -> float:
+        return self.nbytes() / max(len(self), 1)
+
@@ -1,10 +1,15 @@
 let currentPage = 1;
 const itemsPerPage = 10;
 let totalSamples = 0;
+// pageCursors[n - 1] is the cursor that loads page n; page 1 needs none
+let pageCursors = [null];
 
 async function loadSamples(page = 1, search = '') {
-    const skip = (page - 1) * itemsPerPage;
-    const url = `/samples?skip=${skip}&limit=${itemsPerPage}&search=${encodeURIComponent(search)}`;
+    const cursor = pageCursors[page - 1];
+    let url = `/samples?limit=${itemsPerPage}&search=${encodeURIComponent(search)}`;
+    if (cursor) {
+        url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
     
     try {
         const response = await fetch(url);
@@ -12,10 +17,11 @@ async function loadSamples(page = 1, search = '') {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         const samples = await response.json();
+        pageCursors[page] = response.headers.get('X-Next-Cursor');
         displaySamples(samples);
         
         // Update pagination buttons
-        updatePaginationButtons(samples.length);
+        updatePaginationButtons(Boolean(pageCursors[page]));
         
         // If no samples found, show message
         if (samples.length === 0) {
@@ -120,6 +126,9 @@ function loadPrevious() {
 }
 
 function loadNext() {
+    if (!pageCursors[currentPage]) {
+        return;
+    }
     currentPage++;
     loadSamples(currentPage, document.getElementById('searchInput').value);
     updatePageInfo();
@@ -129,17 +138,18 @@ function updatePageInfo() {
     document.getElementById('pageInfo').textContent = `Page ${currentPage}`;
 }
 
-function updatePaginationButtons(samplesCount) {
+function updatePaginationButtons(hasNextPage) {
     const prevButton = document.querySelector('.pagination button:first-child');
     const nextButton = document.querySelector('.pagination button:last-child');
     
     prevButton.disabled = currentPage === 1;
-    nextButton.disabled = samplesCount < itemsPerPage;
+    nextButton.disabled = !hasNextPage;
 }
 
 function searchSamples() {
     const query = document.getElementById('searchInput').value;
     currentPage = 1;
+    pageCursors = [null];
     loadSamples(currentPage, query);
     updatePageInfo();
 }
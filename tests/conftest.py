@@ -0,0 +1,20 @@
+import pytest
+
+
+class FakeResponse:
+    """Stand-in for a requests.Response returned by a stubbed session.get."""
+
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {"Content-Type": "text/html"}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def fake_response():
+    """Factory for FakeResponse: `fake_response(text, status_code=200, headers=None)`."""
+    return FakeResponse
@@ -0,0 +1,89 @@
+import asyncio
+
+from src.api.cache import TTLCache, VersionPoller, cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl=30, clock=clock)
+    cache.set("/samples", b"page", version=1)
+
+    clock.now += 29
+    assert cache.get("/samples", 1) == b"page"
+    clock.now += 2
+    assert cache.get("/samples", 1) is None
+    assert len(cache) == 0
+
+
+def test_newer_version_invalidates_entries():
+    cache = TTLCache(max_entries=10, ttl=30, clock=FakeClock())
+    cache.set("/stats", b"old", version=1)
+
+    assert cache.get("/stats", 2) is None
+    assert cache.get("/stats", 1) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttl=30, clock=FakeClock())
+    cache.set("a", 1, version=0)
+    cache.set("b", 2, version=0)
+    cache.get("a", 0)
+    cache.set("c", 3, version=0)
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == 1
+    assert cache.get("c", 0) == 3
+
+
+def test_cache_key_normalizes_query_parameters():
+    assert cache_key("/samples", [("limit", "10"), ("fields", "title")]) == \
+        cache_key("/samples", [("fields", "title"), ("limit", "10"), ("cursor", "")])
+    assert cache_key("/stats", []) == "/stats"
+
+
+def test_version_poller_reads_once_per_interval():
+    clock = FakeClock()
+    versions = iter([1, 2])
+
+    async def fetch():
+        return next(versions)
+
+    poller = VersionPoller(fetch, interval=1.0, clock=clock)
+
+    assert asyncio.run(poller.current()) == 1
+    clock.now += 0.5
+    assert asyncio.run(poller.current()) == 1
+    clock.now += 0.5
+    assert asyncio.run(poller.current()) == 2
+
+
+def test_version_poller_bypasses_cache_on_errors():
+    async def fail():
+        raise ConnectionError("down")
+
+    assert asyncio.run(VersionPoller(fail, clock=FakeClock()).current()) is None
+
+
+def test_concurrent_requests_share_one_version_read():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 7
+
+    poller = VersionPoller(fetch, clock=FakeClock())
+
+    async def burst():
+        return await asyncio.gather(*(poller.current() for _ in range(5)))
+
+    assert asyncio.run(burst()) == [7] * 5
+    assert len(calls) == 1
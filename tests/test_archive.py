@@ -0,0 +1,66 @@
+import asyncio
+from pathlib import Path
+
+from src.scraper.archive import PageArchive, PageArchiveWriter, iter_records
+from src.scraper.async_scraper import AsyncNailibScraper
+from src.scraper.nailib_scraper import NailibScraper
+from src.scraper.rate_limiter import HostRateLimiter
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+
+
+HEADERS = {"Content-Type": "text/html", "ETag": '"v1"'}
+
+
+def offline(*args, **kwargs):
+    raise AssertionError("replay must not touch the network")
+
+
+def test_capture_then_replay(tmp_path, fake_response):
+    scraper = NailibScraper(capture=PageArchiveWriter(str(tmp_path) + "/"))
+    scraper.session.get = lambda url, **kwargs: fake_response(FIXTURE.read_text(), headers=HEADERS)
+    live = scraper.scrape_sample(URL)
+    scraper.capture.close()
+
+    archive = PageArchive(str(tmp_path))
+    # A rate limiter this slow would stall the second request if it were consulted
+    replayed = NailibScraper(replay=archive, rate_limiter=HostRateLimiter(rate=0.001, burst=1))
+    replayed.session.get = offline
+    sample = replayed.scrape_sample(URL)
+    assert replayed.scrape_sample(URL.replace("63909", "00000")) is None
+
+    for doc in (live, sample):
+        doc.pop("last_updated")
+    assert sample == live
+    assert URL + "#" in archive
+    assert archive.stats() == {"pages": 1, "hits": 1, "misses": 1}
+    record = next(iter_records(str(tmp_path)))
+    assert record["headers"] == {"Content-Type": "text/html", "ETag": '"v1"'}
+
+
+def test_async_replay(tmp_path):
+    path = str(tmp_path / "pages.jsonl.gz")
+    with PageArchiveWriter(path) as writer:
+        writer.write(URL, FIXTURE.read_text())
+        writer.write(URL + "/missing", "Not found", status=404)
+
+    async def fetch():
+        async with AsyncNailibScraper(replay=PageArchive(path)) as scraper:
+            return await scraper.fetch_many([URL, URL + "/missing"])
+
+    results = asyncio.run(fetch())
+    assert results[URL] == FIXTURE.read_text()
+    assert results[URL + "/missing"] is None
+
+
+def test_truncated_archive_keeps_complete_records(tmp_path):
+    path = tmp_path / "pages.jsonl.gz"
+    with PageArchiveWriter(str(path)) as writer:
+        writer.write(URL, "<h1>first</h1>")
+    with PageArchiveWriter(str(path)) as writer:
+        writer.write(URL + "x", "<h1>second</h1>" * 500)
+    data = path.read_bytes()
+    path.write_bytes(data[:-20])
+
+    assert [url for url, _ in PageArchive(str(path)).iter_pages()] == [URL]
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from src.database.async_mongo_client import AsyncMongoDBClient
+from src.database.mongo_client import (
+    PAGE_SORT, STATS_COLLECTION, VERSIONS_COLLECTION, decode_cursor, encode_cursor
+)
+
+FACETS = {
+    "totals": [{"_id": None, "total_samples": 2, "avg_word_count": 1500.0, "latest_update": datetime(2024, 5, 1),
+                "latest_check": datetime(2024, 5, 1), "oldest_check": datetime(2024, 4, 1),
+                "checked_24h": 1, "checked_7d": 2, "checked_30d": 2}],
+    "subjects": [{"_id": "Math AI SL", "count": 2}],
+    "word_counts": [{"_id": 1000, "count": 2}]
+}
+
+
+class StubCursor:
+    """Motor cursor over a fixed list of documents, recording how it was shaped."""
+
+    def __init__(self, docs, error=None):
+        self.docs = list(docs)
+        self.error = error
+        self.calls = {}
+        self.closed = False
+
+    def sort(self, keys):
+        self.calls["sort"] = keys
+        return self
+
+    def limit(self, count):
+        self.calls["limit"] = count
+        self.docs = self.docs[:count]
+        return self
+
+    def batch_size(self, size):
+        self.calls["batch_size"] = size
+        return self
+
+    async def to_list(self, length):
+        await asyncio.sleep(0)
+        return self.docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+        if self.error:
+            raise self.error
+
+    async def close(self):
+        self.closed = True
+
+
+class StubAggregation:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def next(self):
+        self.collection.aggregations += 1
+        await asyncio.sleep(0.01)
+        return FACETS
+
+
+class StubCollection:
+    def __init__(self, docs=(), error=None):
+        self.docs = list(docs)
+        self.error = error
+        self.finds = []
+        self.aggregations = 0
+        self.replaced = {}
+        self.updates = []
+
+    def find(self, filters, projection=None):
+        cursor = StubCursor(self.docs, self.error)
+        self.finds.append((filters, projection, cursor))
+        return cursor
+
+    async def find_one(self, query, projection=None):
+        doc = self.replaced.get(query["_id"])
+        return {key: value for key, value in doc.items() if key != "_id"} if doc else None
+
+    async def find_one_and_replace(self, query, document, upsert=False):
+        previous = self.replaced.get(query["_id"])
+        self.replaced[query["_id"]] = dict(document)
+        return previous
+
+    async def update_one(self, query, update, upsert=False):
+        self.updates.append((query, update))
+
+    def aggregate(self, pipeline):
+        return StubAggregation(self)
+
+
+class StubDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = StubCollection()
+        return collection
+
+
+def make_client(collection):
+    """AsyncMongoDBClient over a stub Motor database, without connecting."""
+    client = AsyncMongoDBClient.__new__(AsyncMongoDBClient)
+    client.db = StubDatabase(samples=collection)
+    client.collection_name = "samples"
+    client.collection = collection
+    client._stats_refresh = None
+    return client
+
+
+def test_page_fetches_one_extra_document_for_the_next_cursor():
+    docs = [{"_id": ObjectId(), "title": f"t{i}"} for i in range(3)]
+    collection = StubCollection(docs)
+
+    page, next_cursor = asyncio.run(make_client(collection).get_samples_page(limit=2, fields=["title"]))
+
+    assert page == [{"title": "t0"}, {"title": "t1"}]
+    assert decode_cursor(next_cursor) == {"_id": {"$lt": docs[1]["_id"]}}
+    filters, projection, cursor = collection.finds[0]
+    assert projection == {"title": 1, "_id": 1}
+    assert cursor.calls == {"sort": PAGE_SORT, "limit": 3}
+
+
+def test_page_after_a_cursor_filters_on_it():
+    collection = StubCollection([{"_id": ObjectId(), "title": "last"}])
+    client = make_client(collection)
+    _, cursor = asyncio.run(client.get_samples_page(limit=1))
+    assert cursor is None
+
+    previous = ObjectId()
+    asyncio.run(client.get_samples_page({"subject": "Math"}, limit=1, cursor=encode_cursor({"_id": previous})))
+
+    assert collection.finds[-1][0] == {"subject": "Math", "_id": {"$lt": previous}}
+
+
+def test_cold_start_stats_are_computed_once_for_concurrent_requests():
+    collection = StubCollection()
+    client = make_client(collection)
+
+    async def burst():
+        return await asyncio.gather(*(client.get_stats() for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert collection.aggregations == 1
+    assert all(stats == results[0] for stats in results)
+    assert results[0]["total_samples"] == 2 and results[0]["subjects"] == ["Math AI SL"]
+    assert len(client.db[VERSIONS_COLLECTION].updates) == 1
+    # Later requests read the stored document
+    assert asyncio.run(client.get_stats())["total_samples"] == 2
+    assert collection.aggregations == 1
+
+
+def test_unchanged_refresh_keeps_the_data_version():
+    collection = StubCollection()
+    client = make_client(collection)
+
+    asyncio.run(client.refresh_stats())
+    asyncio.run(client.refresh_stats())
+
+    assert collection.aggregations == 2
+    assert "samples" in client.db[STATS_COLLECTION].replaced
+    assert len(client.db[VERSIONS_COLLECTION].updates) == 1
+
+
+def test_malformed_ids_do_not_query():
+    collection = StubCollection()
+    assert asyncio.run(make_client(collection).get_sample_by_id("not-an-id")) is None
+    assert collection.finds == []
+
+
+def test_export_error_is_logged_with_the_documents_sent(caplog):
+    docs = [{"_id": ObjectId(), "url": f"u{i}"} for i in range(3)]
+    collection = StubCollection(docs, error=AutoReconnect("primary stepped down"))
+    sent = []
+
+    async def export():
+        async for doc in make_client(collection).iter_samples({"subject": "Math"}, fields=["url"], batch_size=2):
+            sent.append(doc)
+
+    with caplog.at_level(logging.ERROR), pytest.raises(AutoReconnect):
+        asyncio.run(export())
+
+    assert [doc["url"] for doc in sent] == ["u0", "u1", "u2"]
+    assert "after 3 documents" in caplog.text
+    _, projection, cursor = collection.finds[0]
+    assert projection == {"url": 1, "_id": 0}
+    assert cursor.calls["batch_size"] == 2 and cursor.closed
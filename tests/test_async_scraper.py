@@ -0,0 +1,141 @@
+import asyncio
+import time
+from pathlib import Path
+
+import aiohttp
+from yarl import URL as YarlURL
+
+from src.scraper.async_scraper import AsyncFetcher, AsyncNailibScraper
+from src.scraper.http_cache import ResponseCache
+from src.scraper.rate_limiter import HostRateLimiter
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+
+
+class StubResponse:
+    def __init__(self, url, status, body, headers):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = headers
+
+    async def read(self):
+        return self.body.encode("utf-8")
+
+    async def text(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            info = aiohttp.RequestInfo(YarlURL(self.url), "GET", {}, YarlURL(self.url))
+            raise aiohttp.ClientResponseError(info, (), status=self.status)
+
+
+class StubSession:
+    closed = False
+
+    def __init__(self, respond, delay=0.0):
+        """`respond(url, headers, attempt)` returns (status, body, headers) or raises."""
+        self.respond = respond
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url, headers=None):
+        session = self
+
+        class Request:
+            async def __aenter__(self):
+                session.calls.append((url, headers, time.monotonic()))
+                session.active += 1
+                session.max_active = max(session.max_active, session.active)
+                try:
+                    await asyncio.sleep(session.delay)
+                    attempt = sum(1 for called, _, _ in session.calls if called == url)
+                    status, body, response_headers = session.respond(url, headers or {}, attempt)
+                finally:
+                    session.active -= 1
+                return StubResponse(url, status, body, response_headers)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+
+def make_fetcher(session, concurrency=2, cache=None):
+    fetcher = AsyncFetcher({}, HostRateLimiter(rate=1000, burst=1000), concurrency=concurrency, cache=cache)
+
+    async def get_session():
+        if fetcher._semaphore is None:
+            fetcher._semaphore = asyncio.Semaphore(fetcher.concurrency)
+        return session
+
+    fetcher._get_session = get_session
+    return fetcher
+
+
+def test_concurrency_is_bounded_by_the_semaphore():
+    session = StubSession(lambda url, headers, attempt: (200, url, {}), delay=0.02)
+    fetcher = make_fetcher(session, concurrency=2)
+    urls = [f"{URL}?page={i}" for i in range(6)]
+
+    results = asyncio.run(fetcher.fetch_many(urls))
+
+    assert results == {url: url for url in urls}
+    assert session.max_active == 2
+
+
+def test_throttled_response_is_retried_after_retry_after():
+    def respond(url, headers, attempt):
+        if attempt == 1:
+            return 429, "slow down", {"Retry-After": "0.2"}
+        return 200, "<html>ok</html>", {}
+
+    session = StubSession(respond)
+    body = asyncio.run(make_fetcher(session).fetch(URL))
+
+    assert body == "<html>ok</html>"
+    assert len(session.calls) == 2
+    assert session.calls[1][2] - session.calls[0][2] >= 0.15
+
+
+def test_not_modified_response_is_served_from_the_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.store(URL, "<html>cached</html>", '"v1"', None)
+    session = StubSession(lambda url, headers, attempt: (304, "", {}))
+
+    body = asyncio.run(make_fetcher(session, cache=cache).fetch(URL))
+
+    assert body == "<html>cached</html>"
+    assert session.calls[0][1] == {"If-None-Match": '"v1"'}
+    assert cache.stats()["hits"] == 1
+
+
+def test_errors_return_none():
+    def respond(url, headers, attempt):
+        if url.endswith("missing"):
+            return 404, "not found", {}
+        raise aiohttp.ClientConnectionError("connection reset")
+
+    results = asyncio.run(make_fetcher(StubSession(respond)).fetch_many([URL + "/missing", URL]))
+
+    assert results == {URL + "/missing": None, URL: None}
+
+
+def test_discovered_pages_can_still_be_scraped():
+    scraper = AsyncNailibScraper(concurrency=2, rate_limiter=HostRateLimiter(rate=1000, burst=1000))
+    page = FIXTURE.read_text()
+    session = StubSession(lambda url, headers, attempt: (200, page, {}))
+    scraper.fetcher = make_fetcher(session)
+
+    async def crawl():
+        discovered = await scraper.discover_samples(URL, max_samples=1)
+        return discovered, await scraper.scrape_samples(discovered)
+
+    discovered, samples = asyncio.run(crawl())
+
+    assert discovered == [URL]
+    assert samples[0] is not None and samples[0]["url"] == URL
@@ -0,0 +1,163 @@
+import copy
+import time
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+
+from src.database.mongo_client import VERSIONS_COLLECTION, BulkWriteBuffer, MongoDBClient
+from src.scraper.nailib_scraper import content_fingerprint
+
+
+class StubCollection:
+    """Records bulk_write operations; `stored` maps url to its stored content_hash."""
+
+    def __init__(self, stored=None, error=None):
+        self.stored = stored or {}
+        self.error = error
+        self.bulk_writes = []
+        self.updates = []
+
+    def find(self, query, projection):
+        urls = query["url"]["$in"]
+        return [{"url": url, "content_hash": content_hash}
+                for url, content_hash in self.stored.items() if url in urls]
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append((operations, ordered))
+        if self.error:
+            raise self.error
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_count=len(operations))
+
+    def update_one(self, query, update, upsert=False):
+        self.updates.append((query, update))
+
+
+class StubDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = StubCollection()
+        return collection
+
+
+def make_client(collection):
+    """MongoDBClient over a stub database, skipping the connection check."""
+    client = MongoDBClient.__new__(MongoDBClient)
+    client.db = StubDatabase(samples=collection)
+    client.collection_name = "samples"
+    return client
+
+
+def sample(url, **fields):
+    return dict({"url": url, "title": f"Sample {url}", "subject": "Math AI SL"}, **fields)
+
+
+def test_samples_are_written_in_one_unordered_bulk_write():
+    collection = StubCollection()
+    results = make_client(collection).bulk_upsert_samples(
+        [sample("a"), {"url": "no-title", "subject": "Math AI SL"}, sample("b")]
+    )
+
+    assert [(r["url"], r["ok"], r["changed"], r["error"]) for r in results] == [
+        ("a", True, True, None), ("no-title", False, False, "invalid sample"), ("b", True, True, None)
+    ]
+    (operations, ordered), = collection.bulk_writes
+    assert ordered is False
+    assert [op._filter for op in operations] == [{"url": "a"}, {"url": "b"}]
+    assert all(op._upsert for op in operations)
+    assert all({"last_updated", "last_checked"} <= set(op._doc["$set"]) for op in operations)
+
+
+def test_bulk_write_errors_map_back_to_their_samples():
+    error = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "E11000 duplicate key"}]})
+    collection = StubCollection(error=error)
+    results = make_client(collection).bulk_upsert_samples(
+        [{"url": "invalid"}, sample("a"), sample("b"), sample("c")]
+    )
+
+    # Error indexes count operations, which skip the invalid sample
+    assert {r["url"]: r["ok"] for r in results} == {"invalid": False, "a": True, "b": False, "c": True}
+    assert results[2]["error"] == "E11000 duplicate key"
+
+
+def test_failed_bulk_write_fails_every_sample():
+    collection = StubCollection(error=ServerSelectionTimeoutError("no primary"))
+    results = make_client(collection).bulk_upsert_samples([sample("a"), sample("b")])
+
+    assert [r["ok"] for r in results] == [False, False]
+    assert all(r["error"] == "no primary" for r in results)
+
+
+def test_buffer_flushes_when_full():
+    collection = StubCollection()
+    writer = BulkWriteBuffer(make_client(collection), batch_size=3, flush_interval=60)
+
+    assert writer.add(sample("a")) == [] and writer.add(sample("b")) == []
+    results = writer.add(sample("c"))
+
+    assert [r["url"] for r in results] == ["a", "b", "c"]
+    assert len(collection.bulk_writes) == 1 and len(writer) == 0
+    assert writer.flush() == []
+
+
+def test_buffer_flushes_by_age():
+    collection = StubCollection()
+    writer = BulkWriteBuffer(make_client(collection), batch_size=100, flush_interval=0.05)
+    writer.add(sample("a"))
+
+    assert writer.flush_if_due() == []
+    time.sleep(0.06)
+    assert [r["url"] for r in writer.flush_if_due()] == ["a"]
+    assert len(collection.bulk_writes) == 1
+
+
+def test_buffer_reports_a_failed_flush_per_sample():
+    client = make_client(StubCollection())
+
+    def fail(samples):
+        raise RuntimeError("connection lost")
+
+    client.bulk_upsert_samples = fail
+    writer = BulkWriteBuffer(client, batch_size=2)
+    writer.add(sample("a"))
+
+    assert writer.add(sample("b")) == [
+        {"url": "a", "ok": False, "changed": False, "error": "connection lost"},
+        {"url": "b", "ok": False, "changed": False, "error": "connection lost"}
+    ]
+
+
+def test_unchanged_fingerprint_only_touches_last_checked():
+    unchanged = sample("a", description="Same text")
+    unchanged["content_hash"] = content_fingerprint(unchanged)
+    changed = sample("b", description="New text")
+    changed["content_hash"] = content_fingerprint(changed)
+    collection = StubCollection(stored={"a": unchanged["content_hash"], "b": "old-hash"})
+    client = make_client(collection)
+
+    results = client.bulk_upsert_samples([unchanged, changed])
+
+    assert [(r["url"], r["ok"], r["changed"]) for r in results] == [("a", True, False), ("b", True, True)]
+    (touch, rewrite), _ = collection.bulk_writes[0]
+    assert set(touch._doc["$set"]) == {"last_checked"} and not touch._upsert
+    assert rewrite._doc["$set"]["description"] == "New text" and rewrite._upsert
+    # Only the changed sample invalidates cached API responses
+    assert len(client.db[VERSIONS_COLLECTION].updates) == 1
+
+
+def test_all_unchanged_batch_keeps_the_data_version():
+    doc = sample("a")
+    doc["content_hash"] = content_fingerprint(doc)
+    client = make_client(StubCollection(stored={"a": doc["content_hash"]}))
+
+    assert client.bulk_upsert_samples([doc])[0]["changed"] is False
+    assert client.db[VERSIONS_COLLECTION].updates == []
+
+
+def test_fingerprint_ignores_bookkeeping_fields_and_key_order():
+    doc = sample("a", sections={"introduction": {"content": "Intro", "checklist_items": []}})
+    reordered = dict(reversed(list(doc.items())))
+    bookkept = dict(doc, url="b", last_updated="2024-05-01", last_checked="2024-05-02", content_hash="x")
+
+    assert content_fingerprint(doc) == content_fingerprint(reordered) == content_fingerprint(bookkept)
+    edited = copy.deepcopy(doc)
+    edited["sections"]["introduction"]["content"] = "Edited intro"
+    assert content_fingerprint(edited) != content_fingerprint(doc)
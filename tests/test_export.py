@@ -0,0 +1,115 @@
+import asyncio
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from src.api import main
+from src.api.export import ndjson_chunks
+
+
+async def documents(count):
+    for index in range(count):
+        yield {"url": f"https://nailib.com/sample/{index}", "word_count": index}
+
+
+def collect(count, **kwargs):
+    async def run():
+        return [chunk async for chunk in ndjson_chunks(documents(count), **kwargs)]
+    return asyncio.run(run())
+
+
+def test_streams_one_document_per_line_in_bounded_chunks():
+    chunks = collect(500, chunk_size=1024)
+
+    assert len(chunks) > 10
+    assert all(len(chunk) < 1024 + 100 for chunk in chunks)
+    lines = b"".join(chunks).splitlines()
+    assert [orjson.loads(line)["word_count"] for line in lines] == list(range(500))
+
+
+def test_gzip_stream_decompresses_to_the_same_ndjson():
+    plain = b"".join(collect(200))
+    compressed = b"".join(collect(200, gzip=True, chunk_size=512))
+
+    assert compressed[:2] == b"\x1f\x8b"
+    assert gzip.decompress(compressed) == plain
+
+
+def test_empty_export_is_an_empty_body_or_gzip_member():
+    assert collect(0) == []
+    assert gzip.decompress(b"".join(collect(0, gzip=True))) == b""
+
+
+class StubExportClient:
+    """Stands in for the API's database client, recording the export query."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    async def iter_samples(self, query=None, fields=None, batch_size=500):
+        self.calls.append((query, fields, batch_size))
+        for doc in self.docs:
+            yield doc
+
+
+def export(monkeypatch, docs=(), **params):
+    """Call the /export route with a stub client; returns the response, its body and the client."""
+    client = StubExportClient(list(docs))
+    monkeypatch.setattr(main, "db_client", client)
+    params = dict({"subject": None, "search": None, "since": None, "fields": None, "gzip": False}, **params)
+
+    async def run():
+        response = await main.export_samples(**params)
+        return response, b"".join([chunk async for chunk in response.body_iterator])
+
+    response, body = asyncio.run(run())
+    return response, body, client
+
+
+def test_export_route_streams_ndjson(monkeypatch):
+    response, body, client = export(monkeypatch, docs=[{"url": "a"}, {"url": "b"}])
+
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="samples.ndjson"'
+    assert [orjson.loads(line) for line in body.splitlines()] == [{"url": "a"}, {"url": "b"}]
+    assert client.calls == [({}, None, main.settings.EXPORT_BATCH_SIZE)]
+
+
+def test_export_route_gzip_response(monkeypatch):
+    response, body, _ = export(monkeypatch, docs=[{"url": "a"}], gzip=True)
+
+    assert response.media_type == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="samples.ndjson.gz"'
+    assert gzip.decompress(body) == b'{"url":"a"}\n'
+
+
+def test_export_route_filters_by_subject_search_and_since(monkeypatch):
+    since = datetime(2024, 5, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    _, _, client = export(monkeypatch, subject="Math AI SL", search="regression", since=since)
+
+    query, _, _ = client.calls[0]
+    assert query == {
+        "subject": "Math AI SL",
+        "$text": {"$search": "regression"},
+        # Stored timestamps are naive UTC
+        "last_updated": {"$gte": datetime(2024, 5, 1, 12, 0)}
+    }
+
+
+def test_export_route_keeps_naive_since_as_utc(monkeypatch):
+    _, _, client = export(monkeypatch, since=datetime(2024, 5, 1, 12, 0))
+    assert client.calls[0][0] == {"last_updated": {"$gte": datetime(2024, 5, 1, 12, 0)}}
+
+
+def test_export_route_validates_fields(monkeypatch):
+    _, _, client = export(monkeypatch, fields="url, sections")
+    assert client.calls[0][1] == ["url", "sections"]
+
+    for fields in ("url,$where", "sections.introduction.content", "password"):
+        with pytest.raises(HTTPException) as error:
+            export(monkeypatch, fields=fields)
+        assert error.value.status_code == 400
@@ -0,0 +1,44 @@
+from src.scraper.frontier import CrawlFrontier, MemoryFrontier
+
+
+def test_memory_frontier_is_breadth_first():
+    frontier = MemoryFrontier()
+    frontier.push(["seed"], depth=0)
+    frontier.push(["deep"], depth=2)
+    frontier.push(["shallow"], depth=1)
+    assert [url for url, _ in frontier.claim(3)] == ["seed", "shallow", "deep"]
+
+
+def test_crawl_frontier_resumes_after_restart(tmp_path):
+    path = str(tmp_path / "frontier.sqlite3")
+    frontier = CrawlFrontier(path, checkpoint_interval=0)
+    frontier.push(["a", "b", "c"])
+    frontier.claim(2)
+    frontier.mark_done("a")
+    # Simulate a crash with "b" still in flight
+    frontier._conn.commit()
+
+    resumed = CrawlFrontier(path)
+    assert resumed.stats() == {"queued": 2, "in_flight": 0, "done": 1, "failed": 0}
+    assert resumed.push(["a"]) == []
+    assert [url for url, _ in resumed.claim(5)] == ["b", "c"]
+
+
+def test_crawl_frontier_retries_then_fails(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"), max_attempts=2)
+    frontier.push(["a"])
+    frontier.claim()
+    frontier.mark_failed("a", "timeout")
+    assert frontier.claim() == [("a", 0)]
+    frontier.mark_failed("a", "timeout")
+    assert frontier.claim() == []
+    assert frontier.stats()["failed"] == 1
+
+
+def test_requeue_only_applies_to_finished_urls(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"))
+    frontier.push(["a"])
+    frontier.claim()
+    assert frontier.push(["a"], requeue=True) == []
+    frontier.mark_done("a")
+    assert frontier.push(["a"], requeue=True) == ["a"]
@@ -0,0 +1,26 @@
+from src.scraper.http_cache import ResponseCache
+
+
+def test_cache_stores_only_responses_with_validators(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.store("https://nailib.com/a", "<html>a</html>", '"etag-a"', None)
+    cache.store("https://nailib.com/b", "<html>b</html>", None, None)
+
+    cached = cache.lookup("https://nailib.com/a")
+    assert cached.body == "<html>a</html>"
+    assert cached.validators() == {"If-None-Match": '"etag-a"'}
+    assert cache.lookup("https://nailib.com/b") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=25)
+    cache.store("https://nailib.com/a", "a" * 10, None, "Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.store("https://nailib.com/b", "b" * 10, None, "Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.record_hit("https://nailib.com/a")
+    cache.store("https://nailib.com/c", "c" * 10, None, "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    assert cache.lookup("https://nailib.com/b") is None
+    assert cache.lookup("https://nailib.com/a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
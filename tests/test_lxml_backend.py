@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from src.scraper.lxml_backend import css_to_xpath
+from src.scraper.nailib_scraper import NailibScraper
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+
+CORPUS = [
+    FIXTURE.read_text(),
+    "",
+    "<h2>Introduction</h2><p>Only intro</p>",
+    """<html><body><h1 class="sample-title">Title <script>var x = 1;</script>&amp; more</h1>
+    <div class="summary">Summary <!-- hidden --> text<style>p {}</style></div>
+    <div class="meta-info">Reading time: 7 mins</div><span class="date">not a date</span>
+    <div class="meta-date">2024-01-02</div>
+    <h2>academic-honesty</h2><!-- comment --><style>.x {}</style><ul><li>- cited</li></ul>
+    <h3>Interpretation of Findings and Validity and Limitations</h3><p>Shared heading</p>
+    <nav><a href="/ia-sample/ib-math-ai-sl/abc/">Trailing</a><a href="/download/sheet">Sheet</a></nav>
+    </body></html>""",
+]
+
+
+def without_timestamp(page):
+    sample, links = page
+    if sample:
+        sample.pop("last_updated")
+    return sample, sorted(links)
+
+
+@pytest.mark.parametrize("html", CORPUS)
+def test_lxml_backend_matches_beautifulsoup(html):
+    url = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+    expected = without_timestamp(NailibScraper().parse_page(html, url))
+    actual = without_timestamp(NailibScraper(parser_backend="lxml").parse_page(html, url))
+    assert actual == expected
+
+
+def test_css_to_xpath():
+    assert css_to_xpath("a[href]") == "//a[@href]"
+    assert css_to_xpath("div.related-samples a") == (
+        "//div[contains(concat(' ', normalize-space(@class), ' '), ' related-samples ')]//a"
+    )
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        NailibScraper(parser_backend="html5")
@@ -0,0 +1,84 @@
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from src.monitoring.metrics import MetricsRegistry, start_http_exporter
+from src.scraper.nailib_scraper import (
+    FETCH_BYTES, FETCH_RESPONSES, PARSE_SECONDS, VALIDATE_RESULTS, NailibScraper
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["status"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("in_flight", "In flight")
+
+    requests.inc(status=200)
+    requests.inc(2, status=200)
+    requests.inc(status='say "hi"')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    with in_flight.track_inprogress():
+        assert in_flight.value() == 1
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="200"} 3.0' in text
+    assert 'requests_total{status="say \\"hi\\""} 1.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1.0' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2.0' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3.0' in text
+    assert "latency_seconds_sum 5.55" in text
+    assert "latency_seconds_count 3.0" in text
+    assert "in_flight 0.0" in text
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    counter = registry.counter("pages_total", "Pages", ["result"])
+    assert registry.counter("pages_total", "Pages", ["result"]) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("pages_total", "Pages", ["result"])
+    with pytest.raises(ValueError):
+        counter.inc(status="ok")
+
+
+def test_http_exporter_serves_metrics():
+    registry = MetricsRegistry()
+    registry.counter("crawled_total", "Crawled").inc(4)
+    server = start_http_exporter(0, registry, host="127.0.0.1")
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "crawled_total 4.0" in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_scraper_records_stage_metrics(fake_response):
+    html_content = FIXTURE.read_text()
+    scraper = NailibScraper(parser_backend="lxml")
+    scraper.session.get = lambda url, **kwargs: fake_response(html_content)
+
+    responses = FETCH_RESPONSES.value(status=200)
+    received = FETCH_BYTES.value()
+    parses = PARSE_SECONDS.count(backend="lxml")
+    valid = VALIDATE_RESULTS.value(result="valid")
+    invalid = VALIDATE_RESULTS.value(result="invalid")
+
+    sample = scraper.scrape_sample(URL)
+    assert scraper.validate_sample_data(sample)
+    assert not scraper.validate_sample_data({"url": URL})
+
+    assert FETCH_RESPONSES.value(status=200) == responses + 1
+    assert FETCH_BYTES.value() == received + len(html_content.encode("utf-8"))
+    assert PARSE_SECONDS.count(backend="lxml") == parses + 1
+    assert VALIDATE_RESULTS.value(result="valid") == valid + 1
+    assert VALIDATE_RESULTS.value(result="invalid") == invalid + 1
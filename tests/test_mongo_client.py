@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from src.database.mongo_client import (
+    EXPORT_FIELDS, LIST_FIELDS, PAGE_SORT, SUMMARY_FIELDS, decode_cursor, encode_cursor, list_projection,
+    page_filters, split_page, stats_document
+)
+
+
+def test_default_projection_is_the_summary():
+    projection = list_projection()
+    assert set(projection) == set(SUMMARY_FIELDS)
+    assert "sections" not in projection
+    assert all(value == 1 for value in projection.values())
+
+
+def test_selected_fields_exclude_id_unless_requested():
+    assert list_projection(["title", "url", "title"]) == {"title": 1, "url": 1, "_id": 0}
+    assert list_projection(["_id", "file_links"]) == {"_id": 1, "file_links": 1}
+
+
+def test_section_bodies_and_operators_are_rejected():
+    for fields in (["sections"], ["sections.introduction.content"], ["title", "$where"]):
+        with pytest.raises(ValueError):
+            list_projection(fields)
+    assert "sections" not in LIST_FIELDS
+
+
+def test_export_fields_include_section_bodies():
+    assert list_projection(["url", "sections"], EXPORT_FIELDS) == {"url": 1, "sections": 1, "_id": 0}
+    with pytest.raises(ValueError):
+        list_projection(["url", "$where"], EXPORT_FIELDS)
+
+
+def test_cursor_selects_documents_after_the_last_one():
+    oid = ObjectId("63909fa87396d2b674677e94")
+    cursor = encode_cursor({"_id": oid, "last_updated": datetime(2024, 5, 1), "title": "ignored"})
+
+    assert "=" not in cursor and "63909fa8" not in cursor
+    assert decode_cursor(cursor) == {"_id": {"$lt": oid}}
+
+
+def test_cursor_ignores_last_updated():
+    # last_updated changes on every content change; a cursor keyed on it skips documents
+    oid = ObjectId("63909fa87396d2b674677e94")
+    assert encode_cursor({"_id": oid}) == encode_cursor({"_id": oid, "last_updated": datetime(2024, 5, 1)})
+    assert PAGE_SORT == [("_id", -1)]
+
+
+def test_malformed_cursors_are_rejected():
+    for cursor in ("garbage", "W251bGxd", encode_cursor({"_id": "not-an-id"})):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_split_page_trims_sort_keys_and_returns_the_next_cursor():
+    docs = [{"_id": ObjectId(), "title": f"t{i}"} for i in range(3)]
+    projection = list_projection(["title"])
+
+    page, next_cursor = split_page(docs, 2, projection)
+
+    assert page == [{"title": "t0"}, {"title": "t1"}]
+    assert page_filters({}, next_cursor) == {"_id": {"$lt": docs[1]["_id"]}}
+    assert split_page(docs, 3, projection)[1] is None
+
+
+def test_cursor_filters_combine_with_the_query():
+    cursor = encode_cursor({"_id": ObjectId()})
+    query = {"$or": [{"subject": "a"}, {"subject": "b"}]}
+    assert page_filters(query, cursor) == dict(query, **decode_cursor(cursor))
+    id_query = {"_id": {"$ne": ObjectId()}}
+    assert page_filters(id_query, cursor) == {"$and": [id_query, decode_cursor(cursor)]}
+    assert page_filters({"subject": "a"}, None) == {"subject": "a"}
+
+
+def test_stats_document_from_aggregation_facets():
+    now = datetime(2024, 5, 1)
+    facets = {
+        "totals": [{"_id": None, "total_samples": 4, "avg_word_count": 2250.4, "latest_update": now,
+                    "latest_check": now, "oldest_check": datetime(2024, 3, 1),
+                    "checked_24h": 2, "checked_7d": 3, "checked_30d": 3}],
+        "subjects": [{"_id": "Math AI SL", "count": 3}, {"_id": None, "count": 1}],
+        "word_counts": [{"_id": 1000, "count": 2}, {"_id": 5000, "count": 1}, {"_id": "unknown", "count": 1}]
+    }
+
+    stats = stats_document(facets, now)
+
+    assert stats["total_samples"] == 4
+    assert stats["subjects"] == ["Math AI SL"]
+    assert stats["subject_counts"][0] == {"subject": "Math AI SL", "count": 3}
+    assert stats["avg_word_count"] == 2250
+    assert stats["word_count_buckets"] == {
+        "0-999": 0, "1000-1999": 2, "2000-2999": 0, "3000-3999": 0, "4000-4999": 0, "5000+": 1, "unknown": 1
+    }
+    assert stats["latest_update"] == now
+    assert stats["freshness"]["checked_7d"] == 3
+
+
+def test_stats_document_for_an_empty_collection():
+    stats = stats_document({"totals": [], "subjects": [], "word_counts": []}, datetime(2024, 5, 1))
+    assert stats["total_samples"] == 0
+    assert stats["latest_update"] is None
+    assert set(stats["word_count_buckets"].values()) == {0}
@@ -0,0 +1,59 @@
+import asyncio
+import os
+from pathlib import Path
+
+from src.scraper.nailib_scraper import NailibScraper
+from src.scraper.parse_pool import ParsePool
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+PREFIX = "https://nailib.com/ia-sample/ib-math-ai-sl/"
+
+
+class CountingScraper(NailibScraper):
+    """Scraper recording how often a worker built it, and where it parsed."""
+    instances = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        CountingScraper.instances += 1
+
+    def parse_sample(self, html_content, url):
+        sample = super().parse_sample(html_content, url)
+        sample.update(pid=os.getpid(), instances=CountingScraper.instances, backend=self.parser_backend)
+        return sample
+
+
+def pages(count):
+    html_content = FIXTURE.read_text()
+    return [(f"{PREFIX}{i:024x}", html_content) for i in range(count)]
+
+
+def test_pages_are_grouped_into_batches():
+    with ParsePool(workers=1, batch_size=3) as pool:
+        batches = pool._batches(pages(7))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [url for batch in batches for url, _ in batch] == [url for url, _ in pages(7)]
+
+
+def test_results_keep_input_order():
+    with ParsePool(workers=1, batch_size=2) as pool:
+        samples = pool.parse_many(pages(5))
+        async_samples = asyncio.run(pool.parse_many_async(pages(5)))
+        parsed = asyncio.run(pool.parse_pages_async(pages(3)))
+
+    expected = [url for url, _ in pages(5)]
+    assert [sample["url"] for sample in samples] == expected
+    assert [sample["url"] for sample in async_samples] == expected
+    assert [sample["url"] for sample, _ in parsed] == expected[:3]
+    assert all(isinstance(links, list) for _, links in parsed)
+
+
+def test_worker_builds_its_scraper_once_with_the_given_kwargs():
+    with ParsePool(workers=1, batch_size=2, scraper_cls=CountingScraper,
+                   scraper_kwargs={"parser_backend": "bs4"}) as pool:
+        samples = pool.parse_many(pages(5))
+
+    assert {sample["pid"] for sample in samples} != {os.getpid()}
+    assert len({sample["pid"] for sample in samples}) == 1
+    assert {sample["instances"] for sample in samples} == {1}
+    assert {sample["backend"] for sample in samples} == {"bs4"}
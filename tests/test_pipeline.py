@@ -0,0 +1,169 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper.frontier import MemoryFrontier
+from src.scraper.pipeline import CrawlPipeline
+
+ROOT = "https://nailib.com/ia-sample/0"
+
+
+def children(url):
+    index = int(url.rsplit("/", 1)[-1])
+    return [f"https://nailib.com/ia-sample/{2 * index + 1}", f"https://nailib.com/ia-sample/{2 * index + 2}"]
+
+
+class StubScraper:
+    """Serves an endless binary tree of pages, each linking to two children."""
+    parse_pool = None
+    parser_backend = "stub"
+
+    def __init__(self, fail_urls=(), on_fetch=None, invalid_urls=()):
+        self.fetcher = SimpleNamespace(concurrency=2, fetch_many=self._fetch)
+        self.fail_urls = set(fail_urls)
+        self.invalid_urls = set(invalid_urls)
+        self.on_fetch = on_fetch
+        self.fetched = []
+
+    async def fetch_many(self, urls):
+        # Like AsyncNailibScraper, skips URLs it already fetched
+        return await self._fetch([url for url in urls if url not in self.fetched])
+
+    async def _fetch(self, urls):
+        await asyncio.sleep(0)
+        if self.on_fetch:
+            self.on_fetch()
+        for url in urls:
+            if url in self.fail_urls:
+                raise ConnectionError(f"reset fetching {url}")
+        self.fetched.extend(urls)
+        return {url: f"<html>{url}</html>" for url in urls}
+
+    def parse_page(self, html_content, url):
+        return {"url": url, "title": url}, children(url)
+
+    def validate_sample_data(self, sample_data):
+        return sample_data["url"] not in self.invalid_urls
+
+
+class StubWriter:
+    """BulkWriteBuffer stand-in recording what was written."""
+    flush_interval = 0.05
+
+    def __init__(self, batch_size=4, delay=0.0, fail=False, fail_once=()):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.fail = fail
+        self.fail_once = set(fail_once)
+        self.buffer = []
+        self.written = []
+        self.on_add = None
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def add(self, sample_data):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        time.sleep(self.delay)
+        self.buffer.append(sample_data)
+        if self.on_add:
+            self.on_add()
+        return self.flush() if len(self.buffer) >= self.batch_size else []
+
+    def flush_if_due(self):
+        return self.flush()
+
+    def flush(self):
+        results = []
+        for sample in self.buffer:
+            if sample["url"] in self.fail_once:
+                self.fail_once.discard(sample["url"])
+                results.append({"url": sample["url"], "ok": False, "error": "write conflict"})
+            else:
+                results.append({"url": sample["url"], "ok": True, "changed": True})
+                self.written.append(sample["url"])
+        self.buffer = []
+        return results
+
+
+class StubSchedule:
+    """RecrawlScheduler stand-in recording each outcome it is told about."""
+
+    def __init__(self):
+        self.recorded = {}
+        self.failures = []
+
+    def is_due(self, url):
+        return True
+
+    def record(self, url, changed):
+        self.recorded[url] = changed
+
+    def record_failure(self, url):
+        self.failures.append(url)
+
+
+def run(pipeline, seeds=(ROOT,)):
+    return asyncio.run(asyncio.wait_for(pipeline.run(list(seeds)), timeout=10))
+
+
+def test_crawl_stops_at_max_pages_and_stores_every_page():
+    scraper, writer = StubScraper(), StubWriter()
+    stats = run(CrawlPipeline(scraper, writer, max_pages=7, queue_size=3))
+
+    assert stats["fetched"] == 7 and stats["parsed"] == 7 and stats["stored"] == 7
+    assert sorted(writer.written) == sorted(scraper.fetched)
+    # Breadth-first: the first seven pages of the tree
+    assert sorted(writer.written) == sorted(f"https://nailib.com/ia-sample/{i}" for i in range(7))
+
+
+def test_slow_store_holds_back_fetching():
+    writer = StubWriter(batch_size=1, delay=0.01)
+    scraper = StubScraper()
+    pipeline = CrawlPipeline(scraper, writer, max_pages=40, queue_size=1)
+    ahead, depths = [], []
+    writer.on_add = lambda: ahead.append(len(scraper.fetched) - len(writer.written))
+    scraper.on_fetch = lambda: depths.append(max(pipeline.queue_depths().values()))
+
+    stats = run(pipeline)
+
+    assert stats["stored"] == 40
+    # Bounded by the queues and the tasks holding one page each, not by max_pages
+    assert max(ahead) <= 10
+    assert max(depths) <= 1
+
+
+def test_fetch_errors_count_as_failed_pages():
+    scraper = StubScraper(fail_urls={"https://nailib.com/ia-sample/1"})
+    stats = run(CrawlPipeline(scraper, StubWriter(), max_pages=5, queue_size=2))
+
+    assert stats["fetch_failed"] == 1
+    assert stats["fetched"] == 4 and stats["stored"] == 4
+
+
+def test_failed_write_is_refetched_and_stored():
+    scraper, writer = StubScraper(), StubWriter(batch_size=1, fail_once={ROOT})
+    frontier = MemoryFrontier(max_attempts=2)
+    stats = run(CrawlPipeline(scraper, writer, max_pages=10, queue_size=2, frontier=frontier))
+
+    assert stats["store_failed"] == 1 and stats["fetch_failed"] == 0
+    assert scraper.fetched.count(ROOT) == 2
+    assert ROOT in writer.written
+    assert frontier.stats()["failed"] == 0
+
+
+def test_invalid_samples_are_retried_without_changing_their_cadence():
+    scraper, schedule = StubScraper(invalid_urls={ROOT}), StubSchedule()
+    stats = run(CrawlPipeline(scraper, StubWriter(), max_pages=3, queue_size=2, schedule=schedule))
+
+    assert stats["invalid"] == 1 and stats["stored"] == 2
+    assert schedule.failures == [ROOT]
+    assert ROOT not in schedule.recorded and len(schedule.recorded) == 2
+
+
+def test_stage_failure_ends_the_run_with_its_error():
+    with pytest.raises(RuntimeError, match="database unavailable"):
+        run(CrawlPipeline(StubScraper(), StubWriter(fail=True), max_pages=5, queue_size=2))
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from src.scraper.nailib_scraper import NailibScraper
+from src.scraper.profiles import load_profiles
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+
+
+def test_router_picks_profile_by_url_prefix():
+    router = load_profiles()
+    assert router.plan_for("https://nailib.com/ia-sample/ib-math-aa-hl/5f1b2c3d4e5f60718293a4b5").subject == "Math AA HL"
+    assert router.plan_for("https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94").subject == "Math AI SL"
+    assert router.plan_for("https://nailib.com/unknown/page") is router.default
+    assert router.is_sample_link("/ia-sample/ib-math-aa-sl/5f1b2c3d4e5f60718293a4b5")
+    assert not router.is_sample_link("/blog/how-to-write-an-ia")
+
+
+def test_subject_and_links_follow_profiles():
+    scraper = NailibScraper()
+    sample, links = scraper.parse_page(
+        FIXTURE.read_text(), "https://nailib.com/ia-sample/ib-math-aa-sl/5f1b2c3d4e5f60718293a4b5"
+    )
+    assert sample["subject"] == "Math AA SL"
+    assert "https://nailib.com/ia-sample/ib-math-aa-sl/5f1b2c3d4e5f60718293a4b5" in links
+
+
+def test_custom_profile_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({
+        "defaults": {
+            "selectors": {
+                "title": ["div.description"], "description": [], "stats": [], "date": [],
+                "links": ["aside a"], "file_links": []
+            },
+            "patterns": {}
+        },
+        "profiles": [{
+            "name": "physics", "subject": "Physics HL",
+            "url_prefixes": ["/ia-sample/ib-physics-hl/"],
+            "sections": {"honesty": "Academic Honesty"}
+        }]
+    }))
+
+    for backend in ("bs4", "lxml"):
+        scraper = NailibScraper(parser_backend=backend, profiles_path=str(path))
+        sample, links = scraper.parse_page(FIXTURE.read_text(), "https://nailib.com/ia-sample/ib-physics-hl/x")
+        assert sample["subject"] == "Physics HL"
+        assert sample["title"].startswith("An investigation of how quickly")
+        assert sample["sections"] == {
+            "honesty": {"content": "All sources are cited in the bibliography.", "checklist_items": []}
+        }
+        assert sample["file_links"] == [] and sample["word_count"] is None
+        assert links == []
+        assert scraper.validate_sample_data(sample)
@@ -0,0 +1,82 @@
+import asyncio
+import pstats
+import time
+
+from src.monitoring.profiling import FUNCTION_SECONDS, CallProfiler, timed
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@timed
+def parse_something():
+    return "parsed"
+
+
+@timed
+async def fetch_something():
+    return "fetched"
+
+
+def test_timed_observes_sync_and_async_calls():
+    sync_count = FUNCTION_SECONDS.count(function="test_profiling.parse_something")
+    async_count = FUNCTION_SECONDS.count(function="test_profiling.fetch_something")
+
+    assert parse_something() == "parsed"
+    assert asyncio.run(fetch_something()) == "fetched"
+
+    assert FUNCTION_SECONDS.count(function="test_profiling.parse_something") == sync_count + 1
+    assert FUNCTION_SECONDS.count(function="test_profiling.fetch_something") == async_count + 1
+
+
+def test_cprofile_session_dumps_after_n_calls(tmp_path):
+    profiler = CallProfiler(output_dir=str(tmp_path))
+    profiler.arm(2, "cprofile")
+    for _ in range(3):
+        with profiler.profile("page"):
+            busy(0.001)
+
+    status = profiler.status()
+    assert status["profiled"] == {"page": 2}
+    assert not status["armed"]
+    assert len(status["dumps"]) == 1 and status["dumps"][0].endswith(".pstats")
+
+    stats = pstats.Stats(profiler.dump_path(status["dumps"][0]))
+    calls = {func[2]: counts[0] for func, counts in stats.stats.items()}
+    assert calls["busy"] == 2
+
+
+def test_overlapping_calls_run_unprofiled(tmp_path):
+    profiler = CallProfiler(output_dir=str(tmp_path))
+    profiler.arm(5, "cprofile")
+    with profiler.profile("outer"):
+        with profiler.profile("inner"):
+            pass
+    assert profiler.status()["remaining"] == 4
+    profiler.stop()
+    assert profiler.status()["profiled"] == {"outer": 1}
+
+
+def test_sampling_session_writes_collapsed_stacks(tmp_path):
+    profiler = CallProfiler(output_dir=str(tmp_path), sample_interval=0.001)
+    profiler.arm(1, "sampling")
+    with profiler.profile("page"):
+        busy(0.1)
+
+    dump = profiler.dump_path(profiler.status()["dumps"][0])
+    lines = open(dump).read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "busy (test_profiling.py:" in stack.split(";")[-1]
+
+
+def test_stop_without_calls_writes_nothing(tmp_path):
+    profiler = CallProfiler(output_dir=str(tmp_path))
+    profiler.arm(3, "sampling")
+    assert profiler.stop() is None
+    assert list(tmp_path.iterdir()) == []
+    assert profiler.dump_path("../etc/passwd") is None
@@ -0,0 +1,37 @@
+from src.scraper.rate_limiter import AdaptiveRateLimiter, TokenBucket, parse_retry_after
+
+URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+    assert bucket._reserve() > 0
+
+
+def test_adaptive_rate_increases_on_fast_success():
+    limiter = AdaptiveRateLimiter(rate=1.0, increase=0.5, max_rate=2.0)
+    for _ in range(5):
+        limiter.record_response(URL, 200, 0.1)
+    assert limiter.current_rate(URL) == 2.0
+
+
+def test_adaptive_rate_cuts_on_throttle_and_honors_retry_after():
+    limiter = AdaptiveRateLimiter(rate=4.0, decrease_factor=0.5, decrease_cooldown=60)
+    limiter.record_response(URL, 429, 0.1, retry_after="3")
+    limiter.record_response(URL, 503, 0.1)
+    assert limiter.current_rate(URL) == 2.0
+    assert limiter.metrics()["nailib.com"]["paused_for"] > 2
+
+
+def test_adaptive_rate_cuts_on_high_latency():
+    limiter = AdaptiveRateLimiter(rate=4.0, latency_target=1.0)
+    limiter.record_response(URL, 200, 5.0)
+    assert limiter.current_rate(URL) == 2.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after(None) is None
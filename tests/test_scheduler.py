@@ -0,0 +1,44 @@
+from src.scraper.scheduler import RecrawlScheduler
+
+URL = "https://nailib.com/ia-sample/ib-math-ai-sl/63909fa87396d2b674677e94"
+
+
+def make_scheduler(tmp_path):
+    return RecrawlScheduler(
+        str(tmp_path / "schedule.sqlite3"),
+        initial_interval=100, min_interval=10, max_interval=1000, backoff=2
+    )
+
+
+def test_new_urls_are_due_immediately(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.add([URL], now=0)
+    assert scheduler.due(now=0) == [URL]
+    assert scheduler.is_due("https://nailib.com/unknown", now=0)
+
+
+def test_unchanged_pages_back_off_and_changed_pages_speed_up(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.add([URL], now=0)
+
+    scheduler.record(URL, changed=False, now=0)
+    assert not scheduler.is_due(URL, now=199)
+    assert scheduler.is_due(URL, now=200)
+
+    scheduler.record(URL, changed=False, now=200)
+    assert scheduler.seconds_until_due(now=200) == 400
+
+    scheduler.record(URL, changed=True, now=600)
+    assert scheduler.seconds_until_due(now=600) == 200
+
+
+def test_intervals_stay_within_bounds(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    for _ in range(10):
+        scheduler.record(URL, changed=False, now=0)
+    assert scheduler.seconds_until_due(now=0) == 1000
+
+    for _ in range(10):
+        scheduler.record(URL, changed=True, now=0)
+    assert scheduler.seconds_until_due(now=0) == 10
+    assert scheduler.stats(now=0) == {"tracked": 1, "due": 0}
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.scraper.nailib_scraper import NailibScraper, SECTION_TITLES
+from src.scraper.section_extractor import SectionExtractor, title_variations
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_page.html"
+
+
+def test_title_variations_drop_case_duplicates():
+    assert title_variations("Academic Honesty") == [
+        "Academic Honesty", "academic-honesty", "academic_honesty"
+    ]
+    assert title_variations("Introduction") == ["Introduction"]
+
+
+def test_match_headings_prefers_primary_title_variation():
+    soup = BeautifulSoup(FIXTURE.read_text(), "lxml")
+    headings = SectionExtractor(SECTION_TITLES).match_headings(soup)
+
+    assert set(headings) == set(SECTION_TITLES)
+    assert headings["mathematical_information"].get_text() == "Mathematical Information"
+
+
+def test_title_that_prefixes_another_title_still_matches():
+    extractor = SectionExtractor({"introduction": "Introduction", "aim": "Introduction and Aim"})
+    soup = BeautifulSoup("<h2>Introduction and Aim</h2><p>Both</p>", "lxml")
+    headings = extractor.match_headings(soup)
+
+    assert set(headings) == {"introduction", "aim"}
+    assert headings["introduction"] is headings["aim"]
+
+
+def test_sections_stop_at_next_sibling_heading():
+    soup = BeautifulSoup(FIXTURE.read_text(), "lxml")
+    sections = NailibScraper()._extract_sections(soup)
+
+    assert sections["introduction"]["checklist_items"] == [
+        "Aim stated clearly",
+        "Rationale is personal and relevant"
+    ]
+    assert "Nested headings are not section boundaries." in sections["mathematical_processes"]["content"]
+    assert sections["academic_honesty"]["content"] == "All sources are cited in the bibliography."
+
+
+def test_missing_sections_are_empty():
+    soup = BeautifulSoup("<h2>Introduction</h2><p>Only intro</p>", "lxml")
+    sections = NailibScraper()._extract_sections(soup)
+
+    assert sections["introduction"]["content"] == "Only intro"
+    assert sections["interpretation"] == {"content": "", "checklist_items": []}
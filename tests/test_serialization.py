@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from bson import ObjectId
+from bson.son import SON
+
+from src.database.mongo_client import to_json_native
+
+
+def test_converts_bson_values_in_nested_documents():
+    oid = ObjectId("63909fa87396d2b674677e94")
+    now = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    doc = {
+        "_id": oid,
+        "title": "Sample",
+        "word_count": 1200,
+        "score": 0.5,
+        "published": True,
+        "publication_date": None,
+        "last_updated": now,
+        "sections": {"introduction": {"content": "Intro", "checklist_items": ["a", "b"]}},
+        "file_links": [{"url": "/files/a.pdf", "added": now}],
+        "related": (oid,),
+        "meta": SON([("checked", now)])
+    }
+
+    assert to_json_native(doc) == {
+        "_id": "63909fa87396d2b674677e94",
+        "title": "Sample",
+        "word_count": 1200,
+        "score": 0.5,
+        "published": True,
+        "publication_date": None,
+        "last_updated": "2024-05-01T12:30:15.250000",
+        "sections": {"introduction": {"content": "Intro", "checklist_items": ["a", "b"]}},
+        "file_links": [{"url": "/files/a.pdf", "added": "2024-05-01T12:30:15.250000"}],
+        "related": ["63909fa87396d2b674677e94"],
+        "meta": {"checked": "2024-05-01T12:30:15.250000"}
+    }
+    # The input document is left untouched
+    assert doc["last_updated"] is now
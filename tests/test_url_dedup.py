@@ -0,0 +1,35 @@
+from src.scraper.url_dedup import CompactURLSet, canonicalize_url
+
+PREFIX = "https://nailib.com/ia-sample/ib-math-ai-sl/"
+
+
+def test_canonicalize_url():
+    assert canonicalize_url("HTTPS://Nailib.com:443/ia-sample/x/#") == "https://nailib.com/ia-sample/x"
+    assert canonicalize_url("https://nailib.com/a?b=2&a=1") == "https://nailib.com/a?a=1&b=2"
+    assert canonicalize_url("http://localhost:8000/") == "http://localhost:8000/"
+
+
+def test_compact_url_set_membership_and_size():
+    seen = CompactURLSet()
+    urls = [f"{PREFIX}{i:024x}" for i in range(5000)]
+    for url in urls:
+        seen.add(url)
+    seen.add(urls[0] + "#")
+    seen.add("https://nailib.com/ia-sample")
+
+    assert len(seen) == 5001
+    assert all(url in seen for url in urls)
+    assert f"{PREFIX}{5000:024x}" not in seen
+    assert "https://nailib.com/ia-sample/" in seen
+    assert seen.bytes_per_url() < 40
+
+
+def test_compact_url_set_forgets_after_ttl():
+    now = [0.0]
+    seen = CompactURLSet(ttl=10, clock=lambda: now[0])
+    seen.add(PREFIX + "63909fa87396d2b674677e94")
+    now[0] = 15
+    assert PREFIX + "63909fa87396d2b674677e94" in seen
+    now[0] = 25
+    assert PREFIX + "63909fa87396d2b674677e94" not in seen
+
@@ -0,0 +1,79 @@
+"""Runs against a local mongod (MONGODB_TEST_URI); skipped when none is reachable."""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from src.database.work_queue import MongoWorkQueue
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture
+def db():
+    client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("no local mongod available")
+    name = f"nailib_test_{uuid.uuid4().hex[:8]}"
+    yield client[name]
+    client.drop_database(name)
+    client.close()
+
+
+def test_workers_claim_disjoint_urls(db):
+    first = MongoWorkQueue(db, worker_id="first")
+    second = MongoWorkQueue(db, worker_id="second")
+    assert first.push(["a", "b", "c"]) == ["a", "b", "c"]
+    assert second.push(["a"]) == []
+
+    claimed = first.claim(2) + second.claim(5)
+    assert sorted(url for url, _ in claimed) == ["a", "b", "c"]
+    assert first.claim(1) == []
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(db):
+    crashed = MongoWorkQueue(db, worker_id="crashed")
+    survivor = MongoWorkQueue(db, worker_id="survivor")
+    crashed.push(["a"])
+    crashed.claim(1)
+    assert survivor.claim(1) == []
+
+    db.crawl_queue.update_one({"_id": "a"}, {"$set": {"lease_expires": datetime.utcnow() - timedelta(seconds=1)}})
+    assert survivor.claim(1) == [("a", 0)]
+
+    # The crashed worker no longer owns the lease, so its late completion is ignored
+    crashed.mark_done("a")
+    crashed.mark_failed("a", "late")
+    assert survivor.stats()["in_flight"] == 1
+    assert crashed.processed == 0 and crashed.failed == 0
+    survivor.mark_done("a")
+    assert survivor.stats()["done"] == 1
+    assert survivor.processed == 1
+
+
+def test_heartbeat_extends_leases_and_reports_throughput(db):
+    worker = MongoWorkQueue(db, worker_id="worker", lease_seconds=60)
+    worker.push(["a", "b"])
+    worker.claim(2)
+    worker.mark_done("a")
+    worker.heartbeat()
+
+    doc = db.crawl_queue.find_one({"_id": "b"})
+    assert doc["lease_expires"] > datetime.utcnow() + timedelta(seconds=50)
+    assert worker.worker_stats()[0]["processed"] == 1
+
+
+def test_failed_urls_retry_until_max_attempts(db):
+    worker = MongoWorkQueue(db, worker_id="worker", max_attempts=2)
+    worker.push(["a"])
+    worker.claim(1)
+    worker.mark_failed("a", "timeout")
+    assert worker.claim(1) == [("a", 0)]
+    worker.mark_failed("a", "timeout")
+    assert worker.claim(1) == []
+    assert worker.stats()["failed"] == 1